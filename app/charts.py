@@ -0,0 +1,176 @@
+import tkinter as tk
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from tkinter import ttk
+from typing import List, Mapping, Optional
+
+from fitgator.services.downsample import lttb
+
+MIN_SPAN_DAYS = 7
+ZOOM_STEP = 0.8
+
+
+class TrendChart(ttk.Frame):
+    """Daily totals (e.g. calories) against a target line, on a Canvas.
+
+    The chart keeps one value per logged day for the loaded range, sorted by
+    date. Redrawing after a resize, zoom or pan only slices that array and
+    downsamples the visible part to about one point per pixel, so it never
+    goes back to storage. Wheel zooms around the pointer, dragging pans and
+    a double click shows the whole range again.
+    """
+
+    PAD_LEFT = 48
+    PAD_RIGHT = 12
+    PAD_TOP = 12
+    PAD_BOTTOM = 22
+
+    def __init__(self, master, height: int = 200, unit: str = "kcal") -> None:
+        super().__init__(master)
+        self.unit = unit
+        self._xs: List[int] = []  # day ordinals
+        self._ys: List[float] = []
+        self._target: Optional[float] = None
+        self._view: Optional[tuple] = None  # (first, last) ordinal shown
+        self._drag_x: Optional[int] = None
+
+        self.canvas = tk.Canvas(self, height=height, background="white", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<MouseWheel>", lambda e: self._zoom(e.x, e.delta > 0))
+        self.canvas.bind("<Button-4>", lambda e: self._zoom(e.x, True))
+        self.canvas.bind("<Button-5>", lambda e: self._zoom(e.x, False))
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.reset_view())
+
+    # --- data -------------------------------------------------------------
+
+    def set_series(self, totals: Mapping[date, float], target: Optional[float] = None) -> None:
+        """Replace the data with per-day totals and show all of it."""
+        days = sorted(totals)
+        self._xs = [d.toordinal() for d in days]
+        self._ys = [float(totals[d]) for d in days]
+        self._target = target
+        self.reset_view()
+
+    def set_target(self, target: Optional[float]) -> None:
+        self._target = target
+        self.redraw()
+
+    def add_to_day(self, d: date, delta: float) -> None:
+        """Apply one entry's change to its day without reloading the series."""
+        x = d.toordinal()
+        i = bisect_left(self._xs, x)
+        if i < len(self._xs) and self._xs[i] == x:
+            self._ys[i] += delta
+            if self._ys[i] <= 0:
+                del self._xs[i]
+                del self._ys[i]
+        elif delta > 0:
+            insort(self._xs, x)
+            self._ys.insert(self._xs.index(x), float(delta))
+        if self._view is None or not self._xs:
+            self.reset_view()
+        else:
+            self.redraw()
+
+    def reset_view(self) -> None:
+        self._view = (self._xs[0], self._xs[-1]) if self._xs else None
+        self.redraw()
+
+    # --- drawing ----------------------------------------------------------
+
+    def _plot_box(self) -> tuple:
+        w = max(1, self.canvas.winfo_width())
+        h = max(1, self.canvas.winfo_height())
+        return self.PAD_LEFT, self.PAD_TOP, w - self.PAD_RIGHT, h - self.PAD_BOTTOM
+
+    def redraw(self) -> None:
+        c = self.canvas
+        c.delete("all")
+        x0, y0, x1, y1 = self._plot_box()
+        if x1 <= x0 or y1 <= y0:
+            return
+        c.create_rectangle(x0, y0, x1, y1, outline="#bbbbbb")
+        if self._view is None:
+            c.create_text((x0 + x1) / 2, (y0 + y1) / 2, text="No entries yet", fill="#888888")
+            return
+
+        first, last = self._view
+        lo = bisect_left(self._xs, first)
+        hi = bisect_right(self._xs, last)
+        points = list(zip(self._xs[lo:hi], self._ys[lo:hi]))
+        points = lttb(points, max(2, int(x1 - x0)))
+
+        top = max([p[1] for p in points] + [self._target or 0, 1.0]) * 1.1
+        span = max(1.0, last - first)
+
+        def px(x: float) -> float:
+            return x0 + (x - first) / span * (x1 - x0)
+
+        def py(y: float) -> float:
+            return y1 - y / top * (y1 - y0)
+
+        # Axes labels
+        c.create_text(x0 - 4, y0, text=f"{top:.0f}", anchor="ne", fill="#666666")
+        c.create_text(x0 - 4, y1, text="0", anchor="se", fill="#666666")
+        c.create_text(x0, y1 + 4, text=date.fromordinal(int(round(first))).isoformat(),
+                      anchor="nw", fill="#666666")
+        c.create_text(x1, y1 + 4, text=date.fromordinal(int(round(last))).isoformat(),
+                      anchor="ne", fill="#666666")
+
+        if self._target:
+            ty = py(self._target)
+            c.create_line(x0, ty, x1, ty, fill="#d9534f", dash=(4, 3))
+            c.create_text(x1 - 2, ty - 2, text=f"target {self._target:.0f} {self.unit}",
+                          anchor="se", fill="#d9534f")
+
+        if len(points) == 1:
+            x, y = px(points[0][0]), py(points[0][1])
+            c.create_oval(x - 2, y - 2, x + 2, y + 2, fill="#337ab7", outline="")
+        elif points:
+            coords = []
+            for x, y in points:
+                coords.extend((px(x), py(y)))
+            c.create_line(*coords, fill="#337ab7", width=1.5)
+
+        if points:
+            avg = sum(self._ys[lo:hi]) / (hi - lo)
+            c.create_text(x0 + 4, y0 + 2, anchor="nw", fill="#333333",
+                          text=f"avg {avg:.0f} {self.unit}/day over {hi - lo} logged days")
+
+    # --- zoom & pan -------------------------------------------------------
+
+    def _x_to_day(self, px: int) -> float:
+        x0, _, x1, _ = self._plot_box()
+        first, last = self._view
+        return first + (px - x0) / max(1, x1 - x0) * (last - first)
+
+    def _clamp_view(self, first: float, last: float) -> None:
+        lo, hi = self._xs[0], self._xs[-1]
+        span = min(max(last - first, MIN_SPAN_DAYS), max(hi - lo, MIN_SPAN_DAYS))
+        first = max(lo, min(first, hi - span))
+        self._view = (first, first + span)
+
+    def _zoom(self, px: int, zoom_in: bool) -> str:
+        if self._view is None:
+            return "break"
+        first, last = self._view
+        center = self._x_to_day(px)
+        factor = ZOOM_STEP if zoom_in else 1 / ZOOM_STEP
+        self._clamp_view(center - (center - first) * factor, center + (last - center) * factor)
+        self.redraw()
+        return "break"
+
+    def _on_press(self, event) -> None:
+        self._drag_x = event.x
+
+    def _on_drag(self, event) -> None:
+        if self._view is None or self._drag_x is None:
+            return
+        shift = self._x_to_day(self._drag_x) - self._x_to_day(event.x)
+        self._drag_x = event.x
+        first, last = self._view
+        self._clamp_view(first + shift, last + shift)
+        self.redraw()
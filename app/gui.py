@@ -1,14 +1,38 @@
 import tkinter as tk
 import os
-from tkinter import ttk, messagebox
-from datetime import date
-from typing import List
-import csv
+from tkinter import ttk, messagebox, simpledialog
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
 
-from fitgator.entities import UserProfile, FoodEntry, WorkoutEntry, Goal
+from fitgator.entities import UserProfile, FoodEntry, WorkoutEntry, Goal, Template, TemplateItem
 from fitgator.services.goals import new_goal
-from fitgator.services.dashboard import daily_summary
-from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.services.dashboard import DashboardModel
+from fitgator.services.macros import MACRO_FIELDS, week_start, weekly_totals
+from fitgator.services.export import write_csv
+from fitgator.services.history import FOODS, WORKOUTS, PagedHistory
+from fitgator.services.suggest import FoodSuggestions, build_suggestions
+from fitgator.services.templates import apply_template, parse_recurrence
+from fitgator.data import backup
+from fitgator.data.cached_repo import CachedRepository
+from fitgator.data.repository import Repository
+from app.charts import TrendChart
+from app.scheduler import IdleScheduler
+from app.widgets import VirtualListView
+from fitgator.events import (
+    DataCleared,
+    FoodAdded,
+    FoodDeleted,
+    FoodsAdded,
+    FoodsReplaced,
+    GoalSaved,
+    ProfileSaved,
+    WorkoutAdded,
+    WorkoutDeleted,
+    WorkoutsAdded,
+    WorkoutsReplaced,
+    TemplatesChanged,
+)
 
 ACTIVITY_OPTIONS = [
     ("Sedentary (little or no exercise)", 1.2),
@@ -18,54 +42,264 @@ ACTIVITY_OPTIONS = [
     ("Athlete (2x per day)", 1.9),
 ]
 
-WORKOUT_PLANS = {
-    "Beginner Full Body (3 days)": [
-        "Bodyweight squats – 3 x 10",
-        "Push-ups – 3 x 8",
-        "Glute bridges – 3 x 12",
-        "Plank – 3 x 30 seconds",
-    ],
-    "Push / Pull / Legs (3 days)": [
-        "Push day: Bench press or push-ups – 3 x 8–10",
-        "Push day: Shoulder press – 3 x 10",
-        "Pull day: Rows – 3 x 10",
-        "Pull day: Lat pulldown or assisted pull-ups – 3 x 8–10",
-        "Leg day: Squats – 3 x 8–10",
-        "Leg day: Lunges – 3 x 10 per leg",
-    ],
-    "Home Bodyweight (4 days)": [
-        "Jumping jacks – 3 x 30 sec",
-        "Push-ups – 3 x 8–10",
-        "Bodyweight squats – 3 x 12",
-        "Glute bridges – 3 x 15",
-        "Hip thrusts – 3 x 12",
-        "Plank – 3 x 30–45 sec",
-    ],
-}
+# Label -> days before today to include (None = everything)
+HISTORY_RANGES = [
+    ("Today", 0),
+    ("Last 7 days", 6),
+    ("Last 30 days", 29),
+    ("All history", None),
+]
+
+# Label -> days of history the trend chart loads (None = everything)
+CHART_RANGES = [
+    ("Last 30 days", 29),
+    ("Last 90 days", 89),
+    ("Last year", 364),
+    ("All history", None),
+]
+
+# Automatic backups go next to the database; one a day is plenty
+BACKUP_DIR = "backups"
+BACKUP_INTERVAL = timedelta(days=1)
+BACKUP_CHECK_MS = 60 * 60 * 1000
+BACKUP_POLL_MS = 200
+
+# "Plan next 4 weeks" expands a template over this many days from today
+PLAN_AHEAD_DAYS = 28
+
+# Idle-time work: days of history pre-loaded into the page cache, and how
+# long before midnight the next day's dashboard is prepared
+WARM_DAYS = 30
+PRECOMPUTE_BEFORE_MIDNIGHT = timedelta(minutes=10)
 
 
 class FitGatorApp(tk.Tk):
     """Tkinter-based GUI for the FitGator MVP."""
 
-    def __init__(self, repo: SQLiteRepository) -> None:
+    def __init__(self, repo: Repository) -> None:
         super().__init__()
         self.title("FitGator")
         self.geometry("800x600")
 
         self._repo = repo
 
-        # In-memory cached lists for foods and workouts
-        self._foods: List[FoodEntry] = self._repo.load_foods()
-        self._workouts: List[WorkoutEntry] = self._repo.load_workouts()
+        self._day = date.today()
 
         self._profile: UserProfile | None = self._repo.load_profile()
         self._goal: Goal | None = self._repo.load_goal()
 
+        # The dashboard model subscribes first so it is up to date by the
+        # time the view handlers below redraw from it.
+        self._dashboard = DashboardModel(repo.bus, self._day)
+        # Tomorrow's numbers, loaded shortly before midnight and then kept
+        # current by events, so the rollover is a swap instead of a reload
+        self._next_dashboard = DashboardModel(repo.bus, self._day + timedelta(days=1))
+        self._next_loaded = False
+        self._load_today()
+        self._templates: Dict[str, Template] = {}
+        self._load_templates()
+
+        self._idle = IdleScheduler(self)
+        self._chart_cache: Dict[str, Dict[date, int]] = {}
+        self._suggestions = FoodSuggestions()
+        self._food_matches: list = []
+
         self._build_ui()
+        self._subscribe(repo)
+        self._schedule_day_timers()
+        self._start_idle_work()
+
+        self._backup_job = None
+        if self._backup_enabled():
+            self.after(BACKUP_POLL_MS, self._scheduled_backup)
+
+    def _load_today(self) -> None:
+        """Reload today's entries from storage and recompute the dashboard."""
+        self._day = date.today()
+        self._dashboard.reset(
+            self._profile,
+            self._goal.goal_type if self._goal else None,
+            self._repo.load_foods_range(self._day, self._day),
+            self._repo.load_workouts_range(self._day, self._day),
+            day=self._day,
+        )
+
+    def _start_idle_work(self) -> None:
+        """Queue the background work that makes the next clicks instant."""
+        if isinstance(self._repo, CachedRepository):
+            start = self._day - timedelta(days=WARM_DAYS - 1)
+            self._idle.submit("warm-cache", self._repo.warm(start, self._day))
+        self._idle.submit("chart-ranges", self._precompute_chart_ranges())
+        self._rebuild_suggestions()
+
+    def _rebuild_suggestions(self) -> None:
+        # Read past the page cache: the whole history would only evict it
+        source = getattr(self._repo, "backend", self._repo)
+        self._idle.submit(
+            "suggestions",
+            build_suggestions(source),
+            on_done=lambda index: setattr(self, "_suggestions", index),
+        )
+
+    def _note_food(self, entry: FoodEntry, sign: int) -> None:
+        """Keep the autocomplete index in step with one added/deleted food."""
+        if "suggestions" in self._idle:
+            # Restart rather than risk counting the entry twice
+            self._rebuild_suggestions()
+        elif sign > 0:
+            self._suggestions.add(entry)
+        else:
+            self._suggestions.remove(entry)
+
+    def _schedule_day_timers(self) -> None:
+        """Prepare tomorrow shortly before midnight, and roll over just after."""
+        now = datetime.now()
+        midnight = datetime.combine(self._day + timedelta(days=1), datetime.min.time())
+        until_midnight = int((midnight - now).total_seconds() * 1000)
+        until_precompute = until_midnight - int(PRECOMPUTE_BEFORE_MIDNIGHT.total_seconds() * 1000)
+        self.after(
+            max(0, until_precompute),
+            lambda: self._idle.submit("next-day", self._prepare_next_day()),
+        )
+        self.after(max(0, until_midnight) + 1000, self._refresh_dashboard)
+
+    def _prepare_next_day(self):
+        """Load tomorrow's entries into the spare dashboard model.
+
+        Loading and resetting happen in one step so no event can slip in
+        between; from then on the model follows events like today's does.
+        """
+        day = self._day + timedelta(days=1)
+        self._next_dashboard.reset(
+            self._profile,
+            self._goal.goal_type if self._goal else None,
+            self._repo.load_foods_range(day, day),
+            self._repo.load_workouts_range(day, day),
+            day=day,
+        )
+        self._next_loaded = True
+        yield
+
+    def _roll_over(self) -> None:
+        """Start a new day, from the precomputed model when it is ready."""
+        today = date.today()
+        if self._next_loaded and self._next_dashboard.day == today:
+            self._dashboard, self._next_dashboard = self._next_dashboard, self._dashboard
+            self._day = today
+        else:
+            self._load_today()
+        self._next_loaded = False
+        self._chart_cache.clear()
+        self._refresh_views()
+        self._schedule_day_timers()
+        self._start_idle_work()
+
+    def _subscribe(self, repo) -> None:
+        bus = repo.bus
+        bus.subscribe(FoodAdded, self._on_food_added)
+        bus.subscribe(FoodDeleted, self._on_food_deleted)
+        bus.subscribe(FoodsReplaced, lambda e: self._on_log_replaced())
+        bus.subscribe(WorkoutAdded, self._on_workout_added)
+        bus.subscribe(WorkoutDeleted, self._on_workout_deleted)
+        bus.subscribe(WorkoutsReplaced, lambda e: self._on_log_replaced())
+        bus.subscribe(ProfileSaved, lambda e: self._on_target_changed())
+        bus.subscribe(GoalSaved, lambda e: self._on_target_changed())
+        bus.subscribe(DataCleared, lambda e: self._on_log_replaced())
+        # A batch (e.g. a planned template) refreshes the views once
+        bus.subscribe(FoodsAdded, lambda e: self._on_log_replaced())
+        bus.subscribe(WorkoutsAdded, lambda e: self._on_log_replaced())
+        bus.subscribe(TemplatesChanged, lambda e: self._refresh_template_boxes())
+        bus.subscribe(DataCleared, lambda e: self._refresh_template_boxes())
+
+    # ---------------------------------------------------------- events
+
+    def _on_food_added(self, event: FoodAdded) -> None:
+        index = self._food_history.insert(event.entry)
+        if index is not None:
+            self.food_list.notify_inserted(index)
+            self.food_list.see(index)
+        self._chart_add(event.entry, +1)
+        self._note_food(event.entry, +1)
+        self._refresh_dashboard()
+
+    def _on_food_deleted(self, event: FoodDeleted) -> None:
+        index = self._food_history.remove(event.entry)
+        if index is None:
+            self._refresh_food_list()
+        else:
+            self.food_list.notify_deleted(index)
+        self._chart_add(event.entry, -1)
+        self._note_food(event.entry, -1)
+        self._refresh_dashboard()
+
+    def _on_workout_added(self, event: WorkoutAdded) -> None:
+        index = self._workout_history.insert(event.entry)
+        if index is not None:
+            self.workout_list.notify_inserted(index)
+            self.workout_list.see(index)
+        self._refresh_dashboard()
+
+    def _on_workout_deleted(self, event: WorkoutDeleted) -> None:
+        index = self._workout_history.remove(event.entry)
+        if index is None:
+            self._refresh_workout_list()
+        else:
+            self.workout_list.notify_deleted(index)
+        self._refresh_dashboard()
+
+    def _on_log_replaced(self) -> None:
+        self._chart_cache.clear()
+        self._refresh_food_list()
+        self._refresh_workout_list()
+        self._refresh_chart()
+        self._refresh_dashboard()
+        self._idle.submit("chart-ranges", self._precompute_chart_ranges())
+        self._rebuild_suggestions()
+
+    # --------------------------------------------------------- history
+
+    def _history_bounds(self, label: str) -> tuple:
+        days = dict(HISTORY_RANGES).get(label, 0)
+        if days is None:
+            return None, None
+        return self._day - timedelta(days=days), self._day
+
+    def _history_range_box(self, parent, var: tk.StringVar, on_change) -> ttk.Combobox:
+        box = ttk.Combobox(
+            parent,
+            textvariable=var,
+            values=[label for label, _days in HISTORY_RANGES],
+            state="readonly",
+            width=14,
+        )
+        box.bind("<<ComboboxSelected>>", lambda e: on_change())
+        return box
+
+    @staticmethod
+    def _format_rows(entries, fmt, with_date: bool):
+        if with_date:
+            return [f"{e.date.isoformat()}  {fmt(e)}" for e in entries]
+        return [fmt(e) for e in entries]
 
     # ------------------------------------------------------------------ UI
 
     def _build_ui(self) -> None:
+        menubar = tk.Menu(self)
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self._undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self._redo)
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        self.config(menu=menubar)
+        # Undo the log everywhere, except in a Text with its own undo stack
+        self.bind_all("<Control-z>", self._undo)
+        self.bind_all("<Control-y>", self._redo)
+        self.bind_all("<Control-Z>", self._redo)
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.status_var, anchor="w", padding=(10, 2)).pack(
+            side="bottom", fill="x"
+        )
+
         notebook = ttk.Notebook(self)
         notebook.pack(fill="both", expand=True)
 
@@ -74,6 +308,7 @@ class FitGatorApp(tk.Tk):
         self.calorie_frame = ttk.Frame(notebook, padding=10)
         self.workout_frame = ttk.Frame(notebook, padding=10)
         self.dashboard_frame = ttk.Frame(notebook, padding=10)
+        self.search_frame = ttk.Frame(notebook, padding=10)
         self.settings_frame = ttk.Frame(notebook, padding=10)
 
         notebook.add(self.profile_frame, text="Profile")
@@ -81,6 +316,7 @@ class FitGatorApp(tk.Tk):
         notebook.add(self.calorie_frame, text="Calories")
         notebook.add(self.workout_frame, text="Workouts")
         notebook.add(self.dashboard_frame, text="Dashboard")
+        notebook.add(self.search_frame, text="Search")
         notebook.add(self.settings_frame, text="Settings")
 
         self._build_profile_tab()
@@ -88,8 +324,28 @@ class FitGatorApp(tk.Tk):
         self._build_calorie_tab()
         self._build_workout_tab()
         self._build_dashboard_tab()
+        self._build_search_tab()
         self._build_settings_tab()
 
+    @staticmethod
+    def _has_own_undo(widget) -> bool:
+        # Only a Text created with undo=True handles Ctrl+Z itself; entries don't
+        return isinstance(widget, tk.Text) and widget.tk.getboolean(widget.cget("undo"))
+
+    def _undo(self, event=None) -> str:
+        if event is not None and self._has_own_undo(event.widget):
+            return ""
+        label = self._repo.undo()
+        self.status_var.set(f"Undid {label}" if label else "Nothing to undo")
+        return "break"
+
+    def _redo(self, event=None) -> str:
+        if event is not None and self._has_own_undo(event.widget):
+            return ""
+        label = self._repo.redo()
+        self.status_var.set(f"Redid {label}" if label else "Nothing to redo")
+        return "break"
+
     # ---------------------------- Profile tab --------------------------
 
     def _build_profile_tab(self) -> None:
@@ -207,7 +463,6 @@ class FitGatorApp(tk.Tk):
         print("SAVED PROFILE TO:", os.path.abspath("fitgator.db"))
         self._profile = profile
         messagebox.showinfo("Saved", "Profile saved successfully.")
-        self._refresh_dashboard()
 
     # ---------------------------- Goal tab -----------------------------
 
@@ -240,7 +495,6 @@ class FitGatorApp(tk.Tk):
         self._repo.save_goal(goal)
         self._goal = goal
         messagebox.showinfo("Saved", f"Goal set to '{goal_type}'.")
-        self._refresh_dashboard()
 
     # -------------------------- Calories tab ---------------------------
 
@@ -249,26 +503,72 @@ class FitGatorApp(tk.Tk):
 
         ttk.Label(f, text="Food name:").grid(row=0, column=0, sticky="w")
         ttk.Label(f, text="Calories:").grid(row=1, column=0, sticky="w")
+        ttk.Label(f, text="Protein / carbs / fat / fiber (g):").grid(
+            row=2, column=0, sticky="w"
+        )
 
         self.food_name_var = tk.StringVar()
         self.food_cal_var = tk.StringVar()
+        self.food_macro_vars = {name: tk.StringVar() for name in MACRO_FIELDS}
 
-        ttk.Entry(f, textvariable=self.food_name_var).grid(row=0, column=1, sticky="ew")
+        # Typing suggests foods logged before; picking one fills in its numbers
+        self.food_name_box = ttk.Combobox(f, textvariable=self.food_name_var)
+        self.food_name_box.grid(row=0, column=1, sticky="ew")
+        self.food_name_box.bind("<KeyRelease>", self._suggest_foods)
+        self.food_name_box.bind("<<ComboboxSelected>>", self._use_suggestion)
         ttk.Entry(f, textvariable=self.food_cal_var).grid(row=1, column=1, sticky="ew")
+        macro_row = ttk.Frame(f)
+        macro_row.grid(row=2, column=1, sticky="ew")
+        for i, name in enumerate(MACRO_FIELDS):
+            ttk.Entry(macro_row, textvariable=self.food_macro_vars[name], width=6).grid(
+                row=0, column=i, padx=(0, 4)
+            )
 
         ttk.Button(f, text="Add Entry", command=self._add_food_entry).grid(
-            row=2, column=0, columnspan=2, pady=10
+            row=3, column=0, columnspan=2, pady=10
         )
 
-        ttk.Label(f, text="Today's entries:").grid(row=3, column=0, sticky="w")
-        self.food_listbox = tk.Listbox(f, height=10)
-        self.food_listbox.grid(row=4, column=0, columnspan=2, sticky="nsew")
+        # Meal templates
+        ttk.Label(f, text="Meal templates:").grid(row=4, column=0, sticky="w")
+        self.meal_template_var = tk.StringVar()
+        self.meal_template_box = ttk.Combobox(
+            f,
+            textvariable=self.meal_template_var,
+            values=self._template_names("food"),
+            state="readonly",
+        )
+        self.meal_template_box.grid(row=4, column=1, sticky="ew")
+        meal_buttons = ttk.Frame(f)
+        meal_buttons.grid(row=5, column=0, columnspan=2, pady=(4, 10))
+        ttk.Button(
+            meal_buttons,
+            text="Add to Today",
+            command=lambda: self._add_template_today(self.meal_template_var),
+        ).grid(row=0, column=0, padx=2)
+        ttk.Button(
+            meal_buttons,
+            text="Plan Next 4 Weeks",
+            command=lambda: self._plan_template(self.meal_template_var),
+        ).grid(row=0, column=1, padx=2)
+        ttk.Button(
+            meal_buttons,
+            text="Save Today as Template",
+            command=self._save_today_as_template,
+        ).grid(row=0, column=2, padx=2)
+
+        ttk.Label(f, text="Entries:").grid(row=6, column=0, sticky="w")
+        self.food_range_var = tk.StringVar(value=HISTORY_RANGES[0][0])
+        self._history_range_box(f, self.food_range_var, self._refresh_food_list).grid(
+            row=6, column=1, sticky="e"
+        )
+        self.food_list = VirtualListView(f, fetch=lambda offset, limit: [], height=10)
+        self.food_list.grid(row=7, column=0, columnspan=2, sticky="nsew")
 
         ttk.Button(f, text="Delete Selected", command=self._delete_food_entry).grid(
-            row=5, column=0, columnspan=2, pady=5
+            row=8, column=0, columnspan=2, pady=5
         )
 
-        f.rowconfigure(4, weight=1)
+        f.rowconfigure(7, weight=1)
         f.columnconfigure(1, weight=1)
 
         self._refresh_food_list()
@@ -285,36 +585,68 @@ class FitGatorApp(tk.Tk):
             messagebox.showerror("Error", "Calories must be an integer.")
             return
 
-        entry = FoodEntry(date=date.today(), name=name, calories=calories)
-        self._foods.append(entry)
-        self._repo.save_foods(self._foods)
+        macros = {}
+        for field_name, var in self.food_macro_vars.items():
+            text = var.get().strip()
+            try:
+                macros[field_name] = float(text) if text else 0.0
+            except ValueError:
+                messagebox.showerror("Error", "Macros must be numbers (grams).")
+                return
+            if macros[field_name] < 0:
+                messagebox.showerror("Error", "Macros cannot be negative.")
+                return
+
+        entry = FoodEntry(date=date.today(), name=name, calories=calories, **macros)
+        self._repo.add_food(entry)
         self.food_name_var.set("")
         self.food_cal_var.set("")
-        self._refresh_food_list()
-        self._refresh_dashboard()
+        for var in self.food_macro_vars.values():
+            var.set("")
+
+    def _suggest_foods(self, event=None) -> None:
+        self._food_matches = self._suggestions.match(self.food_name_var.get())
+        self.food_name_box["values"] = [f.name for f in self._food_matches]
+
+    def _use_suggestion(self, event=None) -> None:
+        """Fill calories and macros from the last time this food was logged."""
+        i = self.food_name_box.current()
+        if not 0 <= i < len(self._food_matches):
+            return
+        food = self._food_matches[i]
+        self.food_cal_var.set(str(food.calories))
+        for name, var in self.food_macro_vars.items():
+            value = getattr(food, name)
+            var.set(f"{value:g}" if value else "")
 
     def _refresh_food_list(self) -> None:
-        self.food_listbox.delete(0, tk.END)
-        today = date.today()
-        for entry in self._foods:
-            if entry.date == today:
-                self.food_listbox.insert(
-                    tk.END, f"{entry.name} - {entry.calories} kcal"
-                )
+        start, end = self._history_bounds(self.food_range_var.get())
+        self._food_history = PagedHistory(self._repo, FOODS, start, end)
+        with_date = start != end
+        history = self._food_history
+        self.food_list.reset(
+            len(history),
+            lambda offset, limit: self._format_rows(
+                history.rows(offset, limit),
+                self._format_food,
+                with_date,
+            ),
+        )
+
+    @staticmethod
+    def _format_food(e: FoodEntry) -> str:
+        text = f"{e.name} - {e.calories} kcal"
+        if e.protein_g or e.carbs_g or e.fat_g:
+            text += f" (P {e.protein_g:g} / C {e.carbs_g:g} / F {e.fat_g:g} g)"
+        return text
 
     def _delete_food_entry(self) -> None:
-        idx = self.food_listbox.curselection()
-        if not idx:
+        idx: Optional[int] = self.food_list.selected_index()
+        if idx is None:
             return
-        # Map visible index back to underlying list index by filtering today's entries
-        today = date.today()
-        today_entries = [e for e in self._foods if e.date == today]
-        selected = today_entries[idx[0]]
-        # Remove the selected entry object from the full list
-        self._foods = [e for e in self._foods if e is not selected]
-        self._repo.save_foods(self._foods)
-        self._refresh_food_list()
-        self._refresh_dashboard()
+        rows = self._food_history.rows(idx, 1)
+        if rows:
+            self._repo.delete_food(rows[0])
 
     # -------------------------- Workouts tab ---------------------------
 
@@ -346,7 +678,7 @@ class FitGatorApp(tk.Tk):
         self.workout_plan_box = ttk.Combobox(
             f,
             textvariable=self.workout_plan_var,
-            values=list(WORKOUT_PLANS.keys()),
+            values=self._template_names("workout"),
             state="readonly",
         )
         self.workout_plan_box.grid(row=3, column=1, sticky="ew", pady=(10, 0))
@@ -362,16 +694,27 @@ class FitGatorApp(tk.Tk):
             justify="left",
         ).grid(row=4, column=0, columnspan=2, sticky="w", pady=(4, 4))
 
+        plan_buttons = ttk.Frame(f)
+        plan_buttons.grid(row=5, column=0, columnspan=2, pady=(4, 10))
         ttk.Button(
-            f,
+            plan_buttons,
             text="Add Plan to Today's Workouts",
-            command=self._add_plan_to_workouts,
-        ).grid(row=5, column=0, columnspan=2, pady=(4, 10))
-
-        # Existing list of today's workouts
-        ttk.Label(f, text="Today's workouts:").grid(row=6, column=0, sticky="w")
-        self.workout_listbox = tk.Listbox(f, height=8)
-        self.workout_listbox.grid(row=7, column=0, columnspan=2, sticky="nsew")
+            command=lambda: self._add_template_today(self.workout_plan_var, completed=True),
+        ).grid(row=0, column=0, padx=2)
+        ttk.Button(
+            plan_buttons,
+            text="Plan Next 4 Weeks",
+            command=lambda: self._plan_template(self.workout_plan_var),
+        ).grid(row=0, column=1, padx=2)
+
+        # Logged workouts for the selected range
+        ttk.Label(f, text="Workouts:").grid(row=6, column=0, sticky="w")
+        self.workout_range_var = tk.StringVar(value=HISTORY_RANGES[0][0])
+        self._history_range_box(f, self.workout_range_var, self._refresh_workout_list).grid(
+            row=6, column=1, sticky="e"
+        )
+        self.workout_list = VirtualListView(f, fetch=lambda offset, limit: [], height=8)
+        self.workout_list.grid(row=7, column=0, columnspan=2, sticky="nsew")
 
         f.rowconfigure(7, weight=1)
         f.columnconfigure(1, weight=1)
@@ -389,62 +732,118 @@ class FitGatorApp(tk.Tk):
             completed=self.workout_completed_var.get(),
             notes="",
         )
-        self._workouts.append(entry)
-        self._repo.save_workouts(self._workouts)
+        self._repo.add_workout(entry)
         self.workout_name_var.set("")
-        self._refresh_workout_list()
-        self._refresh_dashboard()
 
     def _refresh_workout_list(self) -> None:
-        self.workout_listbox.delete(0, tk.END)
-        today = date.today()
-        for w in self._workouts:
-            if w.date == today:
-                status = "✅" if w.completed else "❌"
-                self.workout_listbox.insert(
-                    tk.END, f"{status} {w.routine_name}"
-                )
+        start, end = self._history_bounds(self.workout_range_var.get())
+        self._workout_history = PagedHistory(self._repo, WORKOUTS, start, end)
+        with_date = start != end
+        history = self._workout_history
+        self.workout_list.reset(
+            len(history),
+            lambda offset, limit: self._format_rows(
+                history.rows(offset, limit),
+                lambda w: f"{'✅' if w.completed else '❌'} {w.routine_name}",
+                with_date,
+            ),
+        )
 
     def _on_plan_selected(self, event=None) -> None:
-        plan_name = self.workout_plan_var.get()
-        exercises = WORKOUT_PLANS.get(plan_name)
-        if not exercises:
+        template = self._templates.get(self.workout_plan_var.get())
+        if template is None:
             self.plan_preview_var.set(
                 "Select a plan to see today's suggested exercises."
             )
             return
 
-        lines = [f"- {e}" for e in exercises]
+        lines = [f"- {it.name}" for it in template.items]
+        lines.append(f"Repeats: {template.recurrence}")
         self.plan_preview_var.set("\n".join(lines))
 
-    def _add_plan_to_workouts(self) -> None:
-        plan_name = self.workout_plan_var.get()
-        exercises = WORKOUT_PLANS.get(plan_name)
-        if not exercises:
-            messagebox.showerror("Error", "Please select a workout plan first.")
-            return
+    # -------------------------- Templates ------------------------------
 
-        today = date.today()
-        added = 0
-        for exercise in exercises:
-            entry = WorkoutEntry(
-                date=today,
-                routine_name=exercise,
-                completed=True,
-                notes=f"Plan: {plan_name}",
-            )
-            self._workouts.append(entry)
-            added += 1
+    def _load_templates(self) -> None:
+        self._templates = {t.name: t for t in self._repo.load_templates()}
 
-        self._repo.save_workouts(self._workouts)
-        self._refresh_workout_list()
-        self._refresh_dashboard()
+    def _template_names(self, kind: str) -> list:
+        return [name for name, t in self._templates.items() if t.kind == kind]
+
+    def _refresh_template_boxes(self) -> None:
+        self._load_templates()
+        self.meal_template_box["values"] = self._template_names("food")
+        self.workout_plan_box["values"] = self._template_names("workout")
+        self._on_plan_selected()
+
+    def _selected_template(self, var: tk.StringVar) -> Optional[Template]:
+        template = self._templates.get(var.get())
+        if template is None:
+            messagebox.showerror("Error", "Please select a template first.")
+        return template
+
+    def _add_template_today(self, var: tk.StringVar, completed: bool = False) -> None:
+        """Add every item of the template to today, whatever its recurrence."""
+        template = self._selected_template(var)
+        if template is None:
+            return
+        today = date.today()
+        added = apply_template(
+            self._repo, replace(template, recurrence="daily"), today, today, completed=completed
+        )
+        messagebox.showinfo(
+            "Template added",
+            f"Added {added} entries from '{template.name}' to today.",
+        )
 
+    def _plan_template(self, var: tk.StringVar) -> None:
+        template = self._selected_template(var)
+        if template is None:
+            return
+        start = date.today()
+        end = start + timedelta(days=PLAN_AHEAD_DAYS - 1)
+        added = apply_template(self._repo, template, start, end)
         messagebox.showinfo(
-            "Plan added",
-            f"Added {added} workouts for plan '{plan_name}' to today.",
+            "Template planned",
+            f"Added {added} entries from '{template.name}' ({template.recurrence}) "
+            f"up to {end.isoformat()}.",
         )
 
+    def _save_today_as_template(self) -> None:
+        today = date.today()
+        foods = self._repo.load_foods_range(today, today)
+        if not foods:
+            messagebox.showerror("Error", "Log some food today first.")
+            return
+        name = simpledialog.askstring("Save template", "Template name:", parent=self)
+        if not name or not name.strip():
+            return
+        recurrence = simpledialog.askstring(
+            "Save template",
+            "Repeat on (daily, weekdays, weekends or e.g. mon,wed,fri):",
+            initialvalue="daily",
+            parent=self,
+        )
+        if recurrence is None:
+            return
+        try:
+            parse_recurrence(recurrence)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        items = [
+            TemplateItem(
+                name=f.name,
+                calories=f.calories,
+                protein_g=f.protein_g,
+                carbs_g=f.carbs_g,
+                fat_g=f.fat_g,
+                fiber_g=f.fiber_g,
+            )
+            for f in foods
+        ]
+        self._repo.save_template(Template(name.strip(), "food", items, recurrence.strip().lower()))
+        self.meal_template_var.set(name.strip())
+
     # -------------------------- Dashboard tab --------------------------
 
     def _build_dashboard_tab(self) -> None:
@@ -471,33 +870,190 @@ class FitGatorApp(tk.Tk):
             row=3, column=1, sticky="w"
         )
 
-        ttk.Button(f, text="Refresh", command=self._refresh_dashboard).grid(
-            row=4, column=0, columnspan=2, pady=10
+        # Macros: consumed today / target, then this week's daily average
+        self.macro_vars = {name: tk.StringVar(value="-") for name in MACRO_FIELDS}
+        for i, name in enumerate(MACRO_FIELDS):
+            label = name[:-2].capitalize() + " (g):"
+            ttk.Label(f, text=label).grid(row=4 + i, column=0, sticky="w")
+            ttk.Label(f, textvariable=self.macro_vars[name]).grid(
+                row=4 + i, column=1, sticky="w"
+            )
+        self.week_macros_var = tk.StringVar(value="")
+        ttk.Label(f, text="This week (avg/day):").grid(row=8, column=0, sticky="w")
+        ttk.Label(f, textvariable=self.week_macros_var).grid(row=8, column=1, sticky="w")
+
+        ttk.Button(f, text="Refresh", command=self._reload_dashboard).grid(
+            row=9, column=0, columnspan=2, pady=10
+        )
+
+        # Calorie intake vs target; wheel to zoom, drag to pan
+        ttk.Label(f, text="Calorie trend:").grid(row=10, column=0, sticky="w")
+        self.chart_range_var = tk.StringVar(value=CHART_RANGES[0][0])
+        chart_range = ttk.Combobox(
+            f,
+            textvariable=self.chart_range_var,
+            values=[label for label, _ in CHART_RANGES],
+            state="readonly",
+            width=14,
         )
+        chart_range.grid(row=10, column=1, sticky="e")
+        chart_range.bind("<<ComboboxSelected>>", lambda e: self._refresh_chart())
+        self.calorie_chart = TrendChart(f, height=180)
+        self.calorie_chart.grid(row=11, column=0, columnspan=2, sticky="nsew")
+        f.rowconfigure(11, weight=1)
 
         for i in range(2):
             f.columnconfigure(i, weight=1)
 
+        self._refresh_chart()
+
+        self._refresh_dashboard()
+
+    def _reload_dashboard(self) -> None:
+        if date.today() != self._day:
+            self._roll_over()
+            return
+        self._load_today()
+        self._chart_cache.clear()
+        self._refresh_views()
+        self._idle.submit("chart-ranges", self._precompute_chart_ranges())
+
+    def _refresh_views(self) -> None:
+        self._refresh_food_list()
+        self._refresh_workout_list()
+        self._refresh_chart()
+        self._refresh_dashboard()
+
+    def _chart_range(self, label: Optional[str] = None) -> tuple:
+        days = dict(CHART_RANGES).get(label or self.chart_range_var.get(), 29)
+        return (None if days is None else self._day - timedelta(days=days)), self._day
+
+    def _chart_totals(self, label: str) -> Dict[date, int]:
+        """Per-day calories for one chart range, summed in storage once and
+        then kept current by :meth:`_chart_add`."""
+        totals = self._chart_cache.get(label)
+        if totals is None:
+            start, end = self._chart_range(label)
+            totals = {
+                d: t.calories for d, t in self._repo.daily_macro_totals(start, end).items()
+            }
+            self._chart_cache[label] = totals
+        return totals
+
+    def _precompute_chart_ranges(self):
+        """Idle task: sum every chart range so switching ranges is instant."""
+        for label, _ in CHART_RANGES:
+            self._chart_totals(label)
+            yield
+
+    def _refresh_chart(self) -> None:
+        self.calorie_chart.set_series(
+            self._chart_totals(self.chart_range_var.get()),
+            target=self._dashboard.target if self._dashboard.ready else None,
+        )
+
+    def _chart_add(self, entry: FoodEntry, sign: int) -> None:
+        delta = sign * entry.calories
+        for label, totals in self._chart_cache.items():
+            start, end = self._chart_range(label)
+            if (start is None or entry.date >= start) and entry.date <= end:
+                totals[entry.date] = totals.get(entry.date, 0) + delta
+                if totals[entry.date] <= 0:
+                    del totals[entry.date]
+        start, end = self._chart_range()
+        if (start is None or entry.date >= start) and entry.date <= end:
+            self.calorie_chart.add_to_day(entry.date, delta)
+
+    def _on_target_changed(self) -> None:
+        self.calorie_chart.set_target(self._dashboard.target if self._dashboard.ready else None)
         self._refresh_dashboard()
 
     def _refresh_dashboard(self) -> None:
-        if not (self._profile and self._goal):
+        if date.today() != self._day:
+            self._roll_over()
+            return
+
+        self._refresh_week_macros()
+        if not self._dashboard.ready:
             self.target_var.set("Set profile & goal first")
             self.consumed_var.set("0")
             self.remaining_var.set("0")
             self.workouts_done_var.set("0")
+            for name in MACRO_FIELDS:
+                self.macro_vars[name].set(f"{getattr(self._dashboard.macros, name):g}")
             return
 
-        summary = daily_summary(
-            self._profile,
-            self._goal.goal_type,
-            self._foods,
-            self._workouts,
-        )
+        summary = self._dashboard.summary()
         self.target_var.set(str(summary["target_calories"]))
         self.consumed_var.set(str(summary["consumed_calories"]))
         self.remaining_var.set(str(summary["remaining_calories"]))
         self.workouts_done_var.set(str(summary["workouts_completed"]))
+        targets = self._dashboard.macro_targets
+        for name in MACRO_FIELDS:
+            consumed = getattr(self._dashboard.macros, name)
+            self.macro_vars[name].set(f"{consumed:g} / {getattr(targets, name)}")
+
+    def _refresh_week_macros(self) -> None:
+        """Average daily macros so far this week, summed in storage."""
+        monday = week_start(self._day)
+        daily = self._repo.daily_macro_totals(monday, self._day)
+        week = weekly_totals(daily).get(monday)
+        if week is None:
+            self.week_macros_var.set("no entries yet")
+            return
+        days = len(daily)
+        self.week_macros_var.set(
+            f"{week.calories // days} kcal, P {week.protein_g / days:.0f} / "
+            f"C {week.carbs_g / days:.0f} / F {week.fat_g / days:.0f} g"
+        )
+
+    # --------------------------- Search tab ----------------------------
+
+    def _build_search_tab(self) -> None:
+        f = self.search_frame
+
+        ttk.Label(f, text="Search foods & workouts:").grid(row=0, column=0, sticky="w")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(f, textvariable=self.search_var)
+        search_entry.grid(row=0, column=1, sticky="ew")
+        search_entry.bind("<Return>", lambda _e: self._run_search())
+
+        ttk.Button(f, text="Search", command=self._run_search).grid(
+            row=0, column=2, padx=(5, 0)
+        )
+
+        self.search_status_var = tk.StringVar(value="")
+        ttk.Label(f, textvariable=self.search_status_var).grid(
+            row=1, column=0, columnspan=3, sticky="w", pady=(5, 0)
+        )
+
+        self.search_listbox = tk.Listbox(f, height=15)
+        self.search_listbox.grid(row=2, column=0, columnspan=3, sticky="nsew")
+
+        f.rowconfigure(2, weight=1)
+        f.columnconfigure(1, weight=1)
+
+    def _run_search(self) -> None:
+        query = self.search_var.get().strip()
+        self.search_listbox.delete(0, tk.END)
+        if not query:
+            self.search_status_var.set("")
+            return
+
+        foods, workouts = self._repo.search(query)
+        for entry in foods:
+            self.search_listbox.insert(
+                tk.END, f"{entry.date.isoformat()}  🍽 {entry.name} - {entry.calories} kcal"
+            )
+        for w in workouts:
+            status = "✅" if w.completed else "❌"
+            notes = f" ({w.notes})" if w.notes else ""
+            self.search_listbox.insert(
+                tk.END, f"{w.date.isoformat()}  {status} {w.routine_name}{notes}"
+            )
+        self.search_status_var.set(
+            f"{len(foods)} food entries, {len(workouts)} workouts"
+        )
 
     # -------------------------- Settings tab ---------------------------
 
@@ -518,6 +1074,20 @@ class FitGatorApp(tk.Tk):
             command=self._export_data_csv,
         ).pack(pady=5)
 
+        # Backups (SQLite only: they use the online backup API)
+        self.backup_status_var = tk.StringVar()
+        backup_button = ttk.Button(f, text="Backup Now", command=self._backup_now)
+        backup_button.pack(pady=5)
+        ttk.Label(f, textvariable=self.backup_status_var).pack()
+        if self._backup_enabled():
+            latest = backup.list_backups(self._repo.db_path, self._backup_dir())
+            self.backup_status_var.set(
+                f"Last backup: {os.path.basename(latest[0])}" if latest else "No backups yet"
+            )
+        else:
+            backup_button.state(["disabled"])
+            self.backup_status_var.set("Backups are available with the SQLite database")
+
         # Clear data button
         ttk.Button(
             f,
@@ -525,16 +1095,52 @@ class FitGatorApp(tk.Tk):
             command=self._clear_data_confirm,
         ).pack(pady=20)
 
+    def _backup_enabled(self) -> bool:
+        return getattr(self._repo, "db_path", ":memory:") != ":memory:"
+
+    def _backup_dir(self) -> str:
+        return os.path.join(os.path.dirname(os.path.abspath(self._repo.db_path)), BACKUP_DIR)
+
+    def _backup_now(self) -> None:
+        """Start a backup on the background thread and poll until it ends."""
+        if self._backup_job is not None:
+            return
+        self.backup_status_var.set("Backing up…")
+        self._backup_job = backup.backup_in_background(self._repo.db_path, self._backup_dir())
+        self.after(BACKUP_POLL_MS, self._poll_backup)
+
+    def _poll_backup(self) -> None:
+        if not self._backup_job.done():
+            self.after(BACKUP_POLL_MS, self._poll_backup)
+            return
+        job, self._backup_job = self._backup_job, None
+        try:
+            path = job.result()
+        except Exception as e:
+            self.backup_status_var.set(f"Backup failed: {e}")
+            return
+        self.backup_status_var.set(f"Last backup: {os.path.basename(path)}")
+
+    def _scheduled_backup(self) -> None:
+        """Back up when the newest backup is older than BACKUP_INTERVAL."""
+        latest = backup.list_backups(self._repo.db_path, self._backup_dir())
+        if latest:
+            taken = datetime.fromtimestamp(os.path.getmtime(latest[0]))
+            due = datetime.now() - taken >= BACKUP_INTERVAL
+        else:
+            due = True
+        if due:
+            self._backup_now()
+        self.after(BACKUP_CHECK_MS, self._scheduled_backup)
+
     def _clear_data_confirm(self) -> None:
         if not messagebox.askyesno(
-            "Confirm", "This will delete ALL local data. Continue?"
+            "Confirm", "This will delete ALL local data and cannot be undone. Continue?"
         ):
             return
         self._repo.clear_all()
         self._profile = None
         self._goal = None
-        self._foods.clear()
-        self._workouts.clear()
         # Clear UI
         self.age_var.set("")
         self.weight_var.set("")
@@ -543,9 +1149,6 @@ class FitGatorApp(tk.Tk):
         self.unit_var.set("metric")
         self.activity_level_var.set("Moderate exercise (3–5 days/week)")
         self.goal_var.set("maintain")
-        self._refresh_food_list()
-        self._refresh_workout_list()
-        self._refresh_dashboard()
         messagebox.showinfo("Done", "All data cleared.")
 
     def _export_data_csv(self) -> None:
@@ -560,38 +1163,7 @@ class FitGatorApp(tk.Tk):
         export_path = "fitgator_export.csv"
 
         try:
-            with open(export_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(
-                    ["type", "date", "name", "calories", "completed", "notes"]
-                )
-
-                # Food entries
-                for food in foods:
-                    writer.writerow(
-                        [
-                            "food",
-                            food.date.isoformat(),
-                            food.name,
-                            food.calories,
-                            "",
-                            "",
-                        ]
-                    )
-
-                # Workout entries
-                for w in workouts:
-                    writer.writerow(
-                        [
-                            "workout",
-                            w.date.isoformat(),
-                            w.routine_name,
-                            "",
-                            "yes" if w.completed else "no",
-                            getattr(w, "notes", ""),
-                        ]
-                    )
-
+            write_csv(export_path, foods, workouts)
             messagebox.showinfo(
                 "Export complete",
                 f"Data exported to {export_path} in the current folder.",
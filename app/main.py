@@ -1,10 +1,12 @@
+from fitgator.data.cached_repo import CachedRepository
 from fitgator.data.sqlite_repo import SQLiteRepository
 from app.gui import FitGatorApp
 
 
 def main() -> None:
-    # Use SQLite as the persistence layer
-    repo = SQLiteRepository("fitgator.db")
+    # Use SQLite as the persistence layer, behind a page cache so browsing
+    # history never reads the same days from disk twice
+    repo = CachedRepository(SQLiteRepository("fitgator.db"))
 
     # Launch the Tkinter GUI
     app = FitGatorApp(repo)
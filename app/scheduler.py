@@ -0,0 +1,94 @@
+"""Cooperative background work on the Tk event loop.
+
+Work that is not needed right now (warming caches, rebuilding aggregates,
+preparing tomorrow's dashboard) is written as a generator that does a
+small piece of work per ``next()``. :class:`IdleScheduler` steps those
+generators only when Tk is idle, a few milliseconds at a time, and hands
+control back to the event loop between slices, so the window never stops
+redrawing or answering input.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generator, Optional
+
+SLICE_MS = 8  # work per slice; well under one 60 Hz frame
+GAP_MS = 1  # pause between slices so queued events run first
+
+log = logging.getLogger(__name__)
+
+Task = Generator[Any, None, Any]
+
+
+class IdleScheduler:
+    """Run named generator tasks in time slices between UI events.
+
+    ``widget`` is anything with Tk's ``after``/``after_idle``/``after_cancel``
+    (normally the root window; tests pass a fake). Tasks run in submission
+    order. Submitting under a name that is still queued replaces the old
+    task, so "rebuild X" can be requested after every change without
+    piling up work. When a task finishes, ``on_done`` gets its return
+    value. A task that raises is logged and dropped.
+    """
+
+    def __init__(
+        self,
+        widget,
+        slice_ms: float = SLICE_MS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._widget = widget
+        self.slice_ms = slice_ms
+        self._clock = clock
+        self._tasks: "OrderedDict[str, tuple]" = OrderedDict()
+        self._job = None
+        self.slices = 0
+
+    def submit(self, name: str, task: Task, on_done: Optional[Callable[[Any], None]] = None) -> None:
+        self.cancel(name)
+        self._tasks[name] = (task, on_done)
+        self._wake()
+
+    def cancel(self, name: str) -> None:
+        entry = self._tasks.pop(name, None)
+        if entry is not None:
+            entry[0].close()
+
+    def cancel_all(self) -> None:
+        for name in list(self._tasks):
+            self.cancel(name)
+        if self._job is not None:
+            self._widget.after_cancel(self._job)
+            self._job = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _wake(self) -> None:
+        if self._job is None and self._tasks:
+            self._job = self._widget.after_idle(self._run)
+
+    def _resume(self) -> None:
+        self._job = self._widget.after_idle(self._run)
+
+    def _run(self) -> None:
+        self._job = None
+        self.slices += 1
+        deadline = self._clock() + self.slice_ms / 1000
+        while self._tasks and self._clock() < deadline:
+            name, (task, on_done) = next(iter(self._tasks.items()))
+            try:
+                next(task)
+            except StopIteration as done:
+                # on_done may submit follow-up work, so drop the task first
+                del self._tasks[name]
+                if on_done is not None:
+                    on_done(done.value)
+            except Exception:
+                log.exception("background task %r failed", name)
+                self._tasks.pop(name, None)
+        if self._tasks:
+            self._job = self._widget.after(GAP_MS, self._resume)
@@ -0,0 +1,159 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional
+
+
+class VirtualListView(ttk.Frame):
+    """A list that only renders the rows currently visible.
+
+    Rows are pulled on demand through ``fetch(offset, limit)``, so the
+    widget holds at most one screenful of text no matter how long the
+    underlying list is. Inserts and deletes are applied in place with
+    :meth:`notify_inserted` / :meth:`notify_deleted` instead of rebuilding.
+    """
+
+    def __init__(
+        self,
+        master,
+        fetch: Callable[[int, int], List[str]],
+        size: int = 0,
+        height: int = 10,
+    ) -> None:
+        super().__init__(master)
+        self._fetch = fetch
+        self._size = size
+        self._top = 0
+        self._selected: Optional[int] = None
+        self._visible = height
+
+        self._listbox = tk.Listbox(self, height=height, exportselection=False)
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self._listbox.grid(row=0, column=0, sticky="nsew")
+        self._scrollbar.grid(row=0, column=1, sticky="ns")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self._listbox.bind("<<ListboxSelect>>", self._on_select)
+        self._listbox.bind("<Configure>", self._on_resize)
+        self._listbox.bind("<MouseWheel>", self._on_wheel)
+        self._listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self._listbox.bind("<Button-5>", lambda e: self.scroll(3))
+        self._listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self._listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self._listbox.bind("<Prior>", lambda e: self.scroll(-self._visible))
+        self._listbox.bind("<Next>", lambda e: self.scroll(self._visible))
+
+        self._render()
+
+    # --- public API -------------------------------------------------------
+
+    def reset(self, size: int, fetch: Optional[Callable[[int, int], List[str]]] = None) -> None:
+        """Point the view at a new list (or new length) and redraw."""
+        if fetch is not None:
+            self._fetch = fetch
+        self._size = size
+        self._selected = None
+        self._top = min(self._top, self._max_top())
+        self._render()
+
+    def selected_index(self) -> Optional[int]:
+        """Absolute row number of the selection, if any."""
+        return self._selected
+
+    def see(self, index: int) -> None:
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._visible:
+            self._top = index - self._visible + 1
+        self._top = max(0, min(self._top, self._max_top()))
+        self._render()
+
+    def scroll(self, rows: int) -> str:
+        top = max(0, min(self._top + rows, self._max_top()))
+        if top != self._top:
+            self._top = top
+            self._render()
+        return "break"
+
+    def notify_inserted(self, index: int, count: int = 1) -> None:
+        self._size += count
+        if self._selected is not None and self._selected >= index:
+            self._selected += count
+        if index < self._top:
+            # Keep the same rows on screen
+            self._top += count
+            self._update_scrollbar()
+        elif index < self._top + self._visible:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def notify_deleted(self, index: int, count: int = 1) -> None:
+        self._size = max(0, self._size - count)
+        if self._selected is not None:
+            if index <= self._selected < index + count:
+                self._selected = None
+            elif self._selected >= index + count:
+                self._selected -= count
+        if index < self._top:
+            self._top = max(0, self._top - count)
+        self._top = min(self._top, self._max_top())
+        if index < self._top + self._visible + count:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    # --- rendering --------------------------------------------------------
+
+    def _max_top(self) -> int:
+        return max(0, self._size - self._visible)
+
+    def _render(self) -> None:
+        rows = self._fetch(self._top, self._visible) if self._size else []
+        self._listbox.delete(0, tk.END)
+        if rows:
+            self._listbox.insert(tk.END, *rows)
+        if self._selected is not None and self._top <= self._selected < self._top + len(rows):
+            self._listbox.selection_set(self._selected - self._top)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        if self._size <= self._visible:
+            self._scrollbar.set(0.0, 1.0)
+            return
+        first = self._top / self._size
+        last = min(1.0, (self._top + self._visible) / self._size)
+        self._scrollbar.set(first, last)
+
+    # --- event handlers ---------------------------------------------------
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == "moveto":
+            self._top = max(0, min(int(float(amount) * self._size), self._max_top()))
+            self._render()
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_wheel(self, event) -> str:
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event) -> None:
+        line_height = self._listbox.winfo_reqheight() / max(1, int(self._listbox.cget("height")))
+        visible = max(1, int(event.height // max(1, line_height)))
+        if visible != self._visible:
+            self._visible = visible
+            self._top = min(self._top, self._max_top())
+            self._render()
+
+    def _on_select(self, event=None) -> None:
+        sel = self._listbox.curselection()
+        self._selected = self._top + sel[0] if sel else None
+
+    def _move_selection(self, delta: int) -> str:
+        if not self._size:
+            return "break"
+        current = self._selected if self._selected is not None else self._top - delta
+        self._selected = max(0, min(current + delta, self._size - 1))
+        self.see(self._selected)
+        return "break"
@@ -0,0 +1,390 @@
+"""Headless command-line interface: ``python -m fitgator <command>``.
+
+Only ``argparse`` is imported at module load. Each command imports the
+repository and service modules it needs on first use, and nothing here
+ever touches ``tkinter``, so the CLI starts quickly from shell scripts
+and cron jobs.
+"""
+import argparse
+import sys
+from datetime import date
+from typing import List, Optional
+
+
+def _open_repo(path: str):
+    if path.endswith(".json"):
+        from .data.json_repo import JsonRepository
+        return JsonRepository(path)
+    from .data.sqlite_repo import SQLiteRepository
+    return SQLiteRepository(path, verbose=False)
+
+
+def _close_repo(repo) -> None:
+    close = getattr(repo, "close", None)
+    if close is not None:
+        close()
+
+
+def _cmd_log_food(repo, args: argparse.Namespace) -> int:
+    from .entities import FoodEntry
+    repo.add_food(
+        FoodEntry(
+            date=args.date,
+            name=args.name,
+            calories=args.calories,
+            protein_g=args.protein,
+            carbs_g=args.carbs,
+            fat_g=args.fat,
+            fiber_g=args.fiber,
+        )
+    )
+    print(f"Logged {args.name} ({args.calories} kcal) on {args.date.isoformat()}")
+    return 0
+
+
+def _cmd_log_workout(repo, args: argparse.Namespace) -> int:
+    from .entities import WorkoutEntry
+    repo.add_workout(
+        WorkoutEntry(
+            date=args.date,
+            routine_name=args.name,
+            completed=not args.incomplete,
+            notes=args.notes,
+        )
+    )
+    print(f"Logged workout {args.name} on {args.date.isoformat()}")
+    return 0
+
+
+def _cmd_summary(repo, args: argparse.Namespace) -> int:
+    from .services.dashboard import stream_daily_summary
+    from .services.macros import macro_targets
+    from .services.tracker import calories_for_day, workouts_completed
+
+    summary = stream_daily_summary(repo, args.date)
+    macros = repo.daily_macro_totals(args.date, args.date).get(args.date)
+
+    print(f"Date:               {args.date.isoformat()}")
+    if summary is not None:
+        print(f"Target:             {summary['target_calories']}")
+        print(f"Consumed:           {summary['consumed_calories']}")
+        print(f"Remaining:          {summary['remaining_calories']}")
+        print(f"Workouts completed: {summary['workouts_completed']}")
+        _print_macros(macros, macro_targets(repo.load_profile(), repo.load_goal().goal_type))
+    else:
+        print("Target:             set profile & goal first")
+        foods = repo.iter_foods(args.date, args.date)
+        workouts = repo.iter_workouts(args.date, args.date)
+        print(f"Consumed:           {calories_for_day(foods, args.date)}")
+        print(f"Workouts completed: {workouts_completed(workouts, args.date)}")
+        _print_macros(macros, None)
+    return 0
+
+
+def _print_macros(totals, targets) -> None:
+    for name, label in (("protein_g", "Protein"), ("carbs_g", "Carbs"),
+                        ("fat_g", "Fat"), ("fiber_g", "Fiber")):
+        consumed = getattr(totals, name) if totals is not None else 0
+        line = f"{label + ' (g):':20}{consumed:g}"
+        if targets is not None:
+            line += f" / {getattr(targets, name)}"
+        print(line)
+
+
+def _cmd_export(repo, args: argparse.Namespace) -> int:
+    from .services.export import write_csv
+    rows = write_csv(args.path, repo.iter_foods(), repo.iter_workouts())
+    print(f"Exported {rows} rows to {args.path}")
+    return 0
+
+
+def _cmd_snapshot(repo, args: argparse.Namespace) -> int:
+    from .data.snapshot import write_snapshot_from_repo
+    rows = write_snapshot_from_repo(repo, args.path, codec=args.codec)
+    print(f"Wrote {rows} rows to snapshot {args.path}")
+    return 0
+
+
+def _cmd_report(repo, args: argparse.Namespace) -> int:
+    from .services import reports
+
+    if args.db.endswith(".json"):
+        report = reports.build_report_from_repo(repo, year=args.year)
+    else:
+        report = reports.build_report(args.db, year=args.year, workers=args.workers)
+    if args.csv:
+        reports.write_report_csv(report, args.csv)
+    if args.json:
+        reports.write_report_json(report, args.json)
+    for y in report.years:
+        print(
+            f"{y.period}: {y.calories} kcal over {y.days_logged} days "
+            f"(avg {y.avg_daily_calories}), {y.workouts_completed} workouts, "
+            f"best streak {y.best_logging_streak} days"
+        )
+    return 0
+
+
+def _sqlite_only(repo, command: str) -> bool:
+    if hasattr(repo, "export_changes"):
+        return True
+    print(f"{command} needs a SQLite database", file=sys.stderr)
+    return False
+
+
+def _cmd_sync_export(repo, args: argparse.Namespace) -> int:
+    from .data.sync import write_changes
+    if not _sqlite_only(repo, "sync-export"):
+        return 2
+    bundle = repo.export_changes(args.since)
+    write_changes(bundle, args.path)
+    print(
+        f"Exported {len(bundle['foods'])} foods, {len(bundle['workouts'])} workouts and "
+        f"{len(bundle['tombstones'])} deletions to {args.path} "
+        f"(next time use --since {bundle['until']})"
+    )
+    return 0
+
+
+def _cmd_sync_apply(repo, args: argparse.Namespace) -> int:
+    from .data.sync import read_changes
+    if not _sqlite_only(repo, "sync-apply"):
+        return 2
+    stats = repo.apply_changes(read_changes(args.path))
+    print(
+        f"Applied {args.path}: {stats['added']} added, {stats['deleted']} deleted, "
+        f"{stats['skipped']} already up to date"
+    )
+    return 0
+
+
+def _cmd_backup(repo, args: argparse.Namespace) -> int:
+    import sqlite3
+
+    from .data.backup import backup_database
+    if args.db.endswith(".json"):
+        print("backup needs a SQLite database", file=sys.stderr)
+        return 2
+    try:
+        path = backup_database(args.db, args.dir, keep=args.keep)
+    except (RuntimeError, sqlite3.Error) as e:
+        print(f"Backup failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Backed up {args.db} to {path}")
+    return 0
+
+
+def _cmd_restore(repo, args: argparse.Namespace) -> int:
+    from .data.backup import restore_backup
+    try:
+        restore_backup(args.path, args.db)
+    except ValueError as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Restored {args.db} from {args.path}")
+    return 0
+
+
+def _cmd_migrate(repo, args: argparse.Namespace) -> int:
+    from .data.migrate import migrate_json_to_sqlite
+    if args.db.endswith(".json"):
+        print("migrate needs a SQLite target (--db PATH.db)", file=sys.stderr)
+        return 2
+    try:
+        stats = migrate_json_to_sqlite(args.source, args.db, batch_size=args.batch_size)
+    except (OSError, ValueError) as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Migrated {stats.foods} foods, {stats.workouts} workouts and "
+        f"{stats.templates} templates from {args.source} to {args.db}"
+    )
+    print(
+        f"{stats.seconds:.2f} s, {stats.rows_per_second:,.0f} rows/s, "
+        f"{stats.mb_per_second:.1f} MB/s"
+    )
+    if stats.archived_years:
+        print("Archived years: " + ", ".join(str(y) for y in stats.archived_years))
+    return 0
+
+
+def _cmd_template_list(repo, args: argparse.Namespace) -> int:
+    for t in repo.load_templates():
+        print(f"{t.name} [{t.kind}, {t.recurrence}]")
+        for it in t.items:
+            detail = f"{it.calories} kcal" if t.kind == "food" else it.notes
+            print(f"    {it.name}" + (f" ({detail})" if detail else ""))
+    return 0
+
+
+def _cmd_template_add(repo, args: argparse.Namespace) -> int:
+    from .entities import Template, TemplateItem
+    from .services.templates import parse_recurrence
+    if bool(args.food) == bool(args.workout):
+        print("give either --food or --workout items (not both)", file=sys.stderr)
+        return 2
+    try:
+        parse_recurrence(args.recurrence)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.food:
+        items = [TemplateItem(*spec) for spec in args.food]
+    else:
+        items = [TemplateItem(name=name, notes=f"Plan: {args.name}") for name in args.workout]
+    repo.save_template(
+        Template(args.name, "food" if args.food else "workout", items, args.recurrence)
+    )
+    print(f"Saved template {args.name} with {len(items)} items")
+    return 0
+
+
+def _cmd_template_delete(repo, args: argparse.Namespace) -> int:
+    repo.delete_template(args.name)
+    print(f"Deleted template {args.name}")
+    return 0
+
+
+def _cmd_plan(repo, args: argparse.Namespace) -> int:
+    from .services.templates import apply_template, find_template
+    try:
+        template = find_template(repo, args.name)
+        added = apply_template(repo, template, args.start, args.end, completed=args.completed)
+    except (KeyError, ValueError) as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    print(f"Added {added} entries from {args.name} between {args.start} and {args.end}")
+    return 0
+
+
+def _parse_food_item(s: str) -> tuple:
+    """NAME,CALORIES[,PROTEIN,CARBS,FAT,FIBER] -> TemplateItem arguments."""
+    parts = [p.strip() for p in s.split(",")]
+    try:
+        if not 2 <= len(parts) <= 6 or not parts[0]:
+            raise ValueError
+        return (parts[0], int(parts[1]), *(float(p) for p in parts[2:]))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid food item '{s}', expected NAME,CALORIES[,PROTEIN,CARBS,FAT,FIBER]"
+        )
+
+
+def _parse_date(s: str) -> date:
+    try:
+        return date.fromisoformat(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{s}', expected YYYY-MM-DD")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fitgator", description="FitGator headless CLI")
+    parser.add_argument(
+        "--db",
+        default="fitgator.db",
+        help="database file (a .json path selects the JSON backend)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("log-food", help="log a food entry")
+    p.add_argument("name")
+    p.add_argument("calories", type=int)
+    p.add_argument("--protein", type=float, default=0.0, help="grams of protein")
+    p.add_argument("--carbs", type=float, default=0.0, help="grams of carbohydrate")
+    p.add_argument("--fat", type=float, default=0.0, help="grams of fat")
+    p.add_argument("--fiber", type=float, default=0.0, help="grams of fiber")
+    p.add_argument("--date", type=_parse_date, default=date.today())
+    p.set_defaults(func=_cmd_log_food)
+
+    p = sub.add_parser("log-workout", help="log a workout")
+    p.add_argument("name")
+    p.add_argument("--incomplete", action="store_true", help="mark as not completed")
+    p.add_argument("--notes", default="")
+    p.add_argument("--date", type=_parse_date, default=date.today())
+    p.set_defaults(func=_cmd_log_workout)
+
+    p = sub.add_parser("summary", help="print the dashboard summary for a day")
+    p.add_argument("--date", type=_parse_date, default=date.today())
+    p.set_defaults(func=_cmd_summary)
+
+    p = sub.add_parser("export", help="export all foods and workouts to CSV")
+    p.add_argument("path", nargs="?", default="fitgator_export.csv")
+    p.set_defaults(func=_cmd_export)
+
+    p = sub.add_parser("snapshot", help="write a columnar snapshot for analytics")
+    p.add_argument("path", nargs="?", default="fitgator_snapshot.fgs")
+    p.add_argument("--codec", choices=["none", "zlib", "lzma"], default="zlib")
+    p.set_defaults(func=_cmd_snapshot)
+
+    p = sub.add_parser("report", help="monthly/yearly review (totals, streaks, top foods)")
+    p.add_argument("--year", type=int, help="only this year")
+    p.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    p.add_argument("--csv", help="write the report to this CSV file")
+    p.add_argument("--json", help="write the report to this JSON file")
+    p.set_defaults(func=_cmd_report)
+
+    p = sub.add_parser("sync-export", help="write changes for another device to a file")
+    p.add_argument("path", help="bundle file (.gz to compress)")
+    p.add_argument("--since", type=int, default=0, help="change counter of the last export")
+    p.set_defaults(func=_cmd_sync_export)
+
+    p = sub.add_parser("sync-apply", help="merge a change bundle from another device")
+    p.add_argument("path")
+    p.set_defaults(func=_cmd_sync_apply)
+
+    p = sub.add_parser("template-list", help="show meal and workout templates")
+    p.set_defaults(func=_cmd_template_list)
+
+    p = sub.add_parser("template-add", help="create or replace a meal/workout template")
+    p.add_argument("name")
+    p.add_argument("--food", action="append", type=_parse_food_item, default=[],
+                   metavar="NAME,KCAL[,P,C,F,FIBER]", help="food item (repeatable)")
+    p.add_argument("--workout", action="append", default=[], metavar="NAME",
+                   help="workout item (repeatable)")
+    p.add_argument("--recurrence", default="daily",
+                   help="daily, weekdays, weekends or days like mon,wed,fri")
+    p.set_defaults(func=_cmd_template_add)
+
+    p = sub.add_parser("template-delete", help="delete a template")
+    p.add_argument("name")
+    p.set_defaults(func=_cmd_template_delete)
+
+    p = sub.add_parser("plan", help="add a template's entries for every matching day")
+    p.add_argument("name", help="template name")
+    p.add_argument("--start", type=_parse_date, default=date.today())
+    p.add_argument("--end", type=_parse_date, required=True)
+    p.add_argument("--completed", action="store_true", help="mark planned workouts done")
+    p.set_defaults(func=_cmd_plan)
+
+    p = sub.add_parser("backup", help="copy the database and its archives while in use")
+    p.add_argument("--dir", default="backups", help="backup folder (default: backups)")
+    p.add_argument("--keep", type=int, default=7, help="number of backups to keep")
+    p.set_defaults(func=_cmd_backup)
+
+    p = sub.add_parser("restore", help="replace the database with a verified backup")
+    p.add_argument("path", help="backup folder created by the backup command")
+    # The database must not be open while its files are swapped
+    p.set_defaults(func=_cmd_restore, needs_repo=False)
+
+    p = sub.add_parser("migrate", help="stream a JSON data file into a new SQLite database")
+    p.add_argument("source", help="JSON data file, e.g. fitgator_data.json")
+    p.add_argument("--batch-size", type=int, default=50_000, help="rows per transaction")
+    # Opens the target itself, with indexes deferred during the load
+    p.set_defaults(func=_cmd_migrate, needs_repo=False)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not getattr(args, "needs_repo", True):
+        return args.func(None, args)
+    repo = _open_repo(args.db)
+    try:
+        return args.func(repo, args)
+    finally:
+        _close_repo(repo)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Online backups of a SQLite database and its year archives.
+
+Copies are taken with ``sqlite3.Connection.backup`` a few pages at a
+time, through connections of their own, so the app can keep reading and
+writing while a backup runs. (If another connection writes mid-copy,
+SQLite restarts that file's copy, so the result is always consistent.)
+
+Each backup is a directory ``<name>-YYYYmmdd-HHMMSS`` holding the main
+file and every archive file. It is written under a temporary name,
+checked with ``PRAGMA integrity_check`` and only then renamed into place,
+so a listed backup is always complete.
+"""
+import os
+import shutil
+import sqlite3
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from .sqlite_repo import archive_path, find_archives
+
+BACKUP_PAGES = 64  # pages copied per step
+BACKUP_SLEEP = 0.005  # seconds between steps, to let writers in
+KEEP_BACKUPS = 7
+
+_SUFFIX_FORMAT = "%Y%m%d-%H%M%S"
+
+# One worker: backups queue up instead of copying the same files twice at once
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _copy(src_path: str, dst_path: str, progress: Optional[Callable] = None) -> None:
+    src = sqlite3.connect(src_path)
+    dst = sqlite3.connect(dst_path)
+    try:
+        src.backup(dst, pages=BACKUP_PAGES, progress=progress, sleep=BACKUP_SLEEP)
+    finally:
+        dst.close()
+        src.close()
+
+
+def _check(path: str) -> bool:
+    uri = "file:" + urllib.parse.quote(os.path.abspath(path)) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+
+
+def _base_name(db_path: str) -> str:
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def list_backups(db_path: str, dest_dir: str) -> List[str]:
+    """Backup directories of ``db_path`` in ``dest_dir``, newest first."""
+    prefix = _base_name(db_path) + "-"
+    if not os.path.isdir(dest_dir):
+        return []
+    names = [
+        n for n in os.listdir(dest_dir)
+        if n.startswith(prefix) and not n.endswith(".tmp")
+        and os.path.isdir(os.path.join(dest_dir, n))
+    ]
+    return [os.path.join(dest_dir, n) for n in sorted(names, reverse=True)]
+
+
+def verify_backup(backup_dir: str, db_name: Optional[str] = None) -> bool:
+    """True if every database file in the backup passes an integrity check.
+
+    With ``db_name`` (the basename of the backed-up database) the check
+    covers that file and its year archives, and fails if the main file is
+    missing; otherwise every file in the folder is checked.
+    """
+    if db_name is not None:
+        main = os.path.join(backup_dir, db_name)
+        if not os.path.isfile(main):
+            return False
+        files = [main, *find_archives(main).values()]
+    else:
+        files = [
+            os.path.join(backup_dir, n) for n in os.listdir(backup_dir)
+            if os.path.isfile(os.path.join(backup_dir, n))
+        ]
+    return bool(files) and all(_check(path) for path in files)
+
+
+def backup_database(
+    db_path: str,
+    dest_dir: str,
+    keep: int = KEEP_BACKUPS,
+    now: Optional[datetime] = None,
+    progress: Optional[Callable] = None,
+) -> str:
+    """Back up ``db_path`` and its archives; returns the new backup directory.
+
+    Only the newest ``keep`` backups are kept. ``progress`` is passed on
+    to ``Connection.backup`` as ``progress(status, remaining, total)``.
+    Raises RuntimeError if the copy fails its integrity check.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    stamp = (now or datetime.now()).strftime(_SUFFIX_FORMAT)
+    final = os.path.join(dest_dir, f"{_base_name(db_path)}-{stamp}")
+    tmp = final + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        # Archives first: the main file is the one most likely to be written
+        copy_main = os.path.join(tmp, os.path.basename(db_path))
+        for year, path in sorted(find_archives(db_path).items()):
+            _copy(path, archive_path(copy_main, year), progress)
+        _copy(db_path, copy_main, progress)
+        if not verify_backup(tmp, os.path.basename(db_path)):
+            raise RuntimeError(f"backup of {db_path} failed its integrity check")
+        if os.path.exists(final):
+            shutil.rmtree(final)
+        os.replace(tmp, final)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    for old in list_backups(db_path, dest_dir)[max(1, keep):]:
+        shutil.rmtree(old, ignore_errors=True)
+    return final
+
+
+def backup_in_background(db_path: str, dest_dir: str, **kwargs) -> Future:
+    """Run :func:`backup_database` on a background thread."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fitgator-backup")
+    return _executor.submit(backup_database, db_path, dest_dir, **kwargs)
+
+
+def restore_backup(backup_dir: str, db_path: str) -> None:
+    """Replace ``db_path`` and its archives with the contents of a backup.
+
+    The backup is verified first and nothing is touched if it is damaged.
+    Close every connection to the database before restoring.
+    """
+    name = os.path.basename(db_path)
+    source_main = os.path.join(backup_dir, name)
+    if os.path.isdir(backup_dir) and not os.path.exists(source_main):
+        raise ValueError(f"{backup_dir} does not contain {name}")
+    if not os.path.isdir(backup_dir) or not verify_backup(backup_dir, name):
+        raise ValueError(f"{backup_dir} is not a valid backup")
+
+    wanted = {os.path.abspath(db_path): source_main}
+    for year, path in find_archives(source_main).items():
+        wanted[os.path.abspath(archive_path(db_path, year))] = path
+
+    # Stage every file next to its target, then swap them in
+    staged = []
+    try:
+        for target, source in wanted.items():
+            tmp = target + ".restore"
+            _copy(source, tmp)
+            staged.append((tmp, target))
+    except BaseException:
+        for tmp, _ in staged:
+            os.remove(tmp)
+        raise
+    for year, path in find_archives(db_path).items():
+        if os.path.abspath(path) not in wanted:
+            os.remove(path)
+    for tmp, target in staged:
+        os.replace(tmp, target)
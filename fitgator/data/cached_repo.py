@@ -0,0 +1,307 @@
+"""Read-through LRU page cache in front of any ``Repository``."""
+import sys
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..entities import FoodEntry, Goal, MacroTotals, Template, UserProfile, WorkoutEntry
+from ..events import (
+    DataCleared,
+    FoodAdded,
+    FoodDeleted,
+    FoodsAdded,
+    FoodsReplaced,
+    GoalSaved,
+    ProfileSaved,
+    WorkoutAdded,
+    WorkoutDeleted,
+    WorkoutsAdded,
+    WorkoutsReplaced,
+)
+
+_FOODS = "foods"
+_WORKOUTS = "workouts"
+
+
+def _entry_size(entry) -> int:
+    """Rough in-memory footprint of one cached entity, in bytes."""
+    size = sys.getsizeof(entry) + sys.getsizeof(entry.__dict__)
+    for value in entry.__dict__.values():
+        size += sys.getsizeof(value)
+    return size
+
+
+class CachedRepository:
+    """Cache foods and workouts in fixed-size date pages with LRU eviction.
+
+    A page covers ``page_days`` consecutive days (7-day pages start on a
+    Monday). Bounded range queries are answered from cached pages; missing
+    pages are fetched from the backend in one range query per contiguous
+    run. Pages are dropped when the backend publishes a mutation touching
+    them, so writes made through the backend directly are seen as well.
+    Unbounded queries go straight to the backend.
+    """
+
+    def __init__(self, backend, page_days: int = 7, max_bytes: int = 8 * 1024 * 1024) -> None:
+        if page_days < 1:
+            raise ValueError("page_days must be at least 1")
+        self.backend = backend
+        self.bus = backend.bus
+        self.page_days = page_days
+        self.max_bytes = max_bytes
+
+        self._pages: "OrderedDict[Tuple[str, int], Tuple[list, int]]" = OrderedDict()
+        self._bytes = 0
+        self._profile: Optional[UserProfile] = None
+        self._goal: Optional[Goal] = None
+        self._profile_loaded = False
+        self._goal_loaded = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.bus.subscribe(FoodAdded, lambda e: self._invalidate(_FOODS, e.entry.date))
+        self.bus.subscribe(FoodDeleted, lambda e: self._invalidate(_FOODS, e.entry.date))
+        self.bus.subscribe(FoodsAdded, lambda e: self._invalidate_days(_FOODS, e.entries))
+        self.bus.subscribe(FoodsReplaced, lambda e: self._invalidate_kind(_FOODS))
+        self.bus.subscribe(WorkoutAdded, lambda e: self._invalidate(_WORKOUTS, e.entry.date))
+        self.bus.subscribe(WorkoutDeleted, lambda e: self._invalidate(_WORKOUTS, e.entry.date))
+        self.bus.subscribe(WorkoutsAdded, lambda e: self._invalidate_days(_WORKOUTS, e.entries))
+        self.bus.subscribe(WorkoutsReplaced, lambda e: self._invalidate_kind(_WORKOUTS))
+        self.bus.subscribe(DataCleared, lambda e: self.invalidate_all())
+        # Another writer on the bus may save these; reload them on next use
+        self.bus.subscribe(ProfileSaved, lambda e: self._forget_profile())
+        self.bus.subscribe(GoalSaved, lambda e: self._forget_goal())
+
+    def __getattr__(self, name):
+        # Backend-specific extras (close, archived_years, ...) pass through
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    # --- cache bookkeeping ------------------------------------------------
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pages": len(self._pages),
+            "bytes": self._bytes,
+        }
+
+    def invalidate_all(self) -> None:
+        self._pages.clear()
+        self._bytes = 0
+        self._profile_loaded = self._goal_loaded = False
+
+    def warm(self, start: date, end: date) -> Iterator[None]:
+        """Load any uncached pages of [start, end], newest first.
+
+        One page of foods and one of workouts per step, so this can run as
+        an idle task; already cached pages are skipped.
+        """
+        first = self._page_start(start)
+        for p in range(self._page_start(end), first - 1, -self.page_days):
+            for kind in (_FOODS, _WORKOUTS):
+                if (kind, p) not in self._pages:
+                    self._fetch(kind, p, p)
+            yield
+
+    def _page_start(self, d: date) -> int:
+        o = d.toordinal()
+        # date(1, 1, 1) is a Monday, so weekly pages start on Mondays
+        return o - (o - 1) % self.page_days
+
+    def _invalidate(self, kind: str, d: date) -> None:
+        page = self._pages.pop((kind, self._page_start(d)), None)
+        if page is not None:
+            self._bytes -= page[1]
+
+    def _invalidate_days(self, kind: str, entries) -> None:
+        for d in {e.date for e in entries}:
+            self._invalidate(kind, d)
+
+    def _invalidate_kind(self, kind: str) -> None:
+        for key in [k for k in self._pages if k[0] == kind]:
+            self._bytes -= self._pages.pop(key)[1]
+
+    def _store(self, key: Tuple[str, int], entries: list) -> None:
+        size = sum(_entry_size(e) for e in entries)
+        self._pages[key] = (entries, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._pages) > 1:
+            _, (_, evicted) = self._pages.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def _fetch(self, kind: str, first: int, last: int) -> None:
+        """Load pages ``first``..``last`` (page-start ordinals) in one query."""
+        start = date.fromordinal(first)
+        end = date.fromordinal(last + self.page_days - 1)
+        if kind == _FOODS:
+            rows = self.backend.load_foods_range(start, end)
+        else:
+            rows = self.backend.load_workouts_range(start, end)
+        pages: Dict[int, list] = {p: [] for p in range(first, last + 1, self.page_days)}
+        for row in rows:
+            pages[self._page_start(row.date)].append(row)
+        for p, entries in pages.items():
+            self._store((kind, p), entries)
+
+    def _range(self, kind: str, start: date, end: date) -> list:
+        first, last = self._page_start(start), self._page_start(end)
+        wanted = range(first, last + 1, self.page_days)
+
+        missing_run: List[int] = []
+        for p in wanted:
+            if (kind, p) in self._pages:
+                self.hits += 1
+                if missing_run:
+                    self._fetch(kind, missing_run[0], missing_run[-1])
+                    missing_run = []
+            else:
+                self.misses += 1
+                missing_run.append(p)
+        if missing_run:
+            self._fetch(kind, missing_run[0], missing_run[-1])
+
+        res = []
+        lo, hi = start.toordinal(), end.toordinal()
+        for p in wanted:
+            if (kind, p) not in self._pages:
+                # Evicted again while fetching a range larger than the budget
+                self._fetch(kind, p, p)
+            entries, _ = self._pages[(kind, p)]
+            self._pages.move_to_end((kind, p))
+            if lo <= p and p + self.page_days - 1 <= hi:
+                res.extend(entries)
+            else:
+                res.extend(e for e in entries if lo <= e.date.toordinal() <= hi)
+        return res
+
+    # --- Repository protocol methods --------------------------------------
+
+    def _forget_profile(self) -> None:
+        self._profile, self._profile_loaded = None, False
+
+    def _forget_goal(self) -> None:
+        self._goal, self._goal_loaded = None, False
+
+    def load_profile(self) -> Optional[UserProfile]:
+        if not self._profile_loaded:
+            self._profile = self.backend.load_profile()
+            self._profile_loaded = True
+        return self._profile
+
+    def save_profile(self, profile: UserProfile) -> None:
+        self.backend.save_profile(profile)
+        self._profile, self._profile_loaded = profile, True
+
+    def load_goal(self) -> Optional[Goal]:
+        if not self._goal_loaded:
+            self._goal = self.backend.load_goal()
+            self._goal_loaded = True
+        return self._goal
+
+    def save_goal(self, goal: Goal) -> None:
+        self.backend.save_goal(goal)
+        self._goal, self._goal_loaded = goal, True
+
+    def load_foods(self) -> List[FoodEntry]:
+        return self.backend.load_foods()
+
+    def load_foods_range(self, start: Optional[date], end: Optional[date]) -> List[FoodEntry]:
+        if start is None or end is None:
+            return self.backend.load_foods_range(start, end)
+        if end < start:
+            return []
+        return self._range(_FOODS, start, end)
+
+    def iter_foods(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[FoodEntry]:
+        # One-pass scans would only churn the page cache
+        return self.backend.iter_foods(start, end, batch_size)
+
+    def save_foods(self, foods: List[FoodEntry]) -> None:
+        self.backend.save_foods(foods)
+
+    def add_food(self, entry: FoodEntry) -> None:
+        self.backend.add_food(entry)
+
+    def add_foods(self, entries: List[FoodEntry]) -> None:
+        self.backend.add_foods(entries)
+
+    def delete_food(self, entry: FoodEntry) -> None:
+        self.backend.delete_food(entry)
+
+    def load_workouts(self) -> List[WorkoutEntry]:
+        return self.backend.load_workouts()
+
+    def load_workouts_range(
+        self, start: Optional[date], end: Optional[date]
+    ) -> List[WorkoutEntry]:
+        if start is None or end is None:
+            return self.backend.load_workouts_range(start, end)
+        if end < start:
+            return []
+        return self._range(_WORKOUTS, start, end)
+
+    def iter_workouts(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[WorkoutEntry]:
+        return self.backend.iter_workouts(start, end, batch_size)
+
+    def save_workouts(self, workouts: List[WorkoutEntry]) -> None:
+        self.backend.save_workouts(workouts)
+
+    def add_workout(self, workout: WorkoutEntry) -> None:
+        self.backend.add_workout(workout)
+
+    def add_workouts(self, workouts: List[WorkoutEntry]) -> None:
+        self.backend.add_workouts(workouts)
+
+    def delete_workout(self, workout: WorkoutEntry) -> None:
+        self.backend.delete_workout(workout)
+
+    def count_foods_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        return self.backend.count_foods_by_day(start, end)
+
+    def count_workouts_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        return self.backend.count_workouts_by_day(start, end)
+
+    def daily_macro_totals(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, MacroTotals]:
+        return self.backend.daily_macro_totals(start, end)
+
+    def search(
+        self, query: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[List[FoodEntry], List[WorkoutEntry]]:
+        return self.backend.search(query, start, end)
+
+    def load_templates(self) -> List[Template]:
+        return self.backend.load_templates()
+
+    def save_template(self, template: Template) -> None:
+        self.backend.save_template(template)
+
+    def delete_template(self, name: str) -> None:
+        self.backend.delete_template(name)
+
+    def undo(self) -> Optional[str]:
+        # Pages are invalidated by the per-row events the backend publishes
+        return self.backend.undo()
+
+    def redo(self) -> Optional[str]:
+        return self.backend.redo()
+
+    def clear_all(self) -> None:
+        self.backend.clear_all()
+        self.invalidate_all()
@@ -0,0 +1,52 @@
+"""Templates every new database starts with (the former built-in plans)."""
+from typing import List
+
+from ..entities import Template, TemplateItem
+
+
+def _workout_plan(name: str, recurrence: str, exercises: List[str]) -> Template:
+    return Template(
+        name=name,
+        kind="workout",
+        items=[TemplateItem(name=e, notes=f"Plan: {name}") for e in exercises],
+        recurrence=recurrence,
+    )
+
+
+def default_templates() -> List[Template]:
+    return [
+        _workout_plan(
+            "Beginner Full Body (3 days)",
+            "mon,wed,fri",
+            [
+                "Bodyweight squats – 3 x 10",
+                "Push-ups – 3 x 8",
+                "Glute bridges – 3 x 12",
+                "Plank – 3 x 30 seconds",
+            ],
+        ),
+        _workout_plan(
+            "Push / Pull / Legs (3 days)",
+            "mon,wed,fri",
+            [
+                "Push day: Bench press or push-ups – 3 x 8–10",
+                "Push day: Shoulder press – 3 x 10",
+                "Pull day: Rows – 3 x 10",
+                "Pull day: Lat pulldown or assisted pull-ups – 3 x 8–10",
+                "Leg day: Squats – 3 x 8–10",
+                "Leg day: Lunges – 3 x 10 per leg",
+            ],
+        ),
+        _workout_plan(
+            "Home Bodyweight (4 days)",
+            "mon,tue,thu,fri",
+            [
+                "Jumping jacks – 3 x 30 sec",
+                "Push-ups – 3 x 8–10",
+                "Bodyweight squats – 3 x 12",
+                "Glute bridges – 3 x 15",
+                "Hip thrusts – 3 x 12",
+                "Plank – 3 x 30–45 sec",
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""Undo/redo journal shared by the repositories.
+
+Each add or delete of a food or workout is journaled as one single-row
+operation: which log, whether the row was added or deleted, the row's
+values and a key to find it again. Operations made by one call (say, a
+batch of planned meals) share a *step*; undo applies the inverse of each
+operation in the latest step, newest first, and redo applies them again.
+Only the newest ``JOURNAL_STEPS`` steps are kept.
+
+Bulk rewrites (``save_foods``/``save_workouts``), sync and imports are not
+journaled. A bulk rewrite forgets the journaled steps of its log, and
+``clear_all`` empties the journal. Undo looks rows up by key, so an
+operation whose row has since disappeared is skipped, and a step with
+nothing left to change is passed over.
+"""
+from dataclasses import asdict
+from datetime import date
+from typing import Dict, List, Union
+
+from ..entities import FoodEntry, WorkoutEntry
+
+JOURNAL_STEPS = 100
+
+ADD = "add"
+DELETE = "delete"
+
+Entry = Union[FoodEntry, WorkoutEntry]
+
+
+def encode_entry(entry: Entry) -> Dict:
+    """Row values without the storage id, JSON ready."""
+    values = asdict(entry)
+    del values["id"]
+    values["date"] = entry.date.isoformat()
+    return values
+
+
+def decode_entry(kind: str, values: Dict) -> Entry:
+    values = dict(values, date=date.fromisoformat(values["date"]))
+    return FoodEntry(**values) if kind == "foods" else WorkoutEntry(**values)
+
+
+def describe(kind: str, action: str, entries: List[Entry]) -> str:
+    """Short label for a step, e.g. "delete food 'Pizza'" or "add 12 workouts"."""
+    noun = "food" if kind == "foods" else "workout"
+    if len(entries) == 1:
+        e = entries[0]
+        name = e.name if kind == "foods" else e.routine_name
+        return f"{action} {noun} '{name}'"
+    return f"{action} {len(entries)} {noun}s"
@@ -0,0 +1,226 @@
+"""Column-block layout of the food and workout logs in the JSON file.
+
+Format 2 stores each log as a list of blocks. A block holds up to
+``BLOCK_ROWS`` rows as parallel column arrays, one per entity field, with
+dates as day ordinals::
+
+    "foods": [{"date": [738886, 738886], "name": ["Oats", "Tea"], ..., "id": [1, 2]}]
+
+Rows are kept in (date, id) order, the order the repositories promise to
+read them in, so a streamed log comes out sorted without a sort.
+
+Entities are built straight from the columns with positional arguments and
+encoded by reading one attribute per column, so neither direction goes
+through a per-row dict or ``dataclasses.asdict``. Blocks keep streaming
+cheap: :func:`json_stream.iter_array` hands over one block at a time.
+
+Format 1 files kept one dict per row. :func:`read_blocks` converts those
+rows on the fly, so streaming reads work on either layout, and
+:func:`upgrade` rewrites a loaded file in place before it is saved again.
+"""
+from bisect import bisect_left
+from dataclasses import MISSING, fields
+from datetime import date
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..entities import FoodEntry, WorkoutEntry
+
+FORMAT = 2
+BLOCK_ROWS = 1024
+
+_TYPES = {"foods": FoodEntry, "workouts": WorkoutEntry}
+# Column names in constructor order, so a block decodes positionally
+FIELDS = {kind: tuple(f.name for f in fields(cls)) for kind, cls in _TYPES.items()}
+_DEFAULTS = {
+    kind: {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+    for kind, cls in _TYPES.items()
+}
+
+
+def bounds(start: Optional[date], end: Optional[date]) -> Optional[Tuple[int, int]]:
+    """Ordinal range for a date filter; None when it selects everything."""
+    if start is None and end is None:
+        return None
+    return (start.toordinal() if start else 0, end.toordinal() if end else date.max.toordinal())
+
+
+def encode_block(kind: str, entries: list) -> Dict[str, list]:
+    block = {name: list(map(attrgetter(name), entries)) for name in FIELDS[kind]}
+    block["date"] = [d.toordinal() for d in block["date"]]
+    return block
+
+
+def encode(kind: str, entries: list) -> List[dict]:
+    return [encode_block(kind, entries[i:i + BLOCK_ROWS]) for i in range(0, len(entries), BLOCK_ROWS)]
+
+
+def decode_block(kind: str, block: dict, within: Optional[Tuple[int, int]] = None) -> list:
+    """Entities of one block, optionally only those dated within ``within``."""
+    names = FIELDS[kind]
+    cols = [block[name] for name in names]
+    if within is not None:
+        lo, hi = within
+        keep = [i for i, d in enumerate(block["date"]) if lo <= d <= hi]
+        if len(keep) < len(block["date"]):
+            cols = [[c[i] for i in keep] for c in cols]
+    at = names.index("date")
+    cols[at] = map(date.fromordinal, cols[at])
+    return list(map(_TYPES[kind], *cols))
+
+
+def decode(kind: str, blocks: Iterable[dict], within: Optional[Tuple[int, int]] = None) -> list:
+    res: list = []
+    for block in blocks:
+        res.extend(decode_block(kind, block, within))
+    return res
+
+
+def _rows_to_block(kind: str, rows: List[dict]) -> Dict[str, list]:
+    defaults = _DEFAULTS[kind]
+    block = {name: [r.get(name, defaults.get(name)) for r in rows] for name in FIELDS[kind]}
+    block["date"] = [date.fromisoformat(d).toordinal() for d in block["date"]]
+    return block
+
+
+def read_blocks(kind: str, items: Iterable[dict]) -> Iterator[dict]:
+    """Blocks of a log section, grouping format 1 row dicts into blocks."""
+    rows: List[dict] = []
+    for item in items:
+        if isinstance(item.get("date"), list):
+            yield item
+            continue
+        rows.append(item)
+        if len(rows) == BLOCK_ROWS:
+            yield _rows_to_block(kind, rows)
+            rows = []
+    if rows:
+        yield _rows_to_block(kind, rows)
+
+
+def upgrade(data: dict) -> bool:
+    """Bring a loaded file to the current format in place; True if it changed."""
+    version = data.get("format", 1)
+    if version > FORMAT:
+        raise ValueError(f"data file format {version} is newer than this version of FitGator")
+    if version == FORMAT:
+        return False
+    for kind in _TYPES:
+        blocks = list(read_blocks(kind, data.get(kind, [])))
+        # Format 1 rows could lack an id; number them after the highest one
+        next_free = next_id(blocks)
+        for block in blocks:
+            ids = block["id"]
+            for i, row_id in enumerate(ids):
+                if row_id is None:
+                    ids[i] = next_free
+                    next_free += 1
+        data[kind] = _sorted(kind, blocks)
+    # Keep the marker first, where a streaming reader finds it at once
+    rest = [(k, v) for k, v in data.items() if k != "format"]
+    data.clear()
+    data["format"] = FORMAT
+    data.update(rest)
+    return True
+
+
+def row_ids(blocks: Iterable[dict]) -> Iterator[int]:
+    for block in blocks:
+        yield from block["id"]
+
+
+def next_id(blocks: Iterable[dict]) -> int:
+    return max((i or 0 for i in row_ids(blocks)), default=0) + 1
+
+
+def _key(entry) -> Tuple[int, int]:
+    return entry.date.toordinal(), entry.id
+
+
+def encode_sorted(kind: str, entries: list) -> List[dict]:
+    """Blocks for ``entries`` (ids already set) in (date, id) order."""
+    return encode(kind, sorted(entries, key=_key))
+
+
+def _sorted(kind: str, blocks: List[dict]) -> List[dict]:
+    names = FIELDS[kind]
+    cols = {name: [v for b in blocks for v in b[name]] for name in names}
+    order = sorted(range(len(cols["id"])), key=lambda i: (cols["date"][i], cols["id"][i]))
+    if order == list(range(len(order))):
+        return blocks
+    cols = {name: [col[i] for i in order] for name, col in cols.items()}
+    return [
+        {name: col[i:i + BLOCK_ROWS] for name, col in cols.items()}
+        for i in range(0, len(order), BLOCK_ROWS)
+    ]
+
+
+def append(kind: str, blocks: List[dict], entries: list) -> None:
+    """Add entries (ids already set), keeping the log in (date, id) order.
+
+    Entries that sort after everything stored (the usual case: new rows
+    for today) top up the last block. Back-dated ones are inserted where
+    they belong; a block that grows to twice ``BLOCK_ROWS`` is split.
+    """
+    entries = sorted(entries, key=_key)
+    if not entries:
+        return
+    if blocks:
+        last = blocks[-1]
+        if _key(entries[0]) <= (last["date"][-1], last["id"][-1]):
+            for entry in entries:
+                _insert(kind, blocks, entry)
+            return
+    done = 0
+    if blocks and len(blocks[-1]["id"]) < BLOCK_ROWS:
+        done = BLOCK_ROWS - len(blocks[-1]["id"])
+        last, part = blocks[-1], encode_block(kind, entries[:done])
+        for name, col in part.items():
+            last[name].extend(col)
+    blocks.extend(encode(kind, entries[done:]))
+
+
+def _insert(kind: str, blocks: List[dict], entry) -> None:
+    key = _key(entry)
+    b = 0
+    while b < len(blocks) - 1 and (blocks[b]["date"][-1], blocks[b]["id"][-1]) < key:
+        b += 1
+    block = blocks[b]
+    i = bisect_left(list(zip(block["date"], block["id"])), key)
+    for name, value in encode_block(kind, [entry]).items():
+        block[name].insert(i, value[0])
+    if len(block["id"]) >= 2 * BLOCK_ROWS:
+        blocks[b:b + 1] = [
+            {name: col[:BLOCK_ROWS] for name, col in block.items()},
+            {name: col[BLOCK_ROWS:] for name, col in block.items()},
+        ]
+
+
+def to_row(kind: str, entry) -> dict:
+    """One entity as a JSON-ready row dict (ISO date), as the journal stores it."""
+    row = {name: getattr(entry, name) for name in FIELDS[kind]}
+    row["date"] = entry.date.isoformat()
+    return row
+
+
+def pop_row(kind: str, blocks: List[dict], entry, match: Tuple[str, ...]) -> Optional[dict]:
+    """Remove ``entry``'s row and return it as a row dict, or None if absent.
+
+    Rows are found by id, or by date plus the ``match`` fields when the
+    entry has no id.
+    """
+    names = FIELDS[kind]
+    if entry.id is not None:
+        keys, wanted = ("id",), (entry.id,)
+    else:
+        keys = ("date",) + match
+        wanted = (entry.date.toordinal(),) + tuple(getattr(entry, k) for k in match)
+    for b, block in enumerate(blocks):
+        for i, found in enumerate(zip(*(block[k] for k in keys))):
+            if found == wanted:
+                row = {name: block[name].pop(i) for name in names}
+                row["date"] = date.fromordinal(row["date"]).isoformat()
+                if not block["id"]:
+                    del blocks[b]
+                return row
+    return None
@@ -1,10 +1,61 @@
 
 import json
+import os
+import tempfile
+from contextlib import contextmanager
 from dataclasses import asdict
 from datetime import date
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
-from ..entities import UserProfile, FoodEntry, WorkoutEntry, Goal
+from ..entities import (
+    FoodEntry,
+    Goal,
+    MacroTotals,
+    Template,
+    TemplateItem,
+    UserProfile,
+    WorkoutEntry,
+)
+from .defaults import default_templates
+from .journal import ADD, DELETE, JOURNAL_STEPS, decode_entry, describe
+from .json_columns import (
+    FORMAT,
+    append,
+    bounds,
+    decode,
+    decode_block,
+    encode_sorted,
+    next_id,
+    pop_row,
+    read_blocks,
+    row_ids,
+    to_row,
+    upgrade,
+)
+from .json_stream import iter_array, read_value
+try:
+    import fcntl
+except ImportError:  # Windows: atomic replace still applies, locking does not
+    fcntl = None
+from ..events import (
+    DataCleared,
+    EventBus,
+    FoodAdded,
+    FoodDeleted,
+    FoodsAdded,
+    FoodsReplaced,
+    GoalSaved,
+    ProfileSaved,
+    TemplatesChanged,
+    WorkoutAdded,
+    WorkoutDeleted,
+    WorkoutsAdded,
+    WorkoutsReplaced,
+)
+
+class ConcurrentModificationError(RuntimeError):
+    """The file was changed by another process since it was last read."""
 
 def _date_default(obj):
     if isinstance(obj, date):
@@ -14,64 +65,448 @@ def _date_default(obj):
 def _date_parse(s: str) -> date:
     return date.fromisoformat(s)
 
+def _assign_ids(entries: list) -> None:
+    """Give entries without an id the next free one."""
+    next_free = max((e.id or 0 for e in entries), default=0) + 1
+    for entry in entries:
+        if entry.id is None:
+            entry.id = next_free
+            next_free += 1
+
+def _journal(data: dict, steps: int, kind: str, action: str, rows: list) -> None:
+    """Record stored ``rows`` as one undo step; see journal.py."""
+    if steps <= 0 or not rows:
+        return
+    # A new step drops whatever could still be redone
+    ops = [op for op in data.get("journal", []) if not op["undone"]]
+    step = max((op["step"] for op in ops), default=0) + 1
+    ops = [op for op in ops if op["step"] > step - steps]
+    for row in rows:
+        entry = {k: v for k, v in row.items() if k != "id"}
+        ops.append({"step": step, "kind": kind, "action": action, "id": row["id"],
+                    "entry": entry, "undone": False})
+    data["journal"] = ops
+
+def _empty_data() -> dict:
+    return {
+        "format": FORMAT,
+        "profile": None,
+        "goal": None,
+        "foods": [],
+        "workouts": [],
+        "templates": [asdict(t) for t in default_templates()],
+        "journal": [],
+    }
+
+def _template_rows(data: dict) -> list:
+    # Files written before templates existed start with the defaults
+    if "templates" not in data:
+        return [asdict(t) for t in default_templates()]
+    return data["templates"]
+
+def _append_rows(data: dict, kind: str, entries: list) -> List[dict]:
+    """Store ``entries`` under fresh ids; returns their rows for the journal."""
+    next_free = next_id(data[kind])
+    for e in entries:
+        e.id = next_free
+        next_free += 1
+    append(kind, data[kind], entries)
+    return [to_row(kind, e) for e in entries]
+
 class JsonRepository:
-    def __init__(self, path: str = "fitgator_data.json"):
+    """Single-file JSON repository, safe to share between processes.
+
+    Writers serialise on an advisory lock over a ``.lock`` file next to the
+    data file and commit by writing a temp file and ``os.replace``-ing it,
+    so the data file is always either the old or the new version. Readers
+    take no lock. The file carries a ``revision`` counter: a full
+    ``save_foods``/``save_workouts`` raises
+    :class:`ConcurrentModificationError` if another process wrote since the
+    list was loaded, instead of silently overwriting its changes.
+
+    The logs are stored as column blocks (see :mod:`.json_columns`); a file
+    in the older row-per-dict layout is read as is and upgraded the first
+    time it is written.
+    """
+
+    def __init__(
+        self,
+        path: str = "fitgator_data.json",
+        bus: Optional[EventBus] = None,
+        journal_steps: int = JOURNAL_STEPS,
+    ):
         self.path = Path(path)
+        self.bus = bus or EventBus()
+        # Undo steps kept in the file; 0 turns the journal off
+        self._journal_steps = journal_steps
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        # Revision of the file when foods/workouts were last loaded or written
+        self._seen: Dict[str, int] = {}
         if not self.path.exists():
-            self._write({"profile": None, "goal": None, "foods": [], "workouts": []})
+            with self._locked():
+                if not self.path.exists():
+                    self._write(_empty_data())
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the exclusive writer lock for a read-modify-write cycle."""
+        with open(self._lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
 
     def _read(self):
-        return json.loads(self.path.read_text())
+        with self.path.open() as fp:
+            data = json.load(fp)
+        upgrade(data)
+        return data
+
+    def _read_value(self, key: str, default=None):
+        """One top-level value, streamed past the (possibly large) logs."""
+        with self.path.open() as fp:
+            return read_value(fp, key, default)
+
+    def _write(self, obj) -> int:
+        """Atomically replace the file with ``obj``; returns its new revision."""
+        obj["revision"] = obj.get("revision", 0) + 1
+        fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp",
+                                   dir=str(self.path.parent))
+        try:
+            if self.path.exists():
+                os.chmod(tmp, self.path.stat().st_mode & 0o777)
+            # dumps() without indent runs the C encoder; dump() never does
+            text = json.dumps(obj, default=_date_default, separators=(",", ":"))
+            with os.fdopen(fd, "w") as fp:
+                fp.write(text)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return obj["revision"]
 
-    def _write(self, obj):
-        self.path.write_text(json.dumps(obj, default=_date_default, indent=2))
+    @contextmanager
+    def _update(self) -> Iterator[dict]:
+        """Read the current file under the lock and write it back on exit."""
+        with self._locked():
+            data = self._read()
+            before = data.get("revision", 0)
+            yield data
+            self._advance(before, self._write(data))
+
+    def _advance(self, before: int, rev: int) -> None:
+        """Note our own write of revision ``rev`` over ``before``.
+
+        A list loaded when the file was at ``before`` stays current: writes
+        made by this repository, to any section, do not make it stale.
+        """
+        for kind, seen in self._seen.items():
+            if seen == before:
+                self._seen[kind] = rev
+
+    def _replace(self, kind: str, entries: list) -> None:
+        with self._locked():
+            data = self._read()
+            current = data.get("revision", 0)
+            seen = self._seen.get(kind)
+            if seen is not None and seen != current:
+                raise ConcurrentModificationError(
+                    f"{self.path} was modified by another process; reload {kind} and retry"
+                )
+            _assign_ids(entries)
+            data[kind] = encode_sorted(kind, entries)
+            # The journal may point at replaced rows; see SQLiteRepository
+            data["journal"] = [op for op in data.get("journal", []) if op["kind"] != kind]
+            rev = self._write(data)
+            self._advance(current, rev)
+            self._seen[kind] = rev
+
+    def _load(self, kind: str, start: Optional[date] = None, end: Optional[date] = None) -> list:
+        raw = self._read()
+        self._seen[kind] = raw.get("revision", 0)
+        return decode(kind, raw[kind], bounds(start, end))
+
+    def _iter(self, kind: str, start: Optional[date], end: Optional[date]) -> Iterator:
+        if self._read_value("format", 1) < FORMAT:
+            # Rows of an older file are in the order they were added
+            rows = self.iter_stored(kind, start, end)
+            yield from sorted(rows, key=lambda e: (e.date, e.id or 0))
+            return
+        yield from self.iter_stored(kind, start, end)
+
+    def iter_stored(
+        self, kind: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Iterator:
+        """Stream ``kind`` ("foods" or "workouts") in file order.
+
+        Unlike :meth:`iter_foods` this never sorts, so memory stays bounded
+        even for a file in the older layout, whose rows are in the order
+        they were added. Meant for bulk copies that do not need date order.
+        """
+        within = bounds(start, end)
+        with self.path.open() as fp:
+            for block in read_blocks(kind, iter_array(fp, kind)):
+                yield from decode_block(kind, block, within)
+
+    def _count_by_day(self, kind: str, start: Optional[date], end: Optional[date]) -> Dict[date, int]:
+        lo, hi = bounds(start, end) or (0, date.max.toordinal())
+        counts: Counter = Counter()
+        with self.path.open() as fp:
+            for block in read_blocks(kind, iter_array(fp, kind)):
+                counts.update(d for d in block["date"] if lo <= d <= hi)
+        return {date.fromordinal(d): n for d, n in sorted(counts.items())}
 
     def load_profile(self) -> Optional[UserProfile]:
-        raw = self._read()["profile"]
+        raw = self._read_value("profile")
         if not raw:
             return None
         return UserProfile(**raw)
 
     def save_profile(self, profile: UserProfile) -> None:
-        data = self._read()
-        data["profile"] = asdict(profile)
-        self._write(data)
+        with self._update() as data:
+            data["profile"] = asdict(profile)
+        self.bus.publish(ProfileSaved(profile))
 
     def load_goal(self) -> Optional[Goal]:
-        raw = self._read()["goal"]
+        raw = self._read_value("goal")
         if not raw:
             return None
         raw["start_date"] = _date_parse(raw["start_date"])
         return Goal(**raw)
 
     def save_goal(self, goal: Goal) -> None:
-        data = self._read()
-        g = asdict(goal)
-        data["goal"] = g
-        self._write(data)
+        with self._update() as data:
+            data["goal"] = asdict(goal)
+        self.bus.publish(GoalSaved(goal))
 
     def load_foods(self) -> List[FoodEntry]:
-        data = self._read()["foods"]
-        res: List[FoodEntry] = []
-        for f in data:
-            f["date"] = _date_parse(f["date"])
-            res.append(FoodEntry(**f))
-        return res
+        return self._load("foods")
+
+    def load_foods_range(self, start: Optional[date], end: Optional[date]) -> List[FoodEntry]:
+        return self._load("foods", start, end)
+
+    def iter_foods(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[FoodEntry]:
+        """Stream foods from the file without decoding it all at once.
+
+        ``batch_size`` is accepted for API parity; the file is read in
+        fixed-size chunks and decoded one column block at a time regardless.
+        """
+        return self._iter("foods", start, end)
 
     def save_foods(self, foods: List[FoodEntry]) -> None:
-        data = self._read()
-        data["foods"] = [asdict(f) for f in foods]
-        self._write(data)
+        """Replace the food log.
+
+        Raises :class:`ConcurrentModificationError` if another process
+        wrote the file after the foods were last loaded.
+        """
+        self._replace("foods", foods)
+        self.bus.publish(FoodsReplaced(list(foods)))
+
+    def add_food(self, entry: FoodEntry) -> None:
+        with self._update() as data:
+            rows = _append_rows(data, "foods", [entry])
+            _journal(data, self._journal_steps, "foods", ADD, rows)
+        self.bus.publish(FoodAdded(entry))
+
+    def add_foods(self, entries: List[FoodEntry]) -> None:
+        """Append many entries in one locked write."""
+        with self._update() as data:
+            rows = _append_rows(data, "foods", entries)
+            _journal(data, self._journal_steps, "foods", ADD, rows)
+        if entries:
+            self.bus.publish(FoodsAdded(list(entries)))
+
+    def delete_food(self, entry: FoodEntry) -> None:
+        with self._update() as data:
+            removed = pop_row("foods", data["foods"], entry, ("name", "calories"))
+            if removed is not None:
+                _journal(data, self._journal_steps, "foods", DELETE, [removed])
+        # A stale or repeated delete changes nothing, so listeners hear nothing
+        if removed is not None:
+            self.bus.publish(FoodDeleted(entry))
 
     def load_workouts(self) -> List[WorkoutEntry]:
-        data = self._read()["workouts"]
-        res: List[WorkoutEntry] = []
-        for w in data:
-            w["date"] = _date_parse(w["date"])
-            res.append(WorkoutEntry(**w))
-        return res
+        return self._load("workouts")
+
+    def load_workouts_range(self, start: Optional[date], end: Optional[date]) -> List[WorkoutEntry]:
+        return self._load("workouts", start, end)
+
+    def iter_workouts(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[WorkoutEntry]:
+        """Stream workouts; see :meth:`iter_foods`."""
+        return self._iter("workouts", start, end)
 
     def save_workouts(self, workouts: List[WorkoutEntry]) -> None:
-        data = self._read()
-        data["workouts"] = [asdict(w) for w in workouts]
-        self._write(data)
+        """Replace the workout log; checked like :meth:`save_foods`."""
+        self._replace("workouts", workouts)
+        self.bus.publish(WorkoutsReplaced(list(workouts)))
+
+    def add_workout(self, workout: WorkoutEntry) -> None:
+        with self._update() as data:
+            rows = _append_rows(data, "workouts", [workout])
+            _journal(data, self._journal_steps, "workouts", ADD, rows)
+        self.bus.publish(WorkoutAdded(workout))
+
+    def add_workouts(self, workouts: List[WorkoutEntry]) -> None:
+        with self._update() as data:
+            rows = _append_rows(data, "workouts", workouts)
+            _journal(data, self._journal_steps, "workouts", ADD, rows)
+        if workouts:
+            self.bus.publish(WorkoutsAdded(list(workouts)))
+
+    def delete_workout(self, workout: WorkoutEntry) -> None:
+        with self._update() as data:
+            removed = pop_row(
+                "workouts", data["workouts"], workout, ("routine_name", "completed", "notes")
+            )
+            if removed is not None:
+                _journal(data, self._journal_steps, "workouts", DELETE, [removed])
+        if removed is not None:
+            self.bus.publish(WorkoutDeleted(workout))
+
+    def count_foods_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        return self._count_by_day("foods", start, end)
+
+    def count_workouts_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        return self._count_by_day("workouts", start, end)
+
+    def daily_macro_totals(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, MacroTotals]:
+        # Summed straight from the columns, without building entries
+        lo, hi = bounds(start, end) or (0, date.max.toordinal())
+        totals: Dict[int, MacroTotals] = {}
+        with self.path.open() as fp:
+            for b in read_blocks("foods", iter_array(fp, "foods")):
+                for d, kcal, p, c, f, fiber in zip(
+                    b["date"], b["calories"], b["protein_g"], b["carbs_g"], b["fat_g"], b["fiber_g"]
+                ):
+                    if lo <= d <= hi:
+                        t = totals.get(d)
+                        if t is None:
+                            t = totals[d] = MacroTotals()
+                        t.calories += kcal
+                        t.protein_g += p
+                        t.carbs_g += c
+                        t.fat_g += f
+                        t.fiber_g += fiber
+        return {date.fromordinal(d): t for d, t in sorted(totals.items())}
+
+    def search(
+        self, query: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[List[FoodEntry], List[WorkoutEntry]]:
+        terms = query.lower().split()
+        if not terms:
+            return [], []
+        foods = [
+            f for f in self.load_foods_range(start, end)
+            if all(t in f.name.lower() for t in terms)
+        ]
+        workouts = [
+            w for w in self.load_workouts_range(start, end)
+            if all(t in f"{w.routine_name} {w.notes}".lower() for t in terms)
+        ]
+        return foods, workouts
+
+    def load_templates(self) -> List[Template]:
+        res = []
+        rows = self._read_value("templates")
+        if rows is None:
+            rows = [asdict(t) for t in default_templates()]
+        for raw in rows:
+            raw["items"] = [TemplateItem(**it) for it in raw["items"]]
+            res.append(Template(**raw))
+        return sorted(res, key=lambda t: t.name)
+
+    def save_template(self, template: Template) -> None:
+        with self._update() as data:
+            rows = [t for t in _template_rows(data) if t["name"] != template.name]
+            rows.append(asdict(template))
+            data["templates"] = rows
+        self.bus.publish(TemplatesChanged())
+
+    def delete_template(self, name: str) -> None:
+        with self._update() as data:
+            data["templates"] = [t for t in _template_rows(data) if t["name"] != name]
+        self.bus.publish(TemplatesChanged())
+
+    def undo(self) -> Optional[str]:
+        """Reverse the latest journaled step in one locked write.
+
+        Returns a label such as "delete food 'Pizza'", or None if there is
+        nothing to undo.
+        """
+        return self._replay(undo=True)
+
+    def redo(self) -> Optional[str]:
+        """Apply the most recently undone step again; see :meth:`undo`."""
+        return self._replay(undo=False)
+
+    def _replay(self, undo: bool) -> Optional[str]:
+        if not any(op["undone"] != undo for op in self._read_value("journal") or []):
+            return None
+        events = []
+        changed: list = []
+        todo: list = []
+        with self._update() as data:
+            ops = data.get("journal", [])
+            taken = {kind: set(row_ids(data[kind])) for kind in ("foods", "workouts")}
+            # A step whose rows have all disappeared since is passed over
+            while not changed:
+                steps = [op["step"] for op in ops if op["undone"] != undo]
+                if not steps:
+                    break
+                step = max(steps) if undo else min(steps)
+                todo = [op for op in ops if op["step"] == step]
+                if undo:
+                    todo.reverse()
+                for op in todo:
+                    kind, blocks = op["kind"], data[op["kind"]]
+                    entry = decode_entry(kind, op["entry"])
+                    # Undoing a delete or redoing an add puts the row back
+                    if (op["action"] == ADD) != undo:
+                        # Keep the old id unless something else took it meanwhile
+                        entry.id = op["id"]
+                        if entry.id in taken[kind]:
+                            entry.id = next_id(blocks)
+                            for other in ops:
+                                if other["kind"] == kind and other["id"] == op["id"]:
+                                    other["id"] = entry.id
+                        taken[kind].add(entry.id)
+                        append(kind, blocks, [entry])
+                        changed.append(entry)
+                        events.append(FoodAdded(entry) if kind == "foods" else WorkoutAdded(entry))
+                    else:
+                        entry.id = op["id"]
+                        taken[kind].discard(entry.id)
+                        if pop_row(kind, blocks, entry, ()) is not None:
+                            changed.append(entry)
+                            events.append(
+                                FoodDeleted(entry) if kind == "foods" else WorkoutDeleted(entry)
+                            )
+                    op["undone"] = undo
+        for event in events:
+            self.bus.publish(event)
+        return describe(todo[0]["kind"], todo[0]["action"], changed) if changed else None
+
+    def clear_all(self) -> None:
+        """Remove all data and reset to a fresh state."""
+        with self._update() as data:
+            data.update(_empty_data())
+        self._seen.clear()
+        self.bus.publish(DataCleared())
@@ -0,0 +1,164 @@
+"""Incremental reader for arrays inside the top-level JSON object.
+
+``iter_array(fp, key)`` yields the elements of ``data[key]`` one at a time
+while reading the file in fixed-size chunks, so memory use is bounded by
+the chunk size and the largest single element rather than the file size.
+Other top-level values are skipped the same way. ``read_value(fp, key)``
+decodes a single small value (such as the profile) the same way.
+"""
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+_WS = " \t\n\r"
+_DELIMS = _WS + ",:]}"
+_decoder = json.JSONDecoder()
+_NON_WS = re.compile(r"[^ \t\n\r]")
+# Text up to the next bracket of one kind: other characters and whole strings
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_SKIP_PLAIN = {
+    "[": re.compile(r'(?:[^"\[\]]+|' + _STRING + ")*"),
+    "{": re.compile(r'(?:[^"{}]+|' + _STRING + ")*"),
+}
+
+
+class _Reader:
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, at_least: int = 0) -> bool:
+        """Append the next chunk (or ``at_least`` characters); False at end of file."""
+        if self.eof:
+            return False
+        chunk = self._fp.read(max(self._chunk_size, at_least))
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer never grows with the file
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            m = _NON_WS.search(self.buf, self.pos)
+            if m is not None:
+                self.pos = m.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if not self.fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"expected '{ch}' at offset {self.pos} of buffered JSON")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Double what is buffered, so a value spanning many chunks
+                # (such as a column block) is re-parsed only a few times
+                if not self.fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A number cut off by the buffer edge ("12" of "12.5e3") still
+            # decodes; only accept it once a delimiter follows.
+            if end == len(self.buf) or self.buf[end] not in _DELIMS:
+                if self.fill():
+                    continue
+            self.pos = end
+            return obj
+
+
+    def skip(self) -> None:
+        """Move past one value without decoding it.
+
+        An array (or object) is skipped by counting only its own kind of
+        bracket outside strings; one regex match covers everything in
+        between, so a skipped log costs a scan rather than a parse.
+        """
+        open_ = self.peek()
+        if open_ not in _SKIP_PLAIN:
+            self.value()
+            return
+        plain = _SKIP_PLAIN[open_]
+        depth = 0
+        while True:
+            self.pos = plain.match(self.buf, self.pos).end()
+            if self.pos == len(self.buf) or self.buf[self.pos] == '"':
+                # End of buffer, or a string cut off by it
+                if not self.fill():
+                    raise ValueError("unexpected end of JSON")
+                continue
+            depth += 1 if self.buf[self.pos] == open_ else -1
+            self.pos += 1
+            if depth == 0:
+                return
+
+
+def _iter_elements(r: _Reader) -> Iterator[Any]:
+    r.expect("[")
+    if r.peek() == "]":
+        r.pos += 1
+        return
+    while True:
+        yield r.value()
+        ch = r.peek()
+        r.pos += 1
+        if ch == "]":
+            return
+        if ch != ",":
+            raise ValueError("malformed JSON array")
+
+
+def _seek(r: _Reader, key: str) -> bool:
+    """Move ``r`` to the value stored under top-level ``key``.
+
+    Values under other keys are skipped without being decoded. Returns
+    False if the key is not there.
+    """
+    r.expect("{")
+    if r.peek() == "}":
+        return False
+    while True:
+        name = r.value()
+        r.expect(":")
+        if name == key:
+            return True
+        r.skip()
+        ch = r.peek()
+        r.pos += 1
+        if ch == "}":
+            return False
+        if ch != ",":
+            raise ValueError("malformed JSON object")
+
+
+def iter_array(fp: TextIO, key: str, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of the array stored under top-level ``key``.
+
+    Yields nothing if the key is missing or its value is not an array.
+    """
+    r = _Reader(fp, chunk_size)
+    if _seek(r, key) and r.peek() == "[":
+        yield from _iter_elements(r)
+
+
+def read_value(fp: TextIO, key: str, default: Any = None, chunk_size: int = 64 * 1024) -> Any:
+    """Decode just the top-level value stored under ``key``.
+
+    Returns ``default`` if the key is missing. Large arrays before it are
+    streamed past, so memory use stays bounded as with :func:`iter_array`.
+    """
+    r = _Reader(fp, chunk_size)
+    return r.value() if _seek(r, key) else default
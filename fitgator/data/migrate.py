@@ -0,0 +1,87 @@
+"""Move a JSON data file into a SQLite database in bounded memory.
+
+The JSON logs are streamed with :mod:`.json_stream`, never loaded whole,
+and written with :meth:`SQLiteRepository.import_rows` inside
+:meth:`SQLiteRepository.bulk_load`: large ``executemany`` transactions,
+with indexes and search tables built once at the end. Closed years are
+then moved into their archive files as usual.
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+
+from .json_repo import JsonRepository
+from .sqlite_repo import SQLiteRepository
+
+BATCH_ROWS = 50_000
+
+
+@dataclass
+class MigrationStats:
+    foods: int = 0
+    workouts: int = 0
+    templates: int = 0
+    archived_years: List[int] = field(default_factory=list)
+    bytes_read: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.foods + self.workouts
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_read / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def migrate_json_to_sqlite(
+    json_path: str,
+    db_path: str,
+    batch_size: int = BATCH_ROWS,
+    today: Optional[date] = None,
+) -> MigrationStats:
+    """Copy profile, goal, templates, foods and workouts into ``db_path``.
+
+    Entry ids are kept. The target may be new or empty but must not hold
+    any logged entries yet (ValueError). ``today`` decides which years
+    count as closed for archiving.
+    """
+    if not os.path.isfile(json_path):
+        raise FileNotFoundError(json_path)
+    source = JsonRepository(json_path)
+    target = SQLiteRepository(db_path, verbose=False, auto_archive=False)
+    try:
+        if target.count_foods_by_day(None, None) or target.count_workouts_by_day(None, None):
+            raise ValueError(f"{db_path} already has logged entries; migrate into a new database")
+
+        started = time.perf_counter()
+        stats = MigrationStats(bytes_read=os.path.getsize(json_path))
+        profile = source.load_profile()
+        if profile is not None:
+            target.save_profile(profile)
+        goal = source.load_goal()
+        if goal is not None:
+            target.save_goal(goal)
+        templates = source.load_templates()
+        for t in target.load_templates():
+            target.delete_template(t.name)
+        for t in templates:
+            target.save_template(t)
+        stats.templates = len(templates)
+
+        with target.bulk_load():
+            stats.foods = target.import_rows("foods", source.iter_stored("foods"), batch_size)
+            stats.workouts = target.import_rows(
+                "workouts", source.iter_stored("workouts"), batch_size
+            )
+        stats.archived_years = target.archive_closed_years(today)
+        stats.seconds = time.perf_counter() - started
+        return stats
+    finally:
+        target.close()
@@ -1,13 +1,56 @@
 
-from typing import Protocol, List
-from ..entities import UserProfile, FoodEntry, WorkoutEntry, Goal
+from datetime import date
+from typing import Protocol, Dict, Iterator, List, Optional, Tuple
+from ..entities import UserProfile, FoodEntry, MacroTotals, Template, WorkoutEntry, Goal
+from ..events import EventBus
 
 class Repository(Protocol):
+    """Storage for the profile, goal, logs and templates.
+
+    ``load_foods``/``load_workouts``, their ``_range`` variants and the
+    ``iter_*`` streams return entries oldest first, in (date, id) order;
+    callers such as ``daily_calorie_totals`` and ``PagedHistory`` rely on it.
+    """
+
+    bus: EventBus
+
     def load_profile(self) -> UserProfile | None: ...
     def save_profile(self, profile: UserProfile) -> None: ...
     def load_goal(self) -> Goal | None: ...
     def save_goal(self, goal: Goal) -> None: ...
     def load_foods(self) -> List[FoodEntry]: ...
+    def load_foods_range(self, start: Optional[date], end: Optional[date]) -> List[FoodEntry]: ...
+    def iter_foods(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[FoodEntry]: ...
     def save_foods(self, foods: List[FoodEntry]) -> None: ...
+    def add_food(self, entry: FoodEntry) -> None: ...
+    def add_foods(self, entries: List[FoodEntry]) -> None: ...
+    def delete_food(self, entry: FoodEntry) -> None: ...
     def load_workouts(self) -> List[WorkoutEntry]: ...
+    def load_workouts_range(self, start: Optional[date], end: Optional[date]) -> List[WorkoutEntry]: ...
+    def iter_workouts(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[WorkoutEntry]: ...
     def save_workouts(self, workouts: List[WorkoutEntry]) -> None: ...
+    def add_workout(self, workout: WorkoutEntry) -> None: ...
+    def add_workouts(self, workouts: List[WorkoutEntry]) -> None: ...
+    def delete_workout(self, workout: WorkoutEntry) -> None: ...
+    def count_foods_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]: ...
+    def count_workouts_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]: ...
+    def daily_macro_totals(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, MacroTotals]: ...
+    def search(
+        self, query: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[List[FoodEntry], List[WorkoutEntry]]: ...
+    def load_templates(self) -> List[Template]: ...
+    def save_template(self, template: Template) -> None: ...
+    def delete_template(self, name: str) -> None: ...
+    def undo(self) -> Optional[str]: ...
+    def redo(self) -> Optional[str]: ...
+    def clear_all(self) -> None: ...
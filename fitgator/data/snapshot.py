@@ -0,0 +1,345 @@
+"""Compressed columnar snapshots of the food and workout history.
+
+A snapshot stores one block per (kind, month). Each block holds packed
+column arrays instead of one record per entry:
+
+    foods:    date (int32 ordinals), calories (int32),
+              protein_g, carbs_g, fat_g, fiber_g (float64),
+              name offsets (uint32, rows + 1), name bytes (UTF-8)
+    workouts: date (int32 ordinals), completed (uint8),
+              routine_name offsets + bytes, notes offsets + bytes
+
+Blocks are optionally compressed with zlib or lzma. The file layout is
+
+    MAGIC | block | block | ... | footer JSON | footer offset (u64) | MAGIC
+
+Uncompressed blocks are read straight out of an ``mmap`` through
+``memoryview.cast``, so aggregations run over the buffers without building
+a Python object per row. Compressed blocks are decompressed the first time
+one of their columns is read, and kept from then on, so opening a snapshot
+or reading one month never unpacks the rest.
+"""
+import array
+import json
+import lzma
+import mmap
+import struct
+import sys
+import zlib
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..entities import FoodEntry, WorkoutEntry
+
+MAGIC = b"FGSNAP01"
+VERSION = 2  # 2 added the food macro columns
+MACROS = ("protein_g", "carbs_g", "fat_g", "fiber_g")
+CODECS = ("none", "zlib", "lzma")
+_TRAILER = struct.Struct("<Q8s")
+
+
+def _compress(codec: str, raw: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(raw, 6)
+    if codec == "lzma":
+        return lzma.compress(raw)
+    return raw
+
+
+def _decompress(codec: str, data) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "lzma":
+        return lzma.decompress(data)
+    return data
+
+
+def _strings(values: Iterable[str]) -> Tuple[array.array, bytes]:
+    offsets = array.array("I", [0])
+    parts = []
+    pos = 0
+    for v in values:
+        b = v.encode("utf-8")
+        parts.append(b)
+        pos += len(b)
+        offsets.append(pos)
+    return offsets, b"".join(parts)
+
+
+def _pack_columns(columns: List[Tuple[str, str, object]]) -> Tuple[bytes, list]:
+    """Concatenate columns with 8-byte alignment; return payload and layout."""
+    buf = bytearray()
+    layout = []
+    for name, typecode, col in columns:
+        if isinstance(col, array.array):
+            if sys.byteorder == "big":
+                col = array.array(col.typecode, col)
+                col.byteswap()
+            data = col.tobytes()
+        else:
+            data = bytes(col)
+        layout.append([name, typecode, len(buf), len(data)])
+        buf += data
+        buf += b"\0" * (-len(buf) % 8)
+    return bytes(buf), layout
+
+
+def _food_columns(rows: List[FoodEntry]) -> list:
+    name_off, names = _strings(f.name for f in rows)
+    return [
+        ("date", "i", array.array("i", (f.date.toordinal() for f in rows))),
+        ("calories", "i", array.array("i", (f.calories for f in rows))),
+        *((m, "d", array.array("d", (getattr(f, m) for f in rows))) for m in MACROS),
+        ("name_off", "I", name_off),
+        ("name", "B", names),
+    ]
+
+
+def _workout_columns(rows: List[WorkoutEntry]) -> list:
+    name_off, names = _strings(w.routine_name for w in rows)
+    notes_off, notes = _strings(w.notes for w in rows)
+    return [
+        ("date", "i", array.array("i", (w.date.toordinal() for w in rows))),
+        ("completed", "B", array.array("B", (1 if w.completed else 0 for w in rows))),
+        ("name_off", "I", name_off),
+        ("name", "B", names),
+        ("notes_off", "I", notes_off),
+        ("notes", "B", notes),
+    ]
+
+
+def _by_month(entries: Iterable) -> Dict[str, list]:
+    months: Dict[str, list] = defaultdict(list)
+    for e in entries:
+        months[f"{e.date.year:04d}-{e.date.month:02d}"].append(e)
+    for rows in months.values():
+        rows.sort(key=lambda e: e.date)
+    return months
+
+
+def write_snapshot(
+    path: str,
+    foods: Iterable[FoodEntry],
+    workouts: Iterable[WorkoutEntry],
+    codec: str = "zlib",
+) -> int:
+    """Write foods and workouts as a columnar snapshot. Returns the row count."""
+    if codec not in CODECS:
+        raise ValueError(f"unknown codec '{codec}', expected one of {CODECS}")
+
+    blocks = []
+    total = 0
+    with open(path, "wb") as out:
+        out.write(MAGIC)
+        for kind, months, build in (
+            ("foods", _by_month(foods), _food_columns),
+            ("workouts", _by_month(workouts), _workout_columns),
+        ):
+            for month in sorted(months):
+                rows = months[month]
+                raw, layout = _pack_columns(build(rows))
+                data = _compress(codec, raw)
+                # Keep block starts 8-aligned so mmap'd columns can be cast
+                out.write(b"\0" * (-out.tell() % 8))
+                blocks.append(
+                    {
+                        "kind": kind,
+                        "month": month,
+                        "rows": len(rows),
+                        "codec": codec,
+                        "offset": out.tell(),
+                        "length": len(data),
+                        "columns": layout,
+                    }
+                )
+                out.write(data)
+                total += len(rows)
+
+        footer_offset = out.tell()
+        out.write(json.dumps({"version": VERSION, "blocks": blocks}).encode("utf-8"))
+        out.write(_TRAILER.pack(footer_offset, MAGIC))
+    return total
+
+
+def write_snapshot_from_repo(repo, path: str, codec: str = "zlib") -> int:
+    """Snapshot everything stored in any ``Repository`` implementation."""
+    return write_snapshot(path, repo.load_foods(), repo.load_workouts(), codec)
+
+
+class _Block:
+    """One (kind, month) block; its columns are mapped on first use."""
+
+    def __init__(self, meta: dict, load: Callable[[], object]) -> None:
+        self.kind: str = meta["kind"]
+        self.month: str = meta["month"]
+        self.rows: int = meta["rows"]
+        self._layout = meta["columns"]
+        self._load = load
+        self._views: Optional[Dict[str, memoryview]] = None
+
+    def _columns(self) -> Dict[str, memoryview]:
+        if self._views is None:
+            views = {}
+            payload = self._load()
+            buf = memoryview(payload)
+            for name, typecode, offset, length in self._layout:
+                view = buf[offset:offset + length].cast(typecode)
+                if sys.byteorder == "big" and typecode != "B":
+                    swapped = array.array(typecode, view)
+                    swapped.byteswap()
+                    view.release()
+                    view = memoryview(swapped)
+                views[name] = view
+            buf.release()
+            if isinstance(payload, memoryview):
+                payload.release()
+            self._views = views
+        return self._views
+
+    @property
+    def loaded(self) -> bool:
+        return self._views is not None
+
+    def column(self, name: str) -> memoryview:
+        return self._columns()[name]
+
+    def has_column(self, name: str) -> bool:
+        return any(col[0] == name for col in self._layout)
+
+    def strings(self, name: str) -> List[str]:
+        views = self._columns()
+        offsets = views[name + "_off"]
+        blob = views[name]
+        return [
+            bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
+            for i in range(self.rows)
+        ]
+
+    def release(self) -> None:
+        for view in (self._views or {}).values():
+            view.release()
+        self._views = None
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a FitGator snapshot")
+        if self._mmap[:8] != MAGIC or self._mmap[-8:] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a FitGator snapshot")
+
+        footer_offset, _ = _TRAILER.unpack(self._mmap[-_TRAILER.size:])
+        footer = json.loads(self._mmap[footer_offset:len(self._mmap) - _TRAILER.size])
+        if footer["version"] not in (1, VERSION):
+            self.close()
+            raise ValueError(f"unsupported snapshot version {footer['version']}")
+
+        self._blocks: List[_Block] = [
+            _Block(meta, lambda meta=meta: self._payload(meta)) for meta in footer["blocks"]
+        ]
+
+    def _payload(self, meta: dict):
+        """A block's column bytes: a slice of the mmap, or its decompressed copy."""
+        view = memoryview(self._mmap)[meta["offset"]:meta["offset"] + meta["length"]]
+        if meta["codec"] == "none":
+            return view
+        try:
+            return _decompress(meta["codec"], view)
+        finally:
+            view.release()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for block in getattr(self, "_blocks", []):
+            block.release()
+        self._blocks = []
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def blocks(self, kind: str) -> List[_Block]:
+        return [b for b in self._blocks if b.kind == kind]
+
+    def row_count(self, kind: str) -> int:
+        return sum(b.rows for b in self.blocks(kind))
+
+    # --- aggregations over the packed columns ------------------------------
+
+    def monthly_calories(self) -> Dict[str, int]:
+        """Total calories per ``YYYY-MM`` month."""
+        return {b.month: sum(b.column("calories")) for b in self.blocks("foods")}
+
+    def daily_calories(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        """Total calories per day, optionally limited to [start, end]."""
+        lo = start.toordinal() if start else -sys.maxsize
+        hi = end.toordinal() if end else sys.maxsize
+        totals: Dict[int, int] = defaultdict(int)
+        for b in self.blocks("foods"):
+            for d, c in zip(b.column("date"), b.column("calories")):
+                if lo <= d <= hi:
+                    totals[d] += c
+        return {date.fromordinal(d): c for d, c in totals.items()}
+
+    def daily_workouts_completed(self) -> Dict[date, int]:
+        """Number of completed workouts per day."""
+        totals: Dict[int, int] = defaultdict(int)
+        for b in self.blocks("workouts"):
+            for d, done in zip(b.column("date"), b.column("completed")):
+                if done:
+                    totals[d] += 1
+        return {date.fromordinal(d): c for d, c in totals.items()}
+
+    # --- materialization, for the rare caller that needs entities ------------
+
+    def foods(self) -> List[FoodEntry]:
+        res: List[FoodEntry] = []
+        for b in self.blocks("foods"):
+            # Version 1 snapshots have no macro columns
+            zeros = [0.0] * b.rows
+            macros = [b.column(m) if b.has_column(m) else zeros for m in MACROS]
+            for d, c, name, p, carbs, fat, fiber in zip(
+                b.column("date"), b.column("calories"), b.strings("name"), *macros
+            ):
+                res.append(
+                    FoodEntry(
+                        date=date.fromordinal(d),
+                        name=name,
+                        calories=c,
+                        protein_g=p,
+                        carbs_g=carbs,
+                        fat_g=fat,
+                        fiber_g=fiber,
+                    )
+                )
+        return res
+
+    def workouts(self) -> List[WorkoutEntry]:
+        res: List[WorkoutEntry] = []
+        for b in self.blocks("workouts"):
+            for d, done, name, notes in zip(
+                b.column("date"), b.column("completed"), b.strings("name"), b.strings("notes")
+            ):
+                res.append(
+                    WorkoutEntry(
+                        date=date.fromordinal(d),
+                        routine_name=name,
+                        completed=bool(done),
+                        notes=notes,
+                    )
+                )
+        return res
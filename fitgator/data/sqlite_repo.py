@@ -1,19 +1,108 @@
+import json
 import sqlite3
 import os
+import glob
+import re
+import urllib.parse
+import uuid
+from contextlib import contextmanager, nullcontext
 from datetime import date
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from ..entities import UserProfile, FoodEntry, WorkoutEntry, Goal
+from ..entities import (
+    FoodEntry,
+    Goal,
+    MacroTotals,
+    Template,
+    TemplateItem,
+    UserProfile,
+    WorkoutEntry,
+)
+from ..events import (
+    DataCleared,
+    EventBus,
+    FoodAdded,
+    FoodDeleted,
+    FoodsAdded,
+    FoodsReplaced,
+    GoalSaved,
+    ProfileSaved,
+    TemplatesChanged,
+    WorkoutAdded,
+    WorkoutDeleted,
+    WorkoutsAdded,
+    WorkoutsReplaced,
+)
+from .defaults import default_templates
+from .journal import ADD, DELETE, JOURNAL_STEPS, decode_entry, describe, encode_entry
+
+
+def archive_path(db_path: str, year: int) -> str:
+    """Archive file holding ``year`` for the database at ``db_path``."""
+    root, ext = os.path.splitext(db_path)
+    return f"{root}.{year}{ext or '.db'}"
+
+
+def find_archives(db_path: str) -> Dict[int, str]:
+    """Existing archive files of ``db_path``, keyed by year."""
+    if db_path == ":memory:":
+        return {}
+    root, ext = os.path.splitext(db_path)
+    pattern = re.compile(re.escape(root) + r"\.(\d{4})" + re.escape(ext or ".db") + "$")
+    found = {}
+    for path in glob.glob(f"{glob.escape(root)}.*{ext or '.db'}"):
+        m = pattern.match(path)
+        if m:
+            found[int(m.group(1))] = path
+    return found
 
 
 class SQLiteRepository:
-    def __init__(self, db_path: str = "fitgator.db") -> None:
-        full_path = os.path.abspath(db_path)
-        print(f"[SQLiteRepository] Using database at: {full_path}")
+    """SQLite-backed repository with year-partitioned history.
+
+    Rows for the current year live in the hot database (``fitgator.db``).
+    Once a year is closed its foods and workouts are moved into a cold
+    per-year file next to it (``fitgator.2023.db``), which is ATTACHed only
+    while a query or write actually touches that year.
 
-        self._conn = sqlite3.connect(db_path)
+    With ``read_only=True`` the database and its archives are opened with
+    ``mode=ro`` and nothing is created, migrated or archived; this is what
+    report workers use to read alongside a running app.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "fitgator.db",
+        verbose: bool = True,
+        auto_archive: bool = True,
+        bus: Optional[EventBus] = None,
+        read_only: bool = False,
+        journal_steps: int = JOURNAL_STEPS,
+    ) -> None:
+        if verbose:
+            full_path = os.path.abspath(db_path)
+            print(f"[SQLiteRepository] Using database at: {full_path}")
+
+        self._db_path = db_path
+        # Every committed mutation is published here
+        self.bus = bus or EventBus()
+        self._read_only = read_only
+        if read_only:
+            self._conn = sqlite3.connect(self._ro_uri(db_path), uri=True)
+        else:
+            self._conn = sqlite3.connect(db_path)
         self._conn.row_factory = sqlite3.Row
-        self._create_tables()
+        self._fts = self._has_fts5()
+        self._device: Optional[str] = None
+        # Undo steps kept; 0 turns the journal off
+        self._journal_steps = journal_steps
+        if not read_only:
+            self._create_tables()
+        self._archived: Set[int] = self._find_archives()
+        # Archives whose tables this connection has created or migrated
+        self._ready: Set[int] = set()
+        if auto_archive and not read_only:
+            self.archive_closed_years()
 
     # --- internal helpers -------------------------------------------------
 
@@ -46,32 +135,267 @@ class SQLiteRepository:
             """
         )
 
-        # Food log table
+        # Sync bookkeeping: this database's device id and change counter
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                device_id TEXT NOT NULL,
+                clock INTEGER NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            "INSERT OR IGNORE INTO sync_meta (id, device_id, clock) VALUES (1, ?, 0)",
+            (uuid.uuid4().hex,),
+        )
+
+        # Deleted rows, so deletions propagate to other devices
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tombstones (
+                uuid TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                date TEXT NOT NULL,
+                rev INTEGER NOT NULL,
+                origin TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tombstones_rev ON tombstones (rev)")
+
+        # Undo/redo journal; see journal.py
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                step INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                action TEXT NOT NULL,
+                uuid TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                undone INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_journal_step ON journal (undone, step)")
+
+        # Meal/workout templates; new databases start with the default plans
+        cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'templates'"
+        )
+        seed = cur.fetchone() is None
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS foods (
+            CREATE TABLE IF NOT EXISTS templates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                recurrence TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS template_items (
+                template_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                calories INTEGER NOT NULL,
+                protein_g REAL NOT NULL,
+                carbs_g REAL NOT NULL,
+                fat_g REAL NOT NULL,
+                fiber_g REAL NOT NULL,
+                notes TEXT NOT NULL,
+                PRIMARY KEY (template_id, position)
+            )
+            """
+        )
+        if seed:
+            for t in default_templates():
+                self._write_template(t)
+
+        self._create_log_tables("main")
+        self._conn.commit()
+
+    def _create_log_tables(self, schema: str) -> None:
+        """Create the food/workout log tables in ``schema`` (hot or archive)."""
+        cur = self._conn.cursor()
+
+        # Food log table
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {schema}.foods (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 date TEXT NOT NULL,
                 name TEXT NOT NULL,
-                calories INTEGER NOT NULL
+                calories INTEGER NOT NULL,
+                protein_g REAL NOT NULL DEFAULT 0,
+                carbs_g REAL NOT NULL DEFAULT 0,
+                fat_g REAL NOT NULL DEFAULT 0,
+                fiber_g REAL NOT NULL DEFAULT 0,
+                uuid TEXT,
+                rev INTEGER NOT NULL DEFAULT 0,
+                origin TEXT NOT NULL DEFAULT ''
             )
             """
         )
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_foods_date ON foods (date)")
 
         # Workout log table
         cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS workouts (
+            f"""
+            CREATE TABLE IF NOT EXISTS {schema}.workouts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 date TEXT NOT NULL,
                 routine_name TEXT NOT NULL,
                 completed INTEGER NOT NULL,
-                notes TEXT NOT NULL
+                notes TEXT NOT NULL,
+                uuid TEXT,
+                rev INTEGER NOT NULL DEFAULT 0,
+                origin TEXT NOT NULL DEFAULT ''
             )
             """
         )
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema}.idx_workouts_date ON workouts (date)"
+        )
 
-        self._conn.commit()
+        self._add_columns(schema, "foods", self._MACRO_COLUMNS)
+        # Covering index: daily rollups never have to visit the table rows
+        cur.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {schema}.idx_foods_date_macros
+            ON foods (date, calories, protein_g, carbs_g, fat_g, fiber_g)
+            """
+        )
+        for table in ("foods", "workouts"):
+            self._add_sync_columns(schema, table)
+
+        if self._fts:
+            self._create_search_tables(schema)
+
+    _MACRO_COLUMNS = {
+        "protein_g": "REAL NOT NULL DEFAULT 0",
+        "carbs_g": "REAL NOT NULL DEFAULT 0",
+        "fat_g": "REAL NOT NULL DEFAULT 0",
+        "fiber_g": "REAL NOT NULL DEFAULT 0",
+    }
+    _SYNC_COLUMNS = {
+        "uuid": "TEXT",
+        "rev": "INTEGER NOT NULL DEFAULT 0",
+        "origin": "TEXT NOT NULL DEFAULT ''",
+    }
+
+    def _add_columns(self, schema: str, table: str, columns: Dict[str, str]) -> None:
+        """Migrate tables created by older versions: add missing columns."""
+        cur = self._conn.cursor()
+        cur.execute(f"PRAGMA {schema}.table_info({table})")
+        existing = {row["name"] for row in cur.fetchall()}
+        for name, decl in columns.items():
+            if name not in existing:
+                cur.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {name} {decl}")
+
+    def _add_sync_columns(self, schema: str, table: str) -> None:
+        """Give tables created before change tracking a uuid/rev/origin per row."""
+        cur = self._conn.cursor()
+        self._add_columns(schema, table, self._SYNC_COLUMNS)
+        cur.execute(f"SELECT 1 FROM {schema}.{table} WHERE uuid IS NULL LIMIT 1")
+        if cur.fetchone() is not None:
+            cur.execute(
+                f"""
+                UPDATE {schema}.{table}
+                SET uuid = lower(hex(randomblob(16))), rev = ?, origin = ?
+                WHERE uuid IS NULL
+                """,
+                (self._tick(), self._device_id()),
+            )
+        cur.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.idx_{table}_uuid ON {table} (uuid)"
+        )
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_rev ON {table} (rev)")
+
+    def _device_id(self) -> str:
+        if self._device is None:
+            row = self._conn.execute("SELECT device_id FROM sync_meta WHERE id = 1").fetchone()
+            self._device = row["device_id"]
+        return self._device
+
+    def _tick(self) -> int:
+        """Advance the change counter; call inside the write transaction."""
+        self._conn.execute("UPDATE main.sync_meta SET clock = clock + 1 WHERE id = 1")
+        return self._conn.execute("SELECT clock FROM main.sync_meta WHERE id = 1").fetchone()[0]
+
+    def _has_fts5(self) -> bool:
+        try:
+            self._conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+            self._conn.execute("DROP TABLE temp.fts5_probe")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _create_search_tables(self, schema: str) -> None:
+        """FTS5 indexes over food names and workout names/notes.
+
+        Both are external-content tables kept in sync by triggers, so the
+        text is stored once and only the inverted index is extra.
+        """
+        cur = self._conn.cursor()
+        cur.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'foods_fts'"
+        )
+        if cur.fetchone() is not None:
+            return
+
+        cur.execute(
+            f"""
+            CREATE VIRTUAL TABLE {schema}.foods_fts USING fts5(
+                name, content='foods', content_rowid='id'
+            )
+            """
+        )
+        cur.executescript(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {schema}.foods_fts_ai AFTER INSERT ON foods BEGIN
+                INSERT INTO foods_fts (rowid, name) VALUES (new.id, new.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS {schema}.foods_fts_ad AFTER DELETE ON foods BEGIN
+                INSERT INTO foods_fts (foods_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS {schema}.foods_fts_au AFTER UPDATE ON foods BEGIN
+                INSERT INTO foods_fts (foods_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+                INSERT INTO foods_fts (rowid, name) VALUES (new.id, new.name);
+            END;
+
+            CREATE VIRTUAL TABLE {schema}.workouts_fts USING fts5(
+                routine_name, notes, content='workouts', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS {schema}.workouts_fts_ai AFTER INSERT ON workouts BEGIN
+                INSERT INTO workouts_fts (rowid, routine_name, notes)
+                VALUES (new.id, new.routine_name, new.notes);
+            END;
+            CREATE TRIGGER IF NOT EXISTS {schema}.workouts_fts_ad AFTER DELETE ON workouts BEGIN
+                INSERT INTO workouts_fts (workouts_fts, rowid, routine_name, notes)
+                VALUES ('delete', old.id, old.routine_name, old.notes);
+            END;
+            CREATE TRIGGER IF NOT EXISTS {schema}.workouts_fts_au AFTER UPDATE ON workouts BEGIN
+                INSERT INTO workouts_fts (workouts_fts, rowid, routine_name, notes)
+                VALUES ('delete', old.id, old.routine_name, old.notes);
+                INSERT INTO workouts_fts (rowid, routine_name, notes)
+                VALUES (new.id, new.routine_name, new.notes);
+            END;
+
+            -- Index rows that predate the search tables
+            INSERT INTO {schema}.foods_fts (foods_fts) VALUES ('rebuild');
+            INSERT INTO {schema}.workouts_fts (workouts_fts) VALUES ('rebuild');
+            """
+        )
+
+    @staticmethod
+    def _ro_uri(path: str) -> str:
+        return "file:" + urllib.parse.quote(os.path.abspath(path)) + "?mode=ro"
 
     @staticmethod
     def _date_to_str(d: date) -> str:
@@ -81,6 +405,149 @@ class SQLiteRepository:
     def _str_to_date(s: str) -> date:
         return date.fromisoformat(s)
 
+    # --- year partitions --------------------------------------------------
+
+    def _archive_path(self, year: int) -> str:
+        return archive_path(self._db_path, year)
+
+    def _find_archives(self) -> Set[int]:
+        return set(find_archives(self._db_path))
+
+    @contextmanager
+    def _partition(self, year: int) -> Iterator[str]:
+        """ATTACH the archive for ``year`` for the duration of the block.
+
+        Any open transaction is committed first, since SQLite does not allow
+        ATTACH/DETACH inside a transaction. Work done inside the block is
+        committed before the archive is detached.
+        """
+        schema = f"archive_{year}"
+        self._conn.commit()
+        path = self._archive_path(year)
+        if self._read_only:
+            path = self._ro_uri(path)
+        self._conn.execute("ATTACH DATABASE ? AS " + schema, (path,))
+        try:
+            # Create (or migrate an older) archive once, not on every query
+            if not self._read_only and year not in self._ready:
+                self._create_log_tables(schema)
+                self._ready.add(year)
+            yield schema
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            raise
+        finally:
+            self._conn.execute("DETACH DATABASE " + schema)
+
+    def _reserve_ids(self, schema: str, table: str, n: int) -> List[Optional[int]]:
+        """Row ids for ``n`` new rows of ``schema.table``.
+
+        Hot rows get theirs from AUTOINCREMENT (None here). Archive rows
+        draw from the hot table's sequence instead, so an id names one row
+        across every partition and survives archiving.
+        """
+        if schema == "main":
+            return [None] * n
+        top = max(
+            self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM main.sqlite_sequence WHERE name = ?", (table,)
+            ).fetchone()[0],
+            self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM main.{table}").fetchone()[0],
+            self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {schema}.{table}").fetchone()[0],
+        )
+        self._conn.execute("DELETE FROM main.sqlite_sequence WHERE name = ?", (table,))
+        self._conn.execute(
+            "INSERT INTO main.sqlite_sequence (name, seq) VALUES (?, ?)", (table, top + n)
+        )
+        return list(range(top + 1, top + n + 1))
+
+    def _partitions(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Iterator[str]:
+        """Yield schema names covering [start, end], oldest partition first."""
+        for year in self._archived_years_in(start, end):
+            with self._partition(year) as schema:
+                yield schema
+        yield "main"
+
+    def _archived_years_in(self, start: Optional[date], end: Optional[date]) -> List[int]:
+        return [
+            year for year in sorted(self._archived)
+            if (start is None or year >= start.year) and (end is None or year <= end.year)
+        ]
+
+    @staticmethod
+    def _range_clause(start: Optional[date], end: Optional[date]) -> tuple:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(end.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    def archived_years(self) -> List[int]:
+        """Years whose history has been moved into cold archive files."""
+        return sorted(self._archived)
+
+    def archive_closed_years(self, today: Optional[date] = None) -> List[int]:
+        """Move every fully closed year out of the hot database.
+
+        Each year is copied into its archive file, ids included, and deleted
+        from the hot tables in a single transaction. Returns the years that
+        were moved.
+        """
+        cutoff = date((today or date.today()).year, 1, 1).isoformat()
+        cur = self._conn.execute(
+            """
+            SELECT DISTINCT substr(date, 1, 4) AS year FROM foods WHERE date < ?
+            UNION
+            SELECT DISTINCT substr(date, 1, 4) FROM workouts WHERE date < ?
+            """,
+            (cutoff, cutoff),
+        )
+        years = sorted(int(row["year"]) for row in cur.fetchall())
+        if not years or self._db_path == ":memory:":
+            return []
+
+        for year in years:
+            lo, hi = f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+            with self._partition(year) as schema:
+                self._conn.execute(
+                    f"""
+                    INSERT INTO {schema}.foods (id, {self._FOOD_COPY_COLUMNS})
+                    SELECT id, {self._FOOD_COPY_COLUMNS} FROM main.foods
+                    WHERE date >= ? AND date < ? ORDER BY date, id
+                    """,
+                    (lo, hi),
+                )
+                self._conn.execute(
+                    f"""
+                    INSERT INTO {schema}.workouts (id, {self._WORKOUT_COPY_COLUMNS})
+                    SELECT id, {self._WORKOUT_COPY_COLUMNS} FROM main.workouts
+                    WHERE date >= ? AND date < ? ORDER BY date, id
+                    """,
+                    (lo, hi),
+                )
+                self._conn.execute(
+                    "DELETE FROM main.foods WHERE date >= ? AND date < ?", (lo, hi)
+                )
+                self._conn.execute(
+                    "DELETE FROM main.workouts WHERE date >= ? AND date < ?", (lo, hi)
+                )
+            self._archived.add(year)
+
+        # Give the freed pages back so the hot file stays small
+        self._conn.execute("VACUUM")
+        return years
+
     # --- Repository protocol methods --------------------------------------
 
     def load_profile(self) -> Optional[UserProfile]:
@@ -137,6 +604,7 @@ class SQLiteRepository:
                 ),
             )
         self._conn.commit()
+        self.bus.publish(ProfileSaved(profile))
 
     def load_goal(self) -> Optional[Goal]:
         cur = self._conn.cursor()
@@ -172,65 +640,915 @@ class SQLiteRepository:
                 (goal.goal_type, start_date_str),
             )
         self._conn.commit()
+        self.bus.publish(GoalSaved(goal))
 
     def load_foods(self) -> List[FoodEntry]:
-        cur = self._conn.cursor()
-        cur.execute("SELECT date, name, calories FROM foods ORDER BY date, id")
-        rows = cur.fetchall()
-        return [
-            FoodEntry(
-                date=self._str_to_date(row["date"]),
-                name=row["name"],
-                calories=row["calories"],
-            )
-            for row in rows
-        ]
+        return self.load_foods_range(None, None)
+
+    def load_foods_range(
+        self, start: Optional[date], end: Optional[date]
+    ) -> List[FoodEntry]:
+        """Foods dated within [start, end] (either bound may be None)."""
+        return list(self.iter_foods(start, end, batch_size=4096))
+
+    def iter_foods(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[FoodEntry]:
+        """Stream foods in date order, ``batch_size`` rows per fetch."""
+        return self._iter_rows("foods", self._FOOD_COLUMNS, self._food_from_row,
+                               start, end, batch_size)
 
     def save_foods(self, foods: List[FoodEntry]) -> None:
-        cur = self._conn.cursor()
-        # For simplicity, clear and re-insert; good enough for MVP scale
-        cur.execute("DELETE FROM foods")
-        for entry in foods:
-            cur.execute(
-                "INSERT INTO foods (date, name, calories) VALUES (?, ?, ?)",
-                (self._date_to_str(entry.date), entry.name, entry.calories),
+        """Replace the food log with ``foods``.
+
+        Stored rows that are passed back unchanged (same id and values) are
+        kept, so only real additions and removals show up as sync changes.
+        """
+        by_schema = self._group_by_partition(foods)
+        for schema in self._partitions():
+            self._replace_rows(
+                schema, "foods", by_schema.get(schema, []),
+                self._FOOD_COLUMNS, self._food_from_row, self._insert_food,
             )
         self._conn.commit()
+        self.bus.publish(FoodsReplaced(list(foods)))
+
+    def add_food(self, entry: FoodEntry) -> None:
+        """Append a single food entry without rewriting the table.
+
+        ``entry.id`` is set to the new row id.
+        """
+        with self._partition_for(entry.date) as schema:
+            meta = self._new_meta()
+            self._insert_food(schema, entry, meta)
+            self._journal(self._begin_step(), "foods", ADD, [(meta[0], entry)])
+        self.bus.publish(FoodAdded(entry))
+
+    def add_foods(self, entries: List[FoodEntry]) -> None:
+        """Append many food entries with one ``executemany`` per partition.
+
+        Entries for the hot database go in as one transaction, as do those
+        for each archive year. Sets every ``entry.id``.
+        """
+        self._add_many("foods", entries)
+        if entries:
+            self.bus.publish(FoodsAdded(list(entries)))
+
+    def delete_food(self, entry: FoodEntry) -> None:
+        """Delete one stored food entry.
+
+        Entries loaded from this repository are matched by row id; entries
+        without one fall back to the first row with the same values.
+        """
+        with self._partition_for(entry.date) as schema:
+            row_id = entry.id
+            if row_id is None:
+                row = self._conn.execute(
+                    f"""
+                    SELECT id FROM {schema}.foods
+                    WHERE date = ? AND name = ? AND calories = ? LIMIT 1
+                    """,
+                    (self._date_to_str(entry.date), entry.name, entry.calories),
+                ).fetchone()
+                row_id = row["id"] if row is not None else None
+            deleted = row_id is not None and self._delete_journaled(schema, "foods", row_id)
+        # A stale or repeated delete changes nothing, so listeners hear nothing
+        if deleted:
+            self.bus.publish(FoodDeleted(entry))
 
     def load_workouts(self) -> List[WorkoutEntry]:
-        cur = self._conn.cursor()
-        cur.execute(
-            "SELECT date, routine_name, completed, notes FROM workouts ORDER BY date, id"
+        return self.load_workouts_range(None, None)
+
+    def load_workouts_range(
+        self, start: Optional[date], end: Optional[date]
+    ) -> List[WorkoutEntry]:
+        """Workouts dated within [start, end] (either bound may be None)."""
+        return list(self.iter_workouts(start, end, batch_size=4096))
+
+    def iter_workouts(
+        self, start: Optional[date] = None, end: Optional[date] = None, batch_size: int = 500
+    ) -> Iterator[WorkoutEntry]:
+        """Stream workouts in date order, ``batch_size`` rows per fetch."""
+        return self._iter_rows("workouts", self._WORKOUT_COLUMNS, self._workout_from_row,
+                               start, end, batch_size)
+
+    def _iter_rows(
+        self,
+        table: str,
+        columns: str,
+        from_row: Callable,
+        start: Optional[date],
+        end: Optional[date],
+        batch_size: int,
+    ) -> Iterator:
+        where, params = self._range_clause(start, end)
+        after = "(date > ? OR (date = ? AND id > ?))"
+        where_after = f"{where} AND {after}" if where else f"WHERE {after}"
+        # Each batch is read whole, with its archive attached only for that
+        # query, and the next one resumes after the last (date, id) seen. No
+        # statement or ATTACH is left open while the caller holds the
+        # iterator, so it can use the repository (or abandon the iterator)
+        # between items.
+        for year in self._archived_years_in(start, end) + [None]:
+            last = None
+            while True:
+                with self._partition(year) if year is not None else nullcontext("main") as schema:
+                    if last is None:
+                        sql, args = where, params
+                    else:
+                        sql, args = where_after, params + [last[0], last[0], last[1]]
+                    rows = self._conn.execute(
+                        f"SELECT {columns} FROM {schema}.{table} {sql} ORDER BY date, id LIMIT ?",
+                        args + [batch_size],
+                    ).fetchall()
+                for row in rows:
+                    yield from_row(row)
+                if len(rows) < batch_size:
+                    break
+                last = rows[-1]["date"], rows[-1]["id"]
+
+    def save_workouts(self, workouts: List[WorkoutEntry]) -> None:
+        """Replace the workout log, keeping unchanged rows like :meth:`save_foods`."""
+        by_schema = self._group_by_partition(workouts)
+        for schema in self._partitions():
+            self._replace_rows(
+                schema, "workouts", by_schema.get(schema, []),
+                self._WORKOUT_COLUMNS, self._workout_from_row, self._insert_workout,
+            )
+        self._conn.commit()
+        self.bus.publish(WorkoutsReplaced(list(workouts)))
+
+    def _replace_rows(
+        self,
+        schema: str,
+        table: str,
+        entries: list,
+        columns: str,
+        from_row: Callable,
+        insert: Callable,
+    ) -> None:
+        stored = {
+            row["id"]: from_row(row)
+            for row in self._conn.execute(f"SELECT {columns} FROM {schema}.{table}")
+        }
+        keep: Set[int] = set()
+        new = []
+        for e in entries:
+            if e.id in stored and e.id not in keep and stored[e.id] == e:
+                keep.add(e.id)
+            else:
+                new.append(e)
+        gone = [row_id for row_id in stored if row_id not in keep]
+        if not gone and not new:
+            return
+        # Journaled operations may point at rows replaced here; rather than
+        # undo into a log they no longer describe, forget them
+        self._conn.execute("DELETE FROM main.journal WHERE kind = ?", (table,))
+        rev = self._tick()
+        for row_id in gone:
+            self._delete_row(schema, table, row_id, rev)
+        for e in new:
+            insert(schema, e, (uuid.uuid4().hex, rev, self._device_id()))
+
+    def add_workout(self, workout: WorkoutEntry) -> None:
+        """Append a single workout entry without rewriting the table.
+
+        ``workout.id`` is set to the new row id.
+        """
+        with self._partition_for(workout.date) as schema:
+            meta = self._new_meta()
+            self._insert_workout(schema, workout, meta)
+            self._journal(self._begin_step(), "workouts", ADD, [(meta[0], workout)])
+        self.bus.publish(WorkoutAdded(workout))
+
+    def add_workouts(self, workouts: List[WorkoutEntry]) -> None:
+        """Append many workouts in one batch; see :meth:`add_foods`."""
+        self._add_many("workouts", workouts)
+        if workouts:
+            self.bus.publish(WorkoutsAdded(list(workouts)))
+
+    def _add_many(self, table: str, entries: list) -> None:
+        if table == "foods":
+            sql = f"INSERT INTO {{schema}}.foods (id, {self._FOOD_COPY_COLUMNS}) VALUES ({{marks}})"
+            values = self._food_values
+        else:
+            sql = (
+                f"INSERT INTO {{schema}}.workouts (id, {self._WORKOUT_COPY_COLUMNS}) "
+                "VALUES ({marks})"
+            )
+            values = self._workout_values
+
+        step = self._begin_step() if entries else None
+        for batch in self._group_by_partition(entries).values():
+            with self._partition_for(batch[0].date) as schema:
+                rev, origin = self._tick(), self._device_id()
+                ids = self._reserve_ids(schema, table, len(batch))
+                rows = [
+                    (row_id, *values(e), uuid.uuid4().hex, rev, origin)
+                    for row_id, e in zip(ids, batch)
+                ]
+                marks = ", ".join("?" * len(rows[0]))
+                self._conn.executemany(sql.format(schema=schema, marks=marks), rows)
+                # Read the new row ids back by the uuids just generated
+                ids = {
+                    row["uuid"]: row["id"]
+                    for row in self._conn.execute(
+                        f"SELECT id, uuid FROM {schema}.{table} WHERE rev = ?", (rev,)
+                    )
+                }
+                for e, row in zip(batch, rows):
+                    e.id = ids[row[-3]]
+                self._journal(step, table, ADD, [(row[-3], e) for e, row in zip(batch, rows)])
+
+    def delete_workout(self, workout: WorkoutEntry) -> None:
+        """Delete one stored workout, matched like :meth:`delete_food`."""
+        with self._partition_for(workout.date) as schema:
+            row_id = workout.id
+            if row_id is None:
+                row = self._conn.execute(
+                    f"""
+                    SELECT id FROM {schema}.workouts
+                    WHERE date = ? AND routine_name = ? AND completed = ? AND notes = ?
+                    LIMIT 1
+                    """,
+                    (
+                        self._date_to_str(workout.date),
+                        workout.routine_name,
+                        int(workout.completed),
+                        workout.notes,
+                    ),
+                ).fetchone()
+                row_id = row["id"] if row is not None else None
+            deleted = row_id is not None and self._delete_journaled(schema, "workouts", row_id)
+        if deleted:
+            self.bus.publish(WorkoutDeleted(workout))
+
+    def count_foods_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        """Number of food entries per day within [start, end]."""
+        return self._count_by_day("foods", start, end)
+
+    def count_workouts_by_day(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, int]:
+        """Number of workouts per day within [start, end]."""
+        return self._count_by_day("workouts", start, end)
+
+    def _count_by_day(
+        self, table: str, start: Optional[date], end: Optional[date]
+    ) -> Dict[date, int]:
+        where, params = self._range_clause(start, end)
+        counts: Dict[date, int] = {}
+        for schema in self._partitions(start, end):
+            cur = self._conn.execute(
+                f"SELECT date, COUNT(*) FROM {schema}.{table} {where} GROUP BY date ORDER BY date",
+                params,
+            )
+            for d, n in cur.fetchall():
+                counts[self._str_to_date(d)] = n
+        return counts
+
+    def daily_macro_totals(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Dict[date, MacroTotals]:
+        """Calories and macros summed per day within [start, end].
+
+        Summed in SQL from the covering (date, calories, macros) index.
+        """
+        where, params = self._range_clause(start, end)
+        totals: Dict[date, MacroTotals] = {}
+        for schema in self._partitions(start, end):
+            cur = self._conn.execute(
+                f"""
+                SELECT date, SUM(calories), SUM(protein_g), SUM(carbs_g),
+                    SUM(fat_g), SUM(fiber_g)
+                FROM {schema}.foods {where} GROUP BY date ORDER BY date
+                """,
+                params,
+            )
+            for d, calories, protein, carbs, fat, fiber in cur.fetchall():
+                totals[self._str_to_date(d)] = MacroTotals(calories, protein, carbs, fat, fiber)
+        return totals
+
+    # --- row mapping ------------------------------------------------------
+
+    _FOOD_COLUMNS = "id, date, name, calories, protein_g, carbs_g, fat_g, fiber_g"
+    # Everything but the id, for moving rows between partitions
+    _FOOD_COPY_COLUMNS = (
+        "date, name, calories, protein_g, carbs_g, fat_g, fiber_g, uuid, rev, origin"
+    )
+    _WORKOUT_COPY_COLUMNS = "date, routine_name, completed, notes, uuid, rev, origin"
+    _WORKOUT_COLUMNS = "id, date, routine_name, completed, notes"
+
+    @classmethod
+    def _food_from_row(cls, row) -> FoodEntry:
+        return FoodEntry(
+            date=cls._str_to_date(row["date"]),
+            name=row["name"],
+            calories=row["calories"],
+            protein_g=row["protein_g"],
+            carbs_g=row["carbs_g"],
+            fat_g=row["fat_g"],
+            fiber_g=row["fiber_g"],
+            id=row["id"],
         )
-        rows = cur.fetchall()
-        return [
-            WorkoutEntry(
-                date=self._str_to_date(row["date"]),
-                routine_name=row["routine_name"],
-                completed=bool(row["completed"]),
-                notes=row["notes"],
+
+    @classmethod
+    def _workout_from_row(cls, row) -> WorkoutEntry:
+        return WorkoutEntry(
+            date=cls._str_to_date(row["date"]),
+            routine_name=row["routine_name"],
+            completed=bool(row["completed"]),
+            notes=row["notes"],
+            id=row["id"],
+        )
+
+    def _new_meta(self) -> Tuple[str, int, str]:
+        """(uuid, rev, origin) for a row created on this device."""
+        return uuid.uuid4().hex, self._tick(), self._device_id()
+
+    @classmethod
+    def _food_values(cls, e: FoodEntry) -> tuple:
+        return (cls._date_to_str(e.date), e.name, e.calories,
+                e.protein_g, e.carbs_g, e.fat_g, e.fiber_g)
+
+    @classmethod
+    def _workout_values(cls, w: WorkoutEntry) -> tuple:
+        return (cls._date_to_str(w.date), w.routine_name, int(w.completed), w.notes)
+
+    def _insert_food(
+        self, schema: str, entry: FoodEntry, meta: Optional[Tuple[str, int, str]] = None
+    ) -> None:
+        cur = self._conn.execute(
+            f"""
+            INSERT INTO {schema}.foods (id, {self._FOOD_COPY_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                *self._reserve_ids(schema, "foods", 1),
+                *self._food_values(entry),
+                *(meta or self._new_meta()),
+            ),
+        )
+        entry.id = cur.lastrowid
+
+    def _insert_workout(
+        self, schema: str, w: WorkoutEntry, meta: Optional[Tuple[str, int, str]] = None
+    ) -> None:
+        cur = self._conn.execute(
+            f"""
+            INSERT INTO {schema}.workouts (id, {self._WORKOUT_COPY_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                *self._reserve_ids(schema, "workouts", 1),
+                *self._workout_values(w),
+                *(meta or self._new_meta()),
+            ),
+        )
+        w.id = cur.lastrowid
+
+    def _delete_row(self, schema: str, table: str, row_id: int, rev: int) -> Optional[str]:
+        """Delete one row and leave a tombstone so the deletion syncs.
+
+        Returns the deleted row's uuid, or None if there was no such row.
+        """
+        row = self._conn.execute(
+            f"SELECT date, uuid, origin FROM {schema}.{table} WHERE id = ?", (row_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(f"DELETE FROM {schema}.{table} WHERE id = ?", (row_id,))
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO main.tombstones (uuid, kind, date, rev, origin)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (row["uuid"], table, row["date"], rev, row["origin"]),
+        )
+        return row["uuid"]
+
+    def _group_by_partition(self, entries) -> dict:
+        by_schema: dict = {}
+        for e in entries:
+            schema = f"archive_{e.date.year}" if e.date.year in self._archived else "main"
+            by_schema.setdefault(schema, []).append(e)
+        return by_schema
+
+    @contextmanager
+    def _partition_for(self, d: date) -> Iterator[str]:
+        """Schema that owns rows dated ``d``; commits when the block exits."""
+        if d.year in self._archived:
+            with self._partition(d.year) as schema:
+                yield schema
+        else:
+            try:
+                yield "main"
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    # --- Full-text search ---------------------------------------------------
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into an FTS5 query: every word, prefix-matched."""
+        terms = query.split()
+        return " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+
+    def search(
+        self,
+        query: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Tuple[List[FoodEntry], List[WorkoutEntry]]:
+        """Foods whose name, and workouts whose name or notes, match ``query``.
+
+        Every word must match (as a prefix, case-insensitively). Results are
+        ordered by date and restricted to [start, end] when given.
+        """
+        foods: List[FoodEntry] = []
+        workouts: List[WorkoutEntry] = []
+        if not query.split():
+            return foods, workouts
+
+        where, params = self._range_clause(start, end)
+        if self._fts:
+            match = self._fts_query(query)
+            where = ("AND " + where[len("WHERE "):]) if where else ""
+            food_sql = f"""
+                SELECT f.id, f.date, f.name, f.calories,
+                    f.protein_g, f.carbs_g, f.fat_g, f.fiber_g
+                FROM {{schema}}.foods_fts AS fts JOIN {{schema}}.foods AS f ON f.id = fts.rowid
+                WHERE fts.foods_fts MATCH ? {where} ORDER BY f.date, f.id
+            """
+            workout_sql = f"""
+                SELECT w.id, w.date, w.routine_name, w.completed, w.notes
+                FROM {{schema}}.workouts_fts AS fts JOIN {{schema}}.workouts AS w ON w.id = fts.rowid
+                WHERE fts.workouts_fts MATCH ? {where} ORDER BY w.date, w.id
+            """
+            food_params = workout_params = [match, *params]
+        else:
+            terms = query.lower().split()
+            food_cond = " AND ".join("instr(lower(name), ?) > 0" for _ in terms)
+            workout_cond = " AND ".join(
+                "instr(lower(routine_name || ' ' || notes), ?) > 0" for _ in terms
             )
-            for row in rows
-        ]
+            where = (where + " AND ") if where else "WHERE "
+            food_sql = f"""
+                SELECT {self._FOOD_COLUMNS} FROM {{schema}}.foods
+                {where}{food_cond} ORDER BY date, id
+            """
+            workout_sql = f"""
+                SELECT {self._WORKOUT_COLUMNS} FROM {{schema}}.workouts
+                {where}{workout_cond} ORDER BY date, id
+            """
+            food_params = workout_params = [*params, *terms]
 
-    def save_workouts(self, workouts: List[WorkoutEntry]) -> None:
-        cur = self._conn.cursor()
-        cur.execute("DELETE FROM workouts")
-        for w in workouts:
-            cur.execute(
+        for schema in self._partitions(start, end):
+            cur = self._conn.execute(food_sql.format(schema=schema), food_params)
+            foods.extend(self._food_from_row(row) for row in cur.fetchall())
+            cur = self._conn.execute(workout_sql.format(schema=schema), workout_params)
+            workouts.extend(self._workout_from_row(row) for row in cur.fetchall())
+        return foods, workouts
+
+    # --- Templates --------------------------------------------------------
+
+    def load_templates(self) -> List[Template]:
+        """All meal and workout templates, by name."""
+        templates = []
+        cur = self._conn.execute("SELECT id, name, kind, recurrence FROM templates ORDER BY name")
+        for t in cur.fetchall():
+            items = self._conn.execute(
                 """
-                INSERT INTO workouts (date, routine_name, completed, notes)
-                VALUES (?, ?, ?, ?)
+                SELECT name, calories, protein_g, carbs_g, fat_g, fiber_g, notes
+                FROM template_items WHERE template_id = ? ORDER BY position
                 """,
-                (
-                    self._date_to_str(w.date),
-                    w.routine_name,
-                    int(w.completed),
-                    w.notes,
-                ),
+                (t["id"],),
+            ).fetchall()
+            templates.append(
+                Template(
+                    name=t["name"],
+                    kind=t["kind"],
+                    items=[TemplateItem(**dict(row)) for row in items],
+                    recurrence=t["recurrence"],
+                )
+            )
+        return templates
+
+    def save_template(self, template: Template) -> None:
+        """Create or replace the template called ``template.name``."""
+        self._delete_template(template.name)
+        self._write_template(template)
+        self._conn.commit()
+        self.bus.publish(TemplatesChanged())
+
+    def delete_template(self, name: str) -> None:
+        self._delete_template(name)
+        self._conn.commit()
+        self.bus.publish(TemplatesChanged())
+
+    def _delete_template(self, name: str) -> None:
+        self._conn.execute(
+            "DELETE FROM template_items WHERE template_id IN "
+            "(SELECT id FROM templates WHERE name = ?)",
+            (name,),
+        )
+        self._conn.execute("DELETE FROM templates WHERE name = ?", (name,))
+
+    def _write_template(self, template: Template) -> None:
+        cur = self._conn.execute(
+            "INSERT INTO templates (name, kind, recurrence) VALUES (?, ?, ?)",
+            (template.name, template.kind, template.recurrence),
+        )
+        self._conn.executemany(
+            """
+            INSERT INTO template_items (template_id, position, name, calories,
+                protein_g, carbs_g, fat_g, fiber_g, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (cur.lastrowid, i, it.name, it.calories, it.protein_g, it.carbs_g,
+                 it.fat_g, it.fiber_g, it.notes)
+                for i, it in enumerate(template.items)
+            ],
+        )
+
+    # --- Bulk import --------------------------------------------------------
+
+    # Everything on the hot log tables that a row-by-row load would keep
+    # updating: secondary indexes, and the search tables with their triggers
+    _BULK_INDEXES = (
+        "idx_foods_date", "idx_foods_date_macros", "idx_foods_uuid", "idx_foods_rev",
+        "idx_workouts_date", "idx_workouts_uuid", "idx_workouts_rev",
+    )
+    _BULK_TRIGGERS = tuple(
+        f"{table}_fts_{op}" for table in ("foods", "workouts") for op in ("ai", "ad", "au")
+    )
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Defer index and full-text upkeep on the hot tables during an import.
+
+        The secondary indexes, search triggers and search tables are dropped
+        on entry. On exit they are created again, each in one pass over the
+        loaded rows, and the search tables are rebuilt. Durability is relaxed
+        (``synchronous = OFF``) meanwhile, so only use this on a database
+        nothing else is using.
+        """
+        self._conn.commit()
+        for name in self._BULK_TRIGGERS:
+            self._conn.execute(f"DROP TRIGGER IF EXISTS main.{name}")
+        for name in self._BULK_INDEXES:
+            self._conn.execute(f"DROP INDEX IF EXISTS main.{name}")
+        self._conn.execute("DROP TABLE IF EXISTS main.foods_fts")
+        self._conn.execute("DROP TABLE IF EXISTS main.workouts_fts")
+        self._conn.commit()
+        synchronous = self._conn.execute("PRAGMA main.synchronous").fetchone()[0]
+        self._conn.execute("PRAGMA main.synchronous = OFF")
+        try:
+            yield
+        finally:
+            self._conn.commit()
+            self._conn.execute(f"PRAGMA main.synchronous = {int(synchronous)}")
+            self._create_log_tables("main")
+            self._conn.commit()
+
+    def import_rows(self, table: str, entries: Iterable, batch_size: int = 50_000) -> int:
+        """Insert foods or workouts into the hot ``table`` in large batches.
+
+        Rows go in with ``executemany``, one transaction per ``batch_size``
+        rows, keeping ``entry.id`` when it is set. Nothing is published on
+        the bus and rows are not routed to archives; run
+        :meth:`archive_closed_years` afterwards. Returns the row count.
+        """
+        if table == "foods":
+            columns, values = self._FOOD_COPY_COLUMNS, self._food_values
+        elif table == "workouts":
+            columns, values = self._WORKOUT_COPY_COLUMNS, self._workout_values
+        else:
+            raise ValueError(f"unknown table '{table}'")
+        # id and the entry's own values; SQLite generates the uuid
+        marks = ", ".join("?" * (len(columns.split(",")) - 2))
+        sql = (
+            f"INSERT INTO main.{table} (id, {columns}) "
+            f"VALUES ({marks}, lower(hex(randomblob(16))), ?, ?)"
+        )
+
+        origin = self._device_id()
+        total = 0
+        batch: list = []
+        for e in entries:
+            batch.append((e.id, *values(e)))
+            if len(batch) >= batch_size:
+                total += self._import_batch(sql, batch, origin)
+                batch = []
+        if batch:
+            total += self._import_batch(sql, batch, origin)
+        return total
+
+    def _import_batch(self, sql: str, batch: list, origin: str) -> int:
+        try:
+            rev = self._tick()
+            self._conn.executemany(sql, [(*row, rev, origin) for row in batch])
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            raise
+        return len(batch)
+
+    # --- Undo / redo --------------------------------------------------------
+
+    def _begin_step(self) -> Optional[int]:
+        """Open a journal step for one user-visible change (None if off).
+
+        Call inside the change's transaction. Anything that could still be
+        redone is dropped, as are steps beyond the retention limit.
+        """
+        if self._journal_steps <= 0:
+            return None
+        self._conn.execute("DELETE FROM main.journal WHERE undone = 1")
+        last = self._conn.execute(
+            "SELECT MAX(step) FROM main.journal WHERE undone = 0"
+        ).fetchone()[0]
+        step = (last or 0) + 1
+        self._conn.execute(
+            "DELETE FROM main.journal WHERE undone = 0 AND step <= ?",
+            (step - self._journal_steps,),
+        )
+        return step
+
+    def _journal(self, step: Optional[int], table: str, action: str, rows: list) -> None:
+        """Record ``(uuid, entry)`` pairs as single-row operations of ``step``."""
+        if step is None:
+            return
+        self._conn.executemany(
+            """
+            INSERT INTO main.journal (step, kind, action, uuid, entry)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(step, table, action, key, json.dumps(encode_entry(e))) for key, e in rows],
+        )
+
+    def _delete_journaled(self, schema: str, table: str, row_id: int) -> bool:
+        """Delete a row as its own undo step; False if there was no such row."""
+        columns = self._FOOD_COLUMNS if table == "foods" else self._WORKOUT_COLUMNS
+        from_row = self._food_from_row if table == "foods" else self._workout_from_row
+        row = self._conn.execute(
+            f"SELECT {columns} FROM {schema}.{table} WHERE id = ?", (row_id,)
+        ).fetchone()
+        key = self._delete_row(schema, table, row_id, self._tick())
+        if key is None:
+            return False
+        self._journal(self._begin_step(), table, DELETE, [(key, from_row(row))])
+        return True
+
+    def undo(self) -> Optional[str]:
+        """Reverse the latest journaled step.
+
+        Each operation in the step is undone with one single-row insert or
+        delete. Returns a label such as "delete food 'Pizza'", or None if
+        there is nothing to undo.
+        """
+        return self._replay(undo=True)
+
+    def redo(self) -> Optional[str]:
+        """Apply the most recently undone step again; see :meth:`undo`."""
+        return self._replay(undo=False)
+
+    def _replay(self, undo: bool) -> Optional[str]:
+        if undo:
+            sql = "SELECT MAX(step) FROM main.journal WHERE undone = 0"
+        else:
+            sql = "SELECT MIN(step) FROM main.journal WHERE undone = 1"
+        # A step whose rows have all disappeared since is passed over
+        while True:
+            step = self._conn.execute(sql).fetchone()[0]
+            if step is None:
+                return None
+            ops = self._conn.execute(
+                f"""
+                SELECT id, kind, action, uuid, entry FROM main.journal
+                WHERE step = ? ORDER BY id {"DESC" if undo else "ASC"}
+                """,
+                (step,),
+            ).fetchall()
+            changed = []
+            for op in ops:
+                entry = decode_entry(op["kind"], json.loads(op["entry"]))
+                # Undoing a delete or redoing an add puts the row back
+                if (op["action"] == ADD) != undo:
+                    self._restore_row(op["kind"], op["uuid"], entry)
+                    changed.append(entry)
+                elif self._remove_row(op["kind"], op["uuid"], entry):
+                    changed.append(entry)
+            self._conn.execute(
+                "UPDATE main.journal SET undone = ? WHERE step = ?", (int(undo), step)
             )
+            self._conn.commit()
+            if changed:
+                return describe(ops[0]["kind"], ops[0]["action"], changed)
+
+    def _restore_row(self, table: str, old_key: str, entry) -> None:
+        # A fresh uuid: to sync the row is new, since its old uuid has a
+        # tombstone. Every journaled operation on the row follows it.
+        with self._partition_for(entry.date) as schema:
+            meta = self._new_meta()
+            if table == "foods":
+                self._insert_food(schema, entry, meta)
+            else:
+                self._insert_workout(schema, entry, meta)
+            self._conn.execute(
+                "UPDATE main.journal SET uuid = ? WHERE uuid = ?", (meta[0], old_key)
+            )
+        self.bus.publish(FoodAdded(entry) if table == "foods" else WorkoutAdded(entry))
+
+    def _remove_row(self, table: str, key: str, entry) -> bool:
+        with self._partition_for(entry.date) as schema:
+            row = self._conn.execute(
+                f"SELECT id FROM {schema}.{table} WHERE uuid = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                entry.id = row["id"]
+                self._delete_row(schema, table, row["id"], self._tick())
+        if row is None:
+            return False
+        self.bus.publish(FoodDeleted(entry) if table == "foods" else WorkoutDeleted(entry))
+        return True
+
+    # --- Offline sync -----------------------------------------------------
+
+    def device_id(self) -> str:
+        """Random id naming this database as the origin of its changes."""
+        return self._device_id()
+
+    def change_counter(self) -> int:
+        """Current value of the change counter (the ``until`` of a full export)."""
+        return self._conn.execute("SELECT clock FROM sync_meta WHERE id = 1").fetchone()[0]
+
+    def export_changes(self, since: int = 0) -> dict:
+        """Rows and deletions recorded after change counter ``since``.
+
+        Every row carries a uuid, the device it was created on and the
+        counter value of its last local change; deletions are kept as
+        tombstones. Pass the returned ``until`` as ``since`` next time to
+        export only what changed in between.
+        """
+        until = self.change_counter()
+        foods: List[dict] = []
+        workouts: List[dict] = []
+        for schema in self._partitions():
+            cur = self._conn.execute(
+                f"""
+                SELECT uuid, origin, date, name, calories, protein_g, carbs_g, fat_g, fiber_g
+                FROM {schema}.foods WHERE rev > ? ORDER BY rev, id
+                """,
+                (since,),
+            )
+            foods.extend(dict(row) for row in cur.fetchall())
+            cur = self._conn.execute(
+                f"""
+                SELECT uuid, origin, date, routine_name, completed, notes
+                FROM {schema}.workouts WHERE rev > ? ORDER BY rev, id
+                """,
+                (since,),
+            )
+            for row in cur.fetchall():
+                w = dict(row)
+                w["completed"] = bool(w["completed"])
+                workouts.append(w)
+        cur = self._conn.execute(
+            "SELECT uuid, kind, date, origin FROM tombstones WHERE rev > ? ORDER BY rev",
+            (since,),
+        )
+        tombstones = [dict(row) for row in cur.fetchall()]
+        return {
+            "format": "fitgator-changes",
+            "version": 1,
+            "device": self._device_id(),
+            "since": since,
+            "until": until,
+            "foods": foods,
+            "workouts": workouts,
+            "tombstones": tombstones,
+        }
+
+    def apply_changes(self, bundle: dict) -> Dict[str, int]:
+        """Merge a bundle produced by :meth:`export_changes` on another device.
+
+        Entries are never edited in place, only added or deleted, so merging
+        is a union of rows by uuid in which a deletion always wins: rows
+        already present or already deleted here are skipped. Applied rows
+        get a fresh local change counter so they are passed on by the next
+        export. Returns counts of ``added``, ``deleted`` and ``skipped``.
+        """
+        if bundle.get("format") != "fitgator-changes" or bundle.get("version") != 1:
+            raise ValueError("not a FitGator change bundle")
+
+        stats = {"added": 0, "deleted": 0, "skipped": 0}
+        added: list = []
+        deleted: list = []
+        dead = {t["uuid"] for t in bundle["tombstones"]}
+
+        incoming: Dict[str, list] = {}
+        for kind, rows in (("foods", bundle["foods"]), ("workouts", bundle["workouts"])):
+            for row in rows:
+                if row["uuid"] in dead:
+                    stats["skipped"] += 1
+                    continue
+                incoming.setdefault(self._schema_for(row["date"]), []).append((kind, row))
+        for t in bundle["tombstones"]:
+            incoming.setdefault(self._schema_for(t["date"]), []).append(("tombstone", t))
+
+        for schema in self._partitions():
+            items = incoming.get(schema)
+            if not items:
+                continue
+            rev = self._tick()
+            for kind, row in items:
+                if kind == "tombstone":
+                    entry = self._apply_tombstone(schema, row, rev)
+                    if entry is not None:
+                        deleted.append(entry)
+                        stats["deleted"] += 1
+                    continue
+                if self._known_uuid(schema, kind, row["uuid"]):
+                    stats["skipped"] += 1
+                    continue
+                meta = (row["uuid"], rev, row["origin"])
+                if kind == "foods":
+                    entry = FoodEntry(
+                        date=self._str_to_date(row["date"]),
+                        name=row["name"],
+                        calories=int(row["calories"]),
+                        protein_g=row.get("protein_g", 0.0),
+                        carbs_g=row.get("carbs_g", 0.0),
+                        fat_g=row.get("fat_g", 0.0),
+                        fiber_g=row.get("fiber_g", 0.0),
+                    )
+                    self._insert_food(schema, entry, meta)
+                else:
+                    entry = WorkoutEntry(
+                        date=self._str_to_date(row["date"]),
+                        routine_name=row["routine_name"],
+                        completed=bool(row["completed"]),
+                        notes=row["notes"],
+                    )
+                    self._insert_workout(schema, entry, meta)
+                added.append(entry)
+                stats["added"] += 1
         self._conn.commit()
 
+        for entry in deleted:
+            self.bus.publish(
+                FoodDeleted(entry) if isinstance(entry, FoodEntry) else WorkoutDeleted(entry)
+            )
+        for entry in added:
+            self.bus.publish(
+                FoodAdded(entry) if isinstance(entry, FoodEntry) else WorkoutAdded(entry)
+            )
+        return stats
+
+    def _schema_for(self, date_str: str) -> str:
+        year = int(date_str[:4])
+        return f"archive_{year}" if year in self._archived else "main"
+
+    def _known_uuid(self, schema: str, table: str, row_uuid: str) -> bool:
+        cur = self._conn.execute(
+            f"""
+            SELECT 1 FROM {schema}.{table} WHERE uuid = ?
+            UNION ALL
+            SELECT 1 FROM main.tombstones WHERE uuid = ?
+            """,
+            (row_uuid, row_uuid),
+        )
+        return cur.fetchone() is not None
+
+    def _apply_tombstone(self, schema: str, t: dict, rev: int):
+        """Delete the row a remote tombstone names; returns the deleted entry."""
+        table = t["kind"]
+        if table not in ("foods", "workouts"):
+            raise ValueError(f"unknown tombstone kind '{table}'")
+        columns = self._FOOD_COLUMNS if table == "foods" else self._WORKOUT_COLUMNS
+        row = self._conn.execute(
+            f"SELECT {columns} FROM {schema}.{table} WHERE uuid = ?", (t["uuid"],)
+        ).fetchone()
+        if row is None:
+            # Remember it anyway so a late copy of the row is not resurrected
+            self._conn.execute(
+                """
+                INSERT OR IGNORE INTO main.tombstones (uuid, kind, date, rev, origin)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (t["uuid"], table, t["date"], rev, t["origin"]),
+            )
+            return None
+        entry = self._food_from_row(row) if table == "foods" else self._workout_from_row(row)
+        self._delete_row(schema, table, row["id"], rev)
+        return entry
+
     # --- Extra helper for "Clear Data" feature ----------------------------
 
     def clear_all(self) -> None:
@@ -240,7 +1558,21 @@ class SQLiteRepository:
         cur.execute("DELETE FROM goals")
         cur.execute("DELETE FROM foods")
         cur.execute("DELETE FROM workouts")
+        cur.execute("DELETE FROM tombstones")
+        cur.execute("DELETE FROM journal")
+        cur.execute("DELETE FROM template_items")
+        cur.execute("DELETE FROM templates")
+        for t in default_templates():
+            self._write_template(t)
         self._conn.commit()
+        for year in self._archived:
+            try:
+                os.remove(self._archive_path(year))
+            except OSError:
+                pass
+        self._archived.clear()
+        self._ready.clear()
+        self.bus.publish(DataCleared())
 
     def close(self) -> None:
         try:
@@ -0,0 +1,24 @@
+"""Change bundles for offline sync between two FitGator databases.
+
+A bundle is the dict returned by ``SQLiteRepository.export_changes``. On
+disk it is compact JSON, gzip-compressed when the file name ends in
+``.gz``, so it can be carried over by any file-sharing means.
+"""
+import gzip
+import json
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_changes(bundle: dict, path: str) -> None:
+    with _open(path, "w") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+
+
+def read_changes(path: str) -> dict:
+    with _open(path, "r") as f:
+        return json.load(f)
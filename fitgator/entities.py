@@ -1,10 +1,11 @@
 
-from dataclasses import dataclass
-from typing import Optional, Literal
+from dataclasses import dataclass, field
+from typing import List, Optional, Literal
 from datetime import date
 
 UnitSystem = Literal["metric", "imperial"]
 GoalType = Literal["cut", "maintain", "bulk"]
+TemplateKind = Literal["food", "workout"]
 
 @dataclass
 class UserProfile:
@@ -25,6 +26,13 @@ class FoodEntry:
     date: date
     name: str
     calories: int
+    # Macronutrients in grams; 0 when not recorded
+    protein_g: float = 0.0
+    carbs_g: float = 0.0
+    fat_g: float = 0.0
+    fiber_g: float = 0.0
+    # Storage row id; assigned by the repository, ignored in comparisons
+    id: Optional[int] = field(default=None, compare=False)
 
 @dataclass
 class WorkoutEntry:
@@ -32,3 +40,33 @@ class WorkoutEntry:
     routine_name: str
     completed: bool = False
     notes: str = ""
+    id: Optional[int] = field(default=None, compare=False)
+
+@dataclass
+class MacroTotals:
+    """Summed calories and macros of a day (or any other period)."""
+    calories: int = 0
+    protein_g: float = 0.0
+    carbs_g: float = 0.0
+    fat_g: float = 0.0
+    fiber_g: float = 0.0
+
+@dataclass
+class TemplateItem:
+    """One entry of a template: a food (calories/macros) or a workout (notes)."""
+    name: str
+    calories: int = 0
+    protein_g: float = 0.0
+    carbs_g: float = 0.0
+    fat_g: float = 0.0
+    fiber_g: float = 0.0
+    notes: str = ""
+
+@dataclass
+class Template:
+    """A named meal or workout plan that repeats on a recurrence rule."""
+    name: str
+    kind: TemplateKind
+    items: List[TemplateItem] = field(default_factory=list)
+    # "daily", "weekdays", "weekends" or day names such as "mon,wed,fri"
+    recurrence: str = "daily"
@@ -0,0 +1,110 @@
+"""Typed repository events and a minimal synchronous event bus.
+
+Repositories publish one event per committed mutation. Subscribers get
+the event object itself, so views can apply deltas (e.g. one more food
+entry) instead of recomputing everything from storage.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Type, TypeVar
+
+from .entities import FoodEntry, Goal, UserProfile, WorkoutEntry
+
+
+@dataclass(frozen=True)
+class Event:
+    pass
+
+
+@dataclass(frozen=True)
+class FoodAdded(Event):
+    entry: FoodEntry
+
+
+@dataclass(frozen=True)
+class FoodsAdded(Event):
+    """Several entries added in one batch (``add_foods``)."""
+    entries: List[FoodEntry]
+
+
+@dataclass(frozen=True)
+class FoodDeleted(Event):
+    entry: FoodEntry
+
+
+@dataclass(frozen=True)
+class FoodsReplaced(Event):
+    """The whole food log was rewritten (``save_foods``)."""
+    foods: List[FoodEntry]
+
+
+@dataclass(frozen=True)
+class WorkoutAdded(Event):
+    entry: WorkoutEntry
+
+
+@dataclass(frozen=True)
+class WorkoutsAdded(Event):
+    """Several workouts added in one batch (``add_workouts``)."""
+    entries: List[WorkoutEntry]
+
+
+@dataclass(frozen=True)
+class WorkoutDeleted(Event):
+    entry: WorkoutEntry
+
+
+@dataclass(frozen=True)
+class WorkoutsReplaced(Event):
+    """The whole workout log was rewritten (``save_workouts``)."""
+    workouts: List[WorkoutEntry]
+
+
+@dataclass(frozen=True)
+class ProfileSaved(Event):
+    profile: UserProfile
+
+
+@dataclass(frozen=True)
+class GoalSaved(Event):
+    goal: Goal
+
+
+@dataclass(frozen=True)
+class TemplatesChanged(Event):
+    """A meal/workout template was saved or deleted."""
+
+
+@dataclass(frozen=True)
+class DataCleared(Event):
+    pass
+
+
+E = TypeVar("E", bound=Event)
+Handler = Callable[[E], None]
+
+
+class EventBus:
+    """Dispatch events to handlers subscribed to their type (or a base type).
+
+    Handlers run synchronously, in subscription order, on the publishing
+    thread.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: Dict[Type[Event], List[Callable]] = {}
+
+    def subscribe(self, event_type: Type[E], handler: Callable[[E], None]) -> Callable[[], None]:
+        """Register ``handler``; returns a function that unsubscribes it."""
+        self._handlers.setdefault(event_type, []).append(handler)
+
+        def unsubscribe() -> None:
+            handlers = self._handlers.get(event_type, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+        return unsubscribe
+
+    def publish(self, event: Event) -> None:
+        for cls in type(event).__mro__:
+            for handler in list(self._handlers.get(cls, ())):
+                handler(event)
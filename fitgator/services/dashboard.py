@@ -1,11 +1,29 @@
 
+from dataclasses import astuple
 from datetime import date
-from typing import List, Dict
-from ..entities import UserProfile, FoodEntry, WorkoutEntry
+from typing import Dict, Iterable, Optional, Tuple
+from ..entities import UserProfile, FoodEntry, MacroTotals, WorkoutEntry
+from ..events import (
+    DataCleared,
+    EventBus,
+    FoodAdded,
+    FoodDeleted,
+    FoodsAdded,
+    FoodsReplaced,
+    GoalSaved,
+    ProfileSaved,
+    WorkoutAdded,
+    WorkoutDeleted,
+    WorkoutsAdded,
+    WorkoutsReplaced,
+)
+from .macros import MacroTargets, add_entry, macro_targets
 from .tdee import goal_adjusted_calories
+from .tracker import workouts_completed
 
-def daily_summary(profile: UserProfile, goal: str, foods: List[FoodEntry], workouts: List[WorkoutEntry]) -> Dict[str, int]:
-    today = date.today()
+def daily_summary(profile: UserProfile, goal: str, foods: Iterable[FoodEntry], workouts: Iterable[WorkoutEntry],
+                  day: Optional[date] = None) -> Dict[str, int]:
+    today = day or date.today()
     target = goal_adjusted_calories(profile, goal)
     consumed = sum(e.calories for e in foods if e.date == today)
     completed = sum(1 for w in workouts if w.date == today and w.completed)
@@ -15,3 +33,128 @@ def daily_summary(profile: UserProfile, goal: str, foods: List[FoodEntry], worko
         "remaining_calories": max(0, target - consumed),
         "workouts_completed": completed
     }
+
+def stream_daily_summary(repo, day: Optional[date] = None) -> Optional[Dict[str, int]]:
+    """:func:`daily_summary` over the repository's streaming iterators.
+
+    Only ``day`` is read from storage, one batch at a time. Returns None
+    until a profile and goal are saved.
+    """
+    day = day or date.today()
+    profile = repo.load_profile()
+    goal = repo.load_goal()
+    if not (profile and goal):
+        return None
+    return daily_summary(
+        profile, goal.goal_type, repo.iter_foods(day, day), repo.iter_workouts(day, day), day=day
+    )
+
+class DashboardModel:
+    """Today's dashboard numbers, kept current from repository events.
+
+    Adds and deletes adjust the running totals (calories and macros) by
+    one entry. The calorie and macro targets are memoized on the profile
+    values and goal type, so saving an unchanged profile does not
+    recompute them.
+    """
+
+    def __init__(self, bus: EventBus, day: Optional[date] = None) -> None:
+        self.day = day or date.today()
+        self.profile: Optional[UserProfile] = None
+        self.goal_type: Optional[str] = None
+        self.consumed = 0
+        self.macros = MacroTotals()
+        self.workouts_completed = 0
+        self._target: Optional[int] = None
+        self._macro_targets: Optional[MacroTargets] = None
+        self._target_key: Optional[Tuple] = None
+        self.target_computations = 0
+
+        bus.subscribe(FoodAdded, lambda e: self._apply_food(e.entry, +1))
+        bus.subscribe(FoodDeleted, lambda e: self._apply_food(e.entry, -1))
+        bus.subscribe(WorkoutAdded, lambda e: self._apply_workout(e.entry, +1))
+        bus.subscribe(WorkoutDeleted, lambda e: self._apply_workout(e.entry, -1))
+        bus.subscribe(FoodsAdded, lambda e: self._apply_many(e.entries, self._apply_food))
+        bus.subscribe(WorkoutsAdded, lambda e: self._apply_many(e.entries, self._apply_workout))
+        bus.subscribe(FoodsReplaced, lambda e: self._set_foods(e.foods))
+        bus.subscribe(WorkoutsReplaced, lambda e: self._set_workouts(e.workouts))
+        bus.subscribe(ProfileSaved, lambda e: setattr(self, "profile", e.profile))
+        bus.subscribe(GoalSaved, lambda e: setattr(self, "goal_type", e.goal.goal_type))
+        bus.subscribe(DataCleared, lambda e: self.reset(None, None, [], []))
+
+    def reset(
+        self,
+        profile: Optional[UserProfile],
+        goal_type: Optional[str],
+        foods: Iterable[FoodEntry],
+        workouts: Iterable[WorkoutEntry],
+        day: Optional[date] = None,
+    ) -> None:
+        """Recompute everything, e.g. at startup or when the day rolls over."""
+        if day is not None:
+            self.day = day
+        self.profile = profile
+        self.goal_type = goal_type
+        self._set_foods(foods)
+        self._set_workouts(workouts)
+
+    @property
+    def ready(self) -> bool:
+        return self.profile is not None and self.goal_type is not None
+
+    def _refresh_targets(self) -> None:
+        key = (astuple(self.profile), self.goal_type)
+        if key != self._target_key:
+            self._target = goal_adjusted_calories(self.profile, self.goal_type)
+            self._macro_targets = macro_targets(self.profile, self.goal_type)
+            self._target_key = key
+            self.target_computations += 1
+
+    @property
+    def target(self) -> int:
+        if not self.ready:
+            return 0
+        self._refresh_targets()
+        return self._target
+
+    @property
+    def macro_targets(self) -> Optional[MacroTargets]:
+        """Daily macro targets, or None until a profile and goal are set."""
+        if not self.ready:
+            return None
+        self._refresh_targets()
+        return self._macro_targets
+
+    def summary(self) -> Dict[str, int]:
+        """Same keys as :func:`daily_summary`."""
+        target = self.target
+        return {
+            "target_calories": target,
+            "consumed_calories": self.consumed,
+            "remaining_calories": max(0, target - self.consumed),
+            "workouts_completed": self.workouts_completed,
+        }
+
+    def _apply_food(self, entry: FoodEntry, sign: int) -> None:
+        if entry.date == self.day:
+            add_entry(self.macros, entry, sign)
+            self.consumed = self.macros.calories
+
+    def _apply_workout(self, entry: WorkoutEntry, sign: int) -> None:
+        if entry.date == self.day and entry.completed:
+            self.workouts_completed += sign
+
+    @staticmethod
+    def _apply_many(entries, apply) -> None:
+        for entry in entries:
+            apply(entry, +1)
+
+    def _set_foods(self, foods: Iterable[FoodEntry]) -> None:
+        self.macros = MacroTotals()
+        for f in foods:
+            if f.date == self.day:
+                add_entry(self.macros, f)
+        self.consumed = self.macros.calories
+
+    def _set_workouts(self, workouts: Iterable[WorkoutEntry]) -> None:
+        self.workouts_completed = workouts_completed(workouts, self.day)
@@ -0,0 +1,48 @@
+"""Reduce a long (x, y) series to about as many points as can be drawn.
+
+:func:`lttb` (Largest-Triangle-Three-Buckets) expects points sorted by x,
+always keeps the first and last point, and picks the points that best
+preserve the visual shape of the line.
+"""
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Downsample ``points`` to at most ``threshold`` points."""
+    n = len(points)
+    if threshold >= n or n <= 2:
+        return list(points)
+    if threshold < 3:
+        return [points[0], points[-1]]
+
+    out = [points[0]]
+    # Middle points are split into threshold - 2 buckets of equal count
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        stop = int((i + 1) * every) + 1
+        # Average of the next bucket is the third corner of the triangle
+        nxt_start = stop
+        nxt_stop = min(int((i + 2) * every) + 1, n)
+        if nxt_start >= n - 1 or i == threshold - 3:
+            avg_x, avg_y = points[-1]
+        else:
+            span = nxt_stop - nxt_start
+            avg_x = sum(p[0] for p in points[nxt_start:nxt_stop]) / span
+            avg_y = sum(p[1] for p in points[nxt_start:nxt_stop]) / span
+
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out.append(points[best])
+        a = best
+    out.append(points[-1])
+    return out
+
@@ -0,0 +1,29 @@
+
+import csv
+from typing import Iterable
+from ..entities import FoodEntry, WorkoutEntry
+
+CSV_HEADER = [
+    "type", "date", "name", "calories", "completed", "notes",
+    "protein_g", "carbs_g", "fat_g", "fiber_g",
+]
+
+def write_csv(path: str, foods: Iterable[FoodEntry], workouts: Iterable[WorkoutEntry]) -> int:
+    """Write foods and workouts to a single CSV file. Returns the row count."""
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for food in foods:
+            writer.writerow(
+                ["food", food.date.isoformat(), food.name, food.calories, "", "",
+                 food.protein_g, food.carbs_g, food.fat_g, food.fiber_g]
+            )
+            rows += 1
+        for w in workouts:
+            writer.writerow(
+                ["workout", w.date.isoformat(), w.routine_name, "", "yes" if w.completed else "no", w.notes,
+                 "", "", "", ""]
+            )
+            rows += 1
+    return rows
@@ -0,0 +1,110 @@
+"""Random access by row number over a date range of foods or workouts.
+
+List views only need the rows currently on screen. ``PagedHistory`` keeps
+just the per-day entry counts for the range, which is enough to map a row
+offset to a date, and loads the rows themselves with range queries.
+"""
+from bisect import bisect_right, insort
+from datetime import date
+from itertools import accumulate
+from typing import List, Optional
+
+FOODS = "foods"
+WORKOUTS = "workouts"
+
+
+class PagedHistory:
+    """Entries of one kind dated within [start, end], in (date, id) order.
+
+    Offsets rely on the repository returning ranges in that order.
+    """
+
+    def __init__(self, repo, kind: str, start: Optional[date], end: Optional[date]) -> None:
+        if kind not in (FOODS, WORKOUTS):
+            raise ValueError(f"unknown kind '{kind}'")
+        self._repo = repo
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read the per-day counts, e.g. after a bulk rewrite."""
+        if self.kind == FOODS:
+            counts = self._repo.count_foods_by_day(self.start, self.end)
+        else:
+            counts = self._repo.count_workouts_by_day(self.start, self.end)
+        self._days: List[date] = sorted(counts)
+        self._counts: List[int] = [counts[d] for d in self._days]
+        self._reindex()
+
+    def _reindex(self) -> None:
+        # _ends[i] is the row offset just past the last entry of _days[i]
+        self._ends: List[int] = list(accumulate(self._counts))
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def _day_start(self, i: int) -> int:
+        return self._ends[i - 1] if i else 0
+
+    def _load(self, first: date, last: date) -> list:
+        if self.kind == FOODS:
+            return self._repo.load_foods_range(first, last)
+        return self._repo.load_workouts_range(first, last)
+
+    def rows(self, offset: int, limit: int) -> list:
+        """Entries ``offset`` .. ``offset + limit - 1`` of the range."""
+        total = len(self)
+        offset = max(0, offset)
+        stop = min(total, offset + limit)
+        if offset >= stop:
+            return []
+        first = bisect_right(self._ends, offset)
+        last = bisect_right(self._ends, stop - 1)
+        entries = self._load(self._days[first], self._days[last])
+        skip = offset - self._day_start(first)
+        return entries[skip:skip + (stop - offset)]
+
+    def _in_range(self, d: date) -> bool:
+        return (self.start is None or d >= self.start) and (self.end is None or d <= self.end)
+
+    def insert(self, entry) -> Optional[int]:
+        """Account for a newly stored entry; returns its row offset.
+
+        New entries sort last within their day. Returns None when the entry
+        is outside the range.
+        """
+        if not self._in_range(entry.date):
+            return None
+        i = bisect_right(self._days, entry.date) - 1
+        if i < 0 or self._days[i] != entry.date:
+            insort(self._days, entry.date)
+            i = self._days.index(entry.date)
+            self._counts.insert(i, 0)
+        self._counts[i] += 1
+        self._reindex()
+        return self._ends[i] - 1
+
+    def remove(self, entry) -> Optional[int]:
+        """Account for a deleted entry; returns the row offset it had.
+
+        Returns None when the entry is outside the range or its position
+        cannot be determined, in which case the counts are reloaded.
+        """
+        if not self._in_range(entry.date):
+            return None
+        i = bisect_right(self._days, entry.date) - 1
+        if i < 0 or self._days[i] != entry.date or entry.id is None:
+            self.reload()
+            return None
+        # Rows within a day are ordered by id, and the entry is already gone
+        remaining = self._load(entry.date, entry.date)
+        before = sum(1 for r in remaining if r.id is not None and r.id < entry.id)
+        index = self._day_start(i) + before
+        self._counts[i] -= 1
+        if not self._counts[i]:
+            del self._days[i]
+            del self._counts[i]
+        self._reindex()
+        return index
@@ -0,0 +1,66 @@
+"""Macronutrient targets and rollups."""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Mapping
+
+from ..entities import FoodEntry, MacroTotals, UserProfile
+from .tdee import goal_adjusted_calories
+
+KCAL_PER_G_PROTEIN = 4
+KCAL_PER_G_CARBS = 4
+KCAL_PER_G_FAT = 9
+FIBER_G_PER_1000_KCAL = 14
+
+# Share of calories from (protein, carbs, fat) for each goal type
+MACRO_SPLITS = {
+    "cut": (0.40, 0.30, 0.30),  # high protein to keep muscle in a deficit
+    "maintain": (0.30, 0.40, 0.30),
+    "bulk": (0.25, 0.50, 0.25),
+}
+
+MACRO_FIELDS = ("protein_g", "carbs_g", "fat_g", "fiber_g")
+
+
+@dataclass
+class MacroTargets:
+    calories: int
+    protein_g: int
+    carbs_g: int
+    fat_g: int
+    fiber_g: int
+
+
+def macro_targets(profile: UserProfile, goal: str) -> MacroTargets:
+    """Daily gram targets from the goal-adjusted calories and goal type."""
+    calories = goal_adjusted_calories(profile, goal)
+    protein, carbs, fat = MACRO_SPLITS.get(goal, MACRO_SPLITS["maintain"])
+    return MacroTargets(
+        calories=calories,
+        protein_g=int(round(calories * protein / KCAL_PER_G_PROTEIN)),
+        carbs_g=int(round(calories * carbs / KCAL_PER_G_CARBS)),
+        fat_g=int(round(calories * fat / KCAL_PER_G_FAT)),
+        fiber_g=int(round(calories / 1000 * FIBER_G_PER_1000_KCAL)),
+    )
+
+
+def add_entry(totals: MacroTotals, entry: FoodEntry, sign: int = 1) -> None:
+    """Add (or with ``sign=-1`` remove) one food entry from ``totals``."""
+    totals.calories += sign * entry.calories
+    for name in MACRO_FIELDS:
+        setattr(totals, name, getattr(totals, name) + sign * getattr(entry, name))
+
+
+def week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def weekly_totals(daily: Mapping[date, MacroTotals]) -> Dict[date, MacroTotals]:
+    """Fold per-day totals into Monday-starting weeks."""
+    weeks: Dict[date, MacroTotals] = {}
+    for d in sorted(daily):
+        week = weeks.setdefault(week_start(d), MacroTotals())
+        day = daily[d]
+        week.calories += day.calories
+        for name in MACRO_FIELDS:
+            setattr(week, name, getattr(week, name) + getattr(day, name))
+    return weeks
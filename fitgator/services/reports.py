@@ -0,0 +1,211 @@
+"""Monthly and yearly "year in review" reports.
+
+The history is split into calendar months. Each month is aggregated
+independently into a small :class:`MonthPartial`, in parallel worker
+processes that each open their own read-only SQLite connection. The
+partials are then merged in month order, so the result does not depend
+on which worker finished first.
+"""
+import csv
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOP_FOODS = 5
+
+
+@dataclass
+class MonthPartial:
+    year: int
+    month: int
+    calories: int = 0
+    food_entries: int = 0
+    workouts_logged: int = 0
+    workouts_completed: int = 0
+    # Day ordinals; at most 31 each, so cheap to ship between processes
+    logged_days: List[int] = field(default_factory=list)
+    workout_days: List[int] = field(default_factory=list)
+    food_counts: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class PeriodStats:
+    period: str  # "YYYY-MM" or "YYYY"
+    calories: int
+    food_entries: int
+    days_logged: int
+    avg_daily_calories: float
+    workouts_logged: int
+    workouts_completed: int
+    best_logging_streak: int
+    best_workout_streak: int
+    top_foods: List[Tuple[str, int]]
+
+
+@dataclass
+class Report:
+    months: List[PeriodStats]
+    years: List[PeriodStats]
+
+
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    first = date(year, month, 1)
+    nxt = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first, date.fromordinal(nxt.toordinal() - 1)
+
+
+def month_partial(repo, year: int, month: int) -> MonthPartial:
+    """Aggregate one month of ``repo`` in a single streaming pass."""
+    start, end = _month_bounds(year, month)
+    part = MonthPartial(year, month)
+    logged = set()
+    trained = set()
+    counts: Counter = Counter()
+    for f in repo.iter_foods(start, end, batch_size=2000):
+        part.calories += f.calories
+        part.food_entries += 1
+        logged.add(f.date.toordinal())
+        counts[f.name] += 1
+    for w in repo.iter_workouts(start, end, batch_size=2000):
+        part.workouts_logged += 1
+        if w.completed:
+            part.workouts_completed += 1
+            trained.add(w.date.toordinal())
+    part.logged_days = sorted(logged)
+    part.workout_days = sorted(trained)
+    part.food_counts = dict(counts)
+    return part
+
+
+def _longest_streak(days: Iterable[int]) -> int:
+    best = run = 0
+    prev = None
+    for d in sorted(days):
+        run = run + 1 if prev is not None and d == prev + 1 else 1
+        best = max(best, run)
+        prev = d
+    return best
+
+
+def _stats(period: str, parts: List[MonthPartial]) -> PeriodStats:
+    counts: Counter = Counter()
+    logged: List[int] = []
+    trained: List[int] = []
+    for p in parts:
+        counts.update(p.food_counts)
+        logged.extend(p.logged_days)
+        trained.extend(p.workout_days)
+    calories = sum(p.calories for p in parts)
+    top = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:TOP_FOODS]
+    return PeriodStats(
+        period=period,
+        calories=calories,
+        food_entries=sum(p.food_entries for p in parts),
+        days_logged=len(logged),
+        avg_daily_calories=round(calories / len(logged), 1) if logged else 0.0,
+        workouts_logged=sum(p.workouts_logged for p in parts),
+        workouts_completed=sum(p.workouts_completed for p in parts),
+        best_logging_streak=_longest_streak(logged),
+        best_workout_streak=_longest_streak(trained),
+        top_foods=top,
+    )
+
+
+def merge_partials(parts: Iterable[MonthPartial]) -> Report:
+    """Combine month partials into monthly and yearly stats, in date order."""
+    ordered = sorted(parts, key=lambda p: (p.year, p.month))
+    months = [_stats(f"{p.year:04d}-{p.month:02d}", [p]) for p in ordered]
+    by_year: Dict[int, List[MonthPartial]] = {}
+    for p in ordered:
+        by_year.setdefault(p.year, []).append(p)
+    years = [_stats(f"{y:04d}", ps) for y, ps in by_year.items()]
+    return Report(months=months, years=years)
+
+
+def history_months(repo, year: Optional[int] = None) -> List[Tuple[int, int]]:
+    """(year, month) pairs that have any food or workout entries."""
+    start = date(year, 1, 1) if year else None
+    end = date(year, 12, 31) if year else None
+    days = set(repo.count_foods_by_day(start, end)) | set(repo.count_workouts_by_day(start, end))
+    return sorted({(d.year, d.month) for d in days})
+
+
+def build_report_from_repo(repo, year: Optional[int] = None) -> Report:
+    """Build a report in-process over any repository backend."""
+    return merge_partials(month_partial(repo, y, m) for y, m in history_months(repo, year))
+
+
+# --- parallel path over a SQLite database ----------------------------------
+
+_worker_repo = None
+
+
+def _init_worker(db_path: str) -> None:
+    global _worker_repo
+    from ..data.sqlite_repo import SQLiteRepository
+
+    _worker_repo = SQLiteRepository(db_path, verbose=False, read_only=True)
+
+
+def _worker_month(year_month: Tuple[int, int]) -> MonthPartial:
+    return month_partial(_worker_repo, *year_month)
+
+
+def build_report(db_path: str, year: Optional[int] = None, workers: Optional[int] = None) -> Report:
+    """Build a report for a SQLite database, one month per pool task.
+
+    ``workers`` defaults to the CPU count. With a single worker, or a
+    single month of history, everything runs in this process.
+    """
+    from ..data.sqlite_repo import SQLiteRepository
+
+    repo = SQLiteRepository(db_path, verbose=False, read_only=True)
+    try:
+        months = history_months(repo, year)
+        workers = min(workers or os.cpu_count() or 1, len(months))
+        if workers <= 1:
+            return merge_partials(month_partial(repo, y, m) for y, m in months)
+    finally:
+        repo.close()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(db_path,)
+    ) as pool:
+        parts = list(pool.map(_worker_month, months))
+    return merge_partials(parts)
+
+
+# --- output -----------------------------------------------------------------
+
+_CSV_FIELDS = [
+    "period",
+    "calories",
+    "food_entries",
+    "days_logged",
+    "avg_daily_calories",
+    "workouts_logged",
+    "workouts_completed",
+    "best_logging_streak",
+    "best_workout_streak",
+    "top_foods",
+]
+
+
+def write_report_csv(report: Report, path: str) -> None:
+    """One row per month followed by one row per year."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(_CSV_FIELDS)
+        for stats in report.months + report.years:
+            row = asdict(stats)
+            row["top_foods"] = "; ".join(f"{name} ({n})" for name, n in stats.top_foods)
+            writer.writerow([row[k] for k in _CSV_FIELDS])
+
+
+def write_report_json(report: Report, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(asdict(report), f, indent=2)
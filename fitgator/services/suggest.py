@@ -0,0 +1,85 @@
+"""Food name autocomplete from the user's own history."""
+from bisect import bisect_left, insort
+from datetime import timedelta
+from typing import Dict, Generator, List
+
+from ..entities import FoodEntry
+
+# Days of history loaded per step while building the index
+BUILD_WINDOW_DAYS = 92
+
+
+def _key(name: str) -> str:
+    return name.strip().lower()
+
+
+class FoodSuggestions:
+    """Previously logged foods, matched by case-insensitive name prefix.
+
+    Each name keeps how often it was logged and its most recent entry, so
+    picking a suggestion can fill in the calories and macros as well.
+    Matches come most frequently logged first.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._latest: Dict[str, FoodEntry] = {}
+        self._keys: List[str] = []  # sorted, for prefix lookups
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, entry: FoodEntry, newest: bool = True) -> None:
+        """Count one entry; ``newest=False`` keeps an already known latest entry."""
+        key = _key(entry.name)
+        if not key:
+            return
+        if key not in self._counts:
+            self._counts[key] = 0
+            insort(self._keys, key)
+        self._counts[key] += 1
+        if newest or key not in self._latest:
+            self._latest[key] = entry
+
+    def remove(self, entry: FoodEntry) -> None:
+        key = _key(entry.name)
+        if key not in self._counts:
+            return
+        self._counts[key] -= 1
+        if self._counts[key] <= 0:
+            del self._counts[key]
+            del self._latest[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def match(self, prefix: str, limit: int = 8) -> List[FoodEntry]:
+        prefix = _key(prefix)
+        if not prefix:
+            return []
+        found = []
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and self._keys[i].startswith(prefix):
+            found.append(self._keys[i])
+            i += 1
+        found.sort(key=lambda k: (-self._counts[k], k))
+        return [self._latest[k] for k in found[:limit]]
+
+
+def build_suggestions(
+    repo, window_days: int = BUILD_WINDOW_DAYS
+) -> Generator[None, None, FoodSuggestions]:
+    """Index every stored food, newest first, yielding after each window.
+
+    Meant to run as an idle task; the finished :class:`FoodSuggestions`
+    is the generator's return value.
+    """
+    index = FoodSuggestions()
+    days = repo.count_foods_by_day(None, None)
+    if days:
+        first, end = min(days), max(days)
+        while end >= first:
+            start = max(first, end - timedelta(days=window_days - 1))
+            for f in reversed(repo.load_foods_range(start, end)):
+                index.add(f, newest=False)
+            yield
+            end = start - timedelta(days=1)
+    return index
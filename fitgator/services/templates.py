@@ -0,0 +1,104 @@
+"""Recurring meal and workout templates.
+
+A template's ``recurrence`` names the weekdays it applies to: ``daily``,
+``weekdays``, ``weekends`` or a comma-separated list of day names such as
+``mon,wed,fri``. Expanding a template over a date range yields one entry
+per item per matching day, which :func:`apply_template` stores with a
+single batched insert.
+"""
+from datetime import date, timedelta
+from typing import FrozenSet, Iterator, List, Tuple
+
+from ..entities import FoodEntry, Template, WorkoutEntry
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+FULL_DAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+RECURRENCE_PRESETS = {
+    "daily": frozenset(range(7)),
+    "weekdays": frozenset(range(5)),
+    "weekends": frozenset({5, 6}),
+}
+
+# Longest range one call may expand, to catch typos like a year of 2204
+MAX_PLAN_DAYS = 366
+
+
+def parse_recurrence(rule: str) -> FrozenSet[int]:
+    """Weekday numbers (Monday = 0) selected by ``rule``."""
+    rule = rule.strip().lower()
+    if rule in RECURRENCE_PRESETS:
+        return RECURRENCE_PRESETS[rule]
+    days = set()
+    for part in rule.split(","):
+        name = part.strip()
+        # Exact abbreviations or full names only, so "monster" is no Monday
+        if name in DAY_NAMES:
+            days.add(DAY_NAMES.index(name))
+        elif name in FULL_DAY_NAMES:
+            days.add(FULL_DAY_NAMES.index(name))
+        else:
+            raise ValueError(
+                f"invalid recurrence '{rule}': use daily, weekdays, weekends or "
+                "day names like mon,wed,fri"
+            )
+    return frozenset(days)
+
+
+def occurrences(rule: str, start: date, end: date) -> Iterator[date]:
+    """Days in [start, end] on which ``rule`` applies."""
+    weekdays = parse_recurrence(rule)
+    if (end - start).days + 1 > MAX_PLAN_DAYS:
+        raise ValueError(f"cannot plan more than {MAX_PLAN_DAYS} days at once")
+    d = start
+    while d <= end:
+        if d.weekday() in weekdays:
+            yield d
+        d += timedelta(days=1)
+
+
+def expand(
+    template: Template, start: date, end: date, completed: bool = False
+) -> Tuple[List[FoodEntry], List[WorkoutEntry]]:
+    """Concrete entries for ``template`` on every matching day in [start, end].
+
+    Workouts are created as not yet completed unless ``completed`` is set.
+    """
+    foods: List[FoodEntry] = []
+    workouts: List[WorkoutEntry] = []
+    for d in occurrences(template.recurrence, start, end):
+        for it in template.items:
+            if template.kind == "food":
+                foods.append(
+                    FoodEntry(
+                        date=d,
+                        name=it.name,
+                        calories=it.calories,
+                        protein_g=it.protein_g,
+                        carbs_g=it.carbs_g,
+                        fat_g=it.fat_g,
+                        fiber_g=it.fiber_g,
+                    )
+                )
+            else:
+                workouts.append(
+                    WorkoutEntry(date=d, routine_name=it.name, completed=completed, notes=it.notes)
+                )
+    return foods, workouts
+
+
+def apply_template(repo, template: Template, start: date, end: date, completed: bool = False) -> int:
+    """Expand ``template`` into ``repo`` in one batch; returns the entry count."""
+    foods, workouts = expand(template, start, end, completed)
+    if foods:
+        repo.add_foods(foods)
+    if workouts:
+        repo.add_workouts(workouts)
+    return len(foods) + len(workouts)
+
+
+def find_template(repo, name: str) -> Template:
+    for t in repo.load_templates():
+        if t.name == name:
+            return t
+    raise KeyError(f"no template named '{name}'")
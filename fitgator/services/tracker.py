@@ -1,10 +1,38 @@
 
-from typing import List
+from typing import Iterable, Iterator, Tuple
 from ..entities import FoodEntry, WorkoutEntry
 from datetime import date
 
-def calories_for_day(entries: List[FoodEntry], d: date) -> int:
+def calories_for_day(entries: Iterable[FoodEntry], d: date) -> int:
     return sum(e.calories for e in entries if e.date == d)
 
-def workouts_completed(entries: List[WorkoutEntry], d: date) -> int:
+def workouts_completed(entries: Iterable[WorkoutEntry], d: date) -> int:
     return sum(1 for e in entries if e.date == d and e.completed)
+
+def daily_calorie_totals(entries: Iterable[FoodEntry]) -> Iterator[Tuple[date, int]]:
+    """Stream (day, total calories) pairs from date-ordered entries.
+
+    Holds one running total at a time, so it runs in constant memory over
+    ``Repository.iter_foods``.
+    """
+    day, total = None, 0
+    for e in entries:
+        if e.date != day:
+            if day is not None:
+                yield day, total
+            day, total = e.date, 0
+        total += e.calories
+    if day is not None:
+        yield day, total
+
+def daily_workout_counts(entries: Iterable[WorkoutEntry]) -> Iterator[Tuple[date, int]]:
+    """Stream (day, completed workouts) pairs from date-ordered entries."""
+    day, count = None, 0
+    for e in entries:
+        if e.date != day:
+            if day is not None:
+                yield day, count
+            day, count = e.date, 0
+        count += 1 if e.completed else 0
+    if day is not None:
+        yield day, count
@@ -0,0 +1,94 @@
+import os
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from fitgator.cli import main
+from fitgator.data.backup import backup_database, list_backups, restore_backup, verify_backup
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry
+
+def _repo(path):
+    return SQLiteRepository(str(path), verbose=False, auto_archive=False)
+
+def test_backup_copies_archives_and_rotates(tmp_path):
+    db = tmp_path / "fit.db"
+    repo = _repo(db)
+    repo.add_food(FoodEntry(date(2022, 1, 1), "Old", 1))
+    repo.add_food(FoodEntry(date(2024, 1, 1), "New", 2))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+
+    dest = str(tmp_path / "backups")
+    paths = [
+        backup_database(str(db), dest, keep=2, now=datetime(2024, 6, day))
+        for day in (1, 2, 3)
+    ]
+    assert list_backups(str(db), dest) == paths[:0:-1]
+    assert (tmp_path / "backups" / "fit-20240603-000000" / "fit.2022.db").exists()
+    assert verify_backup(paths[-1])
+    repo.close()
+
+def test_backup_runs_while_another_thread_writes(tmp_path):
+    db = tmp_path / "fit.db"
+    repo = _repo(db)
+    repo.save_foods([FoodEntry(date(2024, 1, 1), f"f{i}", i) for i in range(3000)])
+    repo.close()
+
+    def write():
+        writer = _repo(db)
+        for i in range(50):
+            writer.add_food(FoodEntry(date(2024, 2, 1), "late", i))
+        writer.close()
+
+    t = threading.Thread(target=write)
+    t.start()
+    path = backup_database(str(db), str(tmp_path / "b"))
+    t.join()
+    assert verify_backup(path)
+
+def test_restore_replaces_database_and_archives(tmp_path):
+    db = tmp_path / "fit.db"
+    repo = _repo(db)
+    repo.add_food(FoodEntry(date(2024, 1, 1), "Kept", 1))
+    repo.close()
+    path = backup_database(str(db), str(tmp_path / "b"))
+
+    repo = _repo(db)
+    repo.add_food(FoodEntry(date(2022, 1, 1), "Later", 2))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+    repo.close()
+    assert (tmp_path / "fit.2022.db").exists()
+
+    assert main(["--db", str(db), "restore", path]) == 0
+    assert not (tmp_path / "fit.2022.db").exists()
+    repo = _repo(db)
+    assert [f.name for f in repo.load_foods()] == ["Kept"]
+    repo.close()
+
+def test_damaged_backup_is_not_restored(tmp_path):
+    db = tmp_path / "fit.db"
+    _repo(db).close()
+    path = backup_database(str(db), str(tmp_path / "b"))
+    with open(f"{path}/fit.db", "r+b") as f:
+        f.seek(0)
+        f.write(b"garbage" * 20)
+    with pytest.raises(ValueError):
+        restore_backup(path, str(db))
+
+def test_backup_of_database_not_named_db(tmp_path, capsys):
+    db = tmp_path / "data.sqlite"
+    repo = _repo(db)
+    repo.add_food(FoodEntry(date(2022, 1, 1), "Old", 1))
+    repo.add_food(FoodEntry(date(2024, 1, 1), "New", 2))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+    repo.close()
+
+    assert main(["--db", str(db), "backup", "--dir", str(tmp_path / "b")]) == 0
+    [path] = list_backups(str(db), str(tmp_path / "b"))
+    assert os.path.exists(os.path.join(path, "data.2022.sqlite"))
+    assert verify_backup(path, "data.sqlite")
+    restore_backup(path, str(db))
+    repo = _repo(db)
+    assert sorted(f.name for f in repo.load_foods()) == ["New", "Old"]
+    repo.close()
@@ -0,0 +1,90 @@
+
+from datetime import date, timedelta
+
+from fitgator.data.cached_repo import CachedRepository
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, Goal, UserProfile, WorkoutEntry
+
+START = date(2024, 1, 1)  # a Monday
+
+class CountingRepo(SQLiteRepository):
+    range_calls = 0
+
+    def load_foods_range(self, start, end):
+        self.range_calls += 1
+        return super().load_foods_range(start, end)
+
+def _cached(tmp_path, **kw):
+    backend = CountingRepo(str(tmp_path / "c.db"), verbose=False, auto_archive=False)
+    for i in range(28):
+        backend.add_food(FoodEntry(START + timedelta(days=i), f"day{i}", 100 + i))
+    return backend, CachedRepository(backend, **kw)
+
+def test_pages_are_read_once(tmp_path):
+    backend, repo = _cached(tmp_path, page_days=7)
+    week = repo.load_foods_range(START, START + timedelta(days=6))
+    assert [f.name for f in week] == [f"day{i}" for i in range(7)]
+    assert backend.range_calls == 1
+
+    # Scrolling back over the same pages never touches storage again
+    repo.load_foods_range(START + timedelta(days=2), START + timedelta(days=4))
+    repo.load_foods_range(START, START + timedelta(days=6))
+    assert backend.range_calls == 1
+    assert repo.stats()["hits"] == 2 and repo.stats()["misses"] == 1
+
+    # Missing neighbours are fetched in one query
+    month = repo.load_foods_range(START, START + timedelta(days=27))
+    assert len(month) == 28 and backend.range_calls == 2
+
+def test_writes_invalidate_only_their_page(tmp_path):
+    backend, repo = _cached(tmp_path, page_days=1)
+    repo.load_foods_range(START, START + timedelta(days=1))
+    calls = backend.range_calls
+
+    repo.add_food(FoodEntry(START, "snack", 50))
+    assert [f.name for f in repo.load_foods_range(START, START)] == ["day0", "snack"]
+    assert backend.range_calls == calls + 1
+
+    # Writes that bypass the cache are seen through the shared event bus
+    backend.delete_food(repo.load_foods_range(START, START)[1])
+    assert [f.name for f in repo.load_foods_range(START, START)] == ["day0"]
+    repo.load_foods_range(START + timedelta(days=1), START + timedelta(days=1))
+    assert backend.range_calls == calls + 2
+
+def test_lru_eviction_respects_budget(tmp_path):
+    backend, repo = _cached(tmp_path, page_days=1, max_bytes=2000)
+    for i in range(28):
+        d = START + timedelta(days=i)
+        assert repo.load_foods_range(d, d)[0].calories == 100 + i
+    stats = repo.stats()
+    assert stats["evictions"] > 0 and stats["bytes"] <= 2000
+
+def test_workouts_and_passthrough(tmp_path):
+    backend, repo = _cached(tmp_path)
+    repo.add_workout(WorkoutEntry(START, "Run", True))
+    assert [w.routine_name for w in repo.load_workouts_range(START, START)] == ["Run"]
+    assert len(repo.load_foods()) == 28
+    assert repo.archived_years() == []
+
+def test_profile_and_goal_saved_by_another_writer_are_reloaded(tmp_path):
+    backend, repo = _cached(tmp_path)
+    repo.save_profile(UserProfile(30, 70.0, 175.0, "male", 1.55))
+    repo.save_goal(Goal("cut", START))
+    assert repo.load_profile().weight_kg == 70.0 and repo.load_goal().goal_type == "cut"
+    # Written past the cache, but announced on the shared bus
+    backend.save_profile(UserProfile(30, 68.0, 175.0, "male", 1.55))
+    backend.save_goal(Goal("bulk", START))
+    assert repo.load_profile().weight_kg == 68.0
+    assert repo.load_goal().goal_type == "bulk"
+
+def test_warm_loads_one_page_per_step(tmp_path):
+    backend, repo = _cached(tmp_path, page_days=7)
+    repo.load_foods_range(START + timedelta(days=21), START + timedelta(days=27))
+    calls = backend.range_calls
+
+    steps = list(repo.warm(START, START + timedelta(days=27)))
+    assert len(steps) == 4
+    # The newest page was cached already; the other three were loaded
+    assert backend.range_calls == calls + 3
+    repo.load_foods_range(START, START + timedelta(days=27))
+    assert backend.range_calls == calls + 3
@@ -0,0 +1,47 @@
+
+import subprocess
+import sys
+from datetime import date
+
+from fitgator.cli import main
+from fitgator.data.sqlite_repo import SQLiteRepository
+
+def test_log_food_and_workout_are_persisted(tmp_path, capsys):
+    db = str(tmp_path / "cli.db")
+    assert main(["--db", db, "log-food", "Oatmeal", "350", "--date", "2024-03-01"]) == 0
+    assert main(["--db", db, "log-workout", "Run 5k", "--notes", "easy", "--date", "2024-03-01"]) == 0
+
+    repo = SQLiteRepository(db, verbose=False)
+    foods = repo.load_foods()
+    workouts = repo.load_workouts()
+    repo.close()
+    assert [(f.date, f.name, f.calories) for f in foods] == [(date(2024, 3, 1), "Oatmeal", 350)]
+    assert workouts[0].routine_name == "Run 5k" and workouts[0].completed and workouts[0].notes == "easy"
+
+def test_summary_without_profile(tmp_path, capsys):
+    db = str(tmp_path / "cli.json")
+    main(["--db", db, "log-food", "Apple", "95", "--date", "2024-03-02"])
+    capsys.readouterr()
+    assert main(["--db", db, "summary", "--date", "2024-03-02"]) == 0
+    out = capsys.readouterr().out
+    assert "Consumed:           95" in out
+
+def test_export_writes_csv(tmp_path):
+    db = str(tmp_path / "cli.db")
+    out = tmp_path / "out.csv"
+    main(["--db", db, "log-food", "Apple", "95", "--date", "2024-03-02",
+          "--carbs", "25", "--fiber", "4.4"])
+    main(["--db", db, "log-workout", "Run", "--date", "2024-03-02"])
+    main(["--db", db, "export", str(out)])
+    lines = out.read_text().splitlines()
+    assert lines[0] == "type,date,name,calories,completed,notes,protein_g,carbs_g,fat_g,fiber_g"
+    assert lines[1] == "food,2024-03-02,Apple,95,,,0.0,25.0,0.0,4.4"
+    assert lines[2] == "workout,2024-03-02,Run,,yes,,,,,"
+
+def test_cli_never_imports_tkinter(tmp_path):
+    code = (
+        "import sys; from fitgator.cli import main; "
+        f"main(['--db', {str(tmp_path / 'x.db')!r}, 'summary']); "
+        "assert 'tkinter' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
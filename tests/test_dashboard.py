@@ -0,0 +1,72 @@
+
+from datetime import date
+
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, UserProfile, WorkoutEntry
+from fitgator.events import EventBus, FoodAdded
+from fitgator.services.dashboard import DashboardModel, daily_summary
+from fitgator.services.goals import new_goal
+
+DAY = date(2024, 5, 1)
+PROFILE = UserProfile(age=30, weight_kg=70.0, height_cm=175.0, gender="male", activity_level=1.55)
+
+def _repos(tmp_path):
+    yield SQLiteRepository(str(tmp_path / "d.db"), verbose=False, auto_archive=False)
+    yield JsonRepository(str(tmp_path / "d.json"))
+
+def test_model_tracks_repository_mutations(tmp_path):
+    for repo in _repos(tmp_path):
+        model = DashboardModel(repo.bus, day=DAY)
+        repo.save_profile(PROFILE)
+        repo.save_goal(new_goal("cut"))
+
+        lunch = FoodEntry(DAY, "Lunch", 600)
+        repo.add_food(lunch)
+        repo.add_food(FoodEntry(DAY, "Dinner", 800))
+        repo.add_food(FoodEntry(date(2024, 4, 30), "Yesterday", 999))
+        repo.add_workout(WorkoutEntry(DAY, "Run", True))
+        repo.add_workout(WorkoutEntry(DAY, "Skipped", False))
+        repo.delete_food(lunch)
+
+        expected = daily_summary(PROFILE, "cut", repo.load_foods(), repo.load_workouts(), day=DAY)
+        assert model.summary() == expected
+        assert model.consumed == 800 and model.workouts_completed == 1
+        assert sorted(f.name for f in repo.load_foods()) == ["Dinner", "Yesterday"]
+
+def test_deleting_missing_entries_leaves_model_unchanged(tmp_path):
+    for repo in _repos(tmp_path):
+        model = DashboardModel(repo.bus, day=DAY)
+        lunch = FoodEntry(DAY, "Lunch", 600)
+        run = WorkoutEntry(DAY, "Run", True)
+        repo.add_food(lunch)
+        repo.add_workout(run)
+        repo.delete_food(lunch)
+        repo.delete_workout(run)
+        seen = []
+        repo.bus.subscribe(object, seen.append)
+        repo.delete_food(lunch)  # already gone
+        repo.delete_food(FoodEntry(DAY, "Never stored", 300))
+        repo.delete_workout(run)
+        assert seen == []
+        assert model.consumed == 0 and model.workouts_completed == 0
+
+def test_target_is_memoized_until_profile_changes():
+    bus = EventBus()
+    model = DashboardModel(bus, day=DAY)
+    model.reset(PROFILE, "maintain", [], [])
+    first = model.target
+    model.reset(UserProfile(**vars(PROFILE)), "maintain", [], [])
+    assert model.target == first and model.target_computations == 1
+
+    model.goal_type = "bulk"
+    assert model.target > first and model.target_computations == 2
+
+def test_bus_unsubscribe():
+    bus = EventBus()
+    seen = []
+    unsubscribe = bus.subscribe(FoodAdded, seen.append)
+    bus.publish(FoodAdded(FoodEntry(DAY, "x", 1)))
+    unsubscribe()
+    bus.publish(FoodAdded(FoodEntry(DAY, "y", 1)))
+    assert [e.entry.name for e in seen] == ["x"]
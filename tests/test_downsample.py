@@ -0,0 +1,20 @@
+import math
+
+from fitgator.services.downsample import lttb
+
+def _series(n):
+    return [(float(x), math.sin(x / 50.0) * 1000 + (5000 if x == 1234 else 0)) for x in range(n)]
+
+def test_lttb_respects_threshold_and_keeps_ends():
+    pts = _series(10_000)
+    out = lttb(pts, 500)
+    assert len(out) == 500
+    assert out[0] == pts[0] and out[-1] == pts[-1]
+    assert [p[0] for p in out] == sorted(p[0] for p in out)
+    # The spike is the most significant triangle in its bucket
+    assert (1234.0, pts[1234][1]) in out
+
+def test_lttb_short_series_untouched():
+    pts = _series(10)
+    assert lttb(pts, 100) == pts
+    assert lttb(pts, 2) == [pts[0], pts[-1]]
@@ -0,0 +1,73 @@
+
+from datetime import date, timedelta
+
+import pytest
+
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry
+from fitgator.services.history import FOODS, PagedHistory
+
+START = date(2024, 3, 1)
+
+@pytest.fixture(params=["sqlite", "json"])
+def repo(request, tmp_path):
+    if request.param == "sqlite":
+        r = SQLiteRepository(str(tmp_path / "h.db"), verbose=False, auto_archive=False)
+    else:
+        r = JsonRepository(str(tmp_path / "h.json"))
+    # day i has i + 1 entries
+    for i in range(5):
+        for j in range(i + 1):
+            r.add_food(FoodEntry(START + timedelta(days=i), f"d{i}e{j}", 10 * i + j))
+    return r
+
+def test_rows_map_offsets_across_days(repo):
+    history = PagedHistory(repo, FOODS, None, None)
+    assert len(history) == 15
+    everything = repo.load_foods()
+    for offset in range(15):
+        for limit in (1, 4, 20):
+            assert history.rows(offset, limit) == everything[offset:offset + limit]
+    assert history.rows(15, 5) == []
+
+def test_bounded_range(repo):
+    history = PagedHistory(repo, FOODS, START + timedelta(days=1), START + timedelta(days=2))
+    assert len(history) == 5
+    assert [f.name for f in history.rows(0, 10)] == ["d1e0", "d1e1", "d2e0", "d2e1", "d2e2"]
+
+def test_insert_and_remove_report_offsets(repo):
+    history = PagedHistory(repo, FOODS, None, None)
+    late = FoodEntry(START + timedelta(days=1), "late", 1)
+    repo.add_food(late)
+    assert history.insert(late) == 3
+    assert history.rows(3, 1)[0].name == "late"
+
+    new_day = FoodEntry(START + timedelta(days=10), "new", 1)
+    repo.add_food(new_day)
+    assert history.insert(new_day) == 16
+
+    victim = history.rows(5, 1)[0]
+    repo.delete_food(victim)
+    assert history.remove(victim) == 5
+    assert len(history) == 16
+    assert history.rows(0, 100) == repo.load_foods()
+
+    outside = PagedHistory(repo, FOODS, START, START)
+    assert outside.insert(new_day) is None
+
+def test_back_dated_entries_on_json(tmp_path):
+    repo = JsonRepository(str(tmp_path / "back.json"))
+    day = START + timedelta(days=2)
+    repo.add_food(FoodEntry(day, "today", 1))
+    repo.add_food(FoodEntry(START, "forgot", 2))
+    repo.add_food(FoodEntry(day, "snack", 3))
+    repo.add_food(FoodEntry(START + timedelta(days=1), "yesterday", 4))
+    history = PagedHistory(repo, FOODS, None, None)
+    assert [f.name for f in history.rows(0, 10)] == ["forgot", "yesterday", "today", "snack"]
+    assert [f.name for f in history.rows(1, 2)] == ["yesterday", "today"]
+
+    victim = history.rows(0, 1)[0]
+    repo.delete_food(victim)
+    assert history.remove(victim) == 0
+    assert [f.name for f in history.rows(0, 10)] == ["yesterday", "today", "snack"]
@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+
+from fitgator.data.cached_repo import CachedRepository
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, WorkoutEntry
+from fitgator.events import FoodAdded, FoodDeleted
+
+DAY = date(2024, 3, 1)
+
+def _open(kind, tmp_path, **kw):
+    if kind == "sqlite":
+        return SQLiteRepository(str(tmp_path / "j.db"), verbose=False, auto_archive=False, **kw)
+    return JsonRepository(str(tmp_path / "j.json"), **kw)
+
+@pytest.fixture(params=["sqlite", "json"])
+def kind(request):
+    return request.param
+
+def test_undo_and_redo_a_delete(kind, tmp_path):
+    repo = CachedRepository(_open(kind, tmp_path))
+    events = []
+    repo.bus.subscribe(FoodAdded, events.append)
+    repo.bus.subscribe(FoodDeleted, events.append)
+    pizza = FoodEntry(DAY, "Pizza", 800, protein_g=30)
+    repo.add_food(pizza)
+    repo.add_food(FoodEntry(DAY, "Salad", 200))
+    assert len(repo.load_foods_range(DAY, DAY)) == 2  # cached from here on
+    repo.delete_food(pizza)
+    events.clear()
+
+    assert repo.undo() == "delete food 'Pizza'"
+    restored = [f for f in repo.load_foods_range(DAY, DAY) if f.name == "Pizza"]
+    assert restored == [pizza] and restored[0].protein_g == 30
+    assert isinstance(events[-1], FoodAdded) and events[-1].entry.id == restored[0].id
+
+    assert repo.redo() == "delete food 'Pizza'"
+    assert [f.name for f in repo.load_foods_range(DAY, DAY)] == ["Salad"]
+    assert repo.redo() is None
+
+    # Undo walks back through the adds as well
+    assert repo.undo() == "delete food 'Pizza'"
+    assert repo.undo() == "add food 'Salad'"
+    assert repo.undo() == "add food 'Pizza'"
+    assert repo.undo() is None
+    assert repo.load_foods_range(DAY, DAY) == []
+
+def test_batch_is_one_step_and_new_changes_drop_redo(kind, tmp_path):
+    repo = _open(kind, tmp_path)
+    repo.add_workouts([WorkoutEntry(DAY, f"Set {i}", True) for i in range(3)])
+    assert repo.undo() == "add 3 workouts"
+    assert repo.load_workouts() == []
+    repo.add_workout(WorkoutEntry(DAY, "Run"))
+    assert repo.redo() is None
+    assert [w.routine_name for w in repo.load_workouts()] == ["Run"]
+
+def test_retention_is_bounded(kind, tmp_path):
+    repo = _open(kind, tmp_path, journal_steps=3)
+    for i in range(10):
+        repo.add_food(FoodEntry(DAY, f"f{i}", i))
+    undone = []
+    while repo.undo() is not None:
+        undone.append(1)
+    assert len(undone) == 3 and len(repo.load_foods()) == 7
+
+def test_undo_skips_steps_that_no_longer_apply(kind, tmp_path):
+    repo = _open(kind, tmp_path)
+    repo.add_workout(WorkoutEntry(DAY, "Run", True))
+    repo.add_food(FoodEntry(DAY, "Toast", 250))
+    repo.save_foods([])  # replacing the log forgets its journaled steps
+    assert repo.undo() == "add workout 'Run'"
+    assert repo.undo() is None
+
+    repo.add_food(FoodEntry(DAY, "Soup", 150))
+    # Deleted by a writer that does not journal: nothing is left to undo
+    other = _open(kind, tmp_path, journal_steps=0)
+    other.delete_food(other.load_foods()[0])
+    assert repo.undo() is None
+    assert repo.load_foods() == []
+
+def test_journal_off_and_cleared(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "off.db"), verbose=False, journal_steps=0)
+    repo.add_food(FoodEntry(DAY, "x", 1))
+    assert repo.undo() is None
+    repo.close()
+
+    repo = SQLiteRepository(str(tmp_path / "on.db"), verbose=False, auto_archive=False)
+    repo.add_food(FoodEntry(DAY, "x", 1))
+    repo.clear_all()
+    assert repo.undo() is None
+    repo.close()
+
+def test_undo_reaches_archived_years(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "a.db"), verbose=False, auto_archive=False)
+    old = FoodEntry(date(2022, 5, 1), "Old", 100)
+    repo.add_food(old)
+    repo.archive_closed_years(today=DAY)
+    repo.delete_food(old)
+    assert repo.undo() == "delete food 'Old'"
+    assert [f.name for f in repo.load_foods_range(date(2022, 1, 1), date(2022, 12, 31))] == ["Old"]
+    # The restored row is new to sync, since the old one left a tombstone
+    changes = repo.export_changes(0)
+    assert len(changes["foods"]) == 1 and len(changes["tombstones"]) == 1
+    repo.close()
@@ -0,0 +1,116 @@
+import json
+import multiprocessing
+from datetime import date
+
+import pytest
+
+from fitgator.data import json_columns
+from fitgator.data.json_repo import ConcurrentModificationError, JsonRepository
+from fitgator.entities import FoodEntry, Template, TemplateItem, UserProfile, WorkoutEntry
+
+def _add_many(path, tag, n):
+    repo = JsonRepository(path)
+    for i in range(n):
+        repo.add_food(FoodEntry(date(2024, 1, 1), f"{tag}{i}", i))
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    path = str(tmp_path / "data.json")
+    JsonRepository(path)
+    procs = [multiprocessing.Process(target=_add_many, args=(path, tag, 25)) for tag in "ab"]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    foods = JsonRepository(path).load_foods()
+    assert len(foods) == 50
+    assert len({f.id for f in foods}) == 50
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_stale_full_save_is_rejected(tmp_path):
+    path = str(tmp_path / "data.json")
+    gui, script = JsonRepository(path), JsonRepository(path)
+    gui.add_food(FoodEntry(date(2024, 1, 1), "Rice", 200))
+    foods = gui.load_foods()
+
+    script.add_food(FoodEntry(date(2024, 1, 2), "Soup", 150))
+    with pytest.raises(ConcurrentModificationError):
+        gui.save_foods(foods[:0])
+    assert [f.name for f in gui.load_foods()] == ["Rice", "Soup"]
+
+    # After reloading, and after its own single-row writes, the save goes through
+    foods = gui.load_foods()
+    gui.add_food(FoodEntry(date(2024, 1, 3), "Tea", 5))
+    gui.save_foods([f for f in foods if f.name != "Rice"])
+    assert [f.name for f in script.load_foods()] == ["Soup"]
+
+def _legacy_file(path):
+    # Format 1: one dict per row; the first food predates macros and ids
+    rows = [{"date": "2024-01-01", "name": "Oats", "calories": 300}]
+    rows += [
+        {"date": f"2024-01-0{d}", "name": f"Meal {d}", "calories": 100 * d,
+         "protein_g": 10.0, "carbs_g": 0.0, "fat_g": 0.0, "fiber_g": 0.0, "id": d}
+        for d in (2, 3)
+    ]
+    workouts = [{"date": "2024-01-02", "routine_name": "Run", "completed": True,
+                 "notes": "", "id": 1}]
+    path.write_text(json.dumps({"profile": None, "goal": None, "foods": rows,
+                                "workouts": workouts, "revision": 4}))
+
+def test_legacy_file_is_read_in_place_and_upgraded_on_write(tmp_path):
+    path = tmp_path / "data.json"
+    _legacy_file(path)
+    before = path.read_text()
+    repo = JsonRepository(str(path))
+    assert [f.name for f in repo.iter_foods(date(2024, 1, 2))] == ["Meal 2", "Meal 3"]
+    assert repo.count_workouts_by_day() == {date(2024, 1, 2): 1}
+    assert repo.daily_macro_totals()[date(2024, 1, 3)].protein_g == 10.0
+    assert path.read_text() == before  # reading never rewrites the file
+
+    repo.add_food(FoodEntry(date(2024, 1, 4), "Tea", 5))
+    data = json.loads(path.read_text())
+    assert data["format"] == 2 and data["revision"] == 5
+    assert data["foods"][0]["date"][0] == date(2024, 1, 1).toordinal()
+    foods = repo.load_foods()
+    assert [(f.name, f.id) for f in foods] == [("Oats", 4), ("Meal 2", 2), ("Meal 3", 3), ("Tea", 5)]
+    assert foods[0].protein_g == 0.0
+
+def test_column_blocks_split_and_shrink(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_columns, "BLOCK_ROWS", 3)
+    path = tmp_path / "data.json"
+    repo = JsonRepository(str(path))
+    repo.add_foods([FoodEntry(date(2024, 1, 1 + i % 3), f"f{i}", i) for i in range(5)])
+    repo.add_food(FoodEntry(date(2024, 1, 9), "f5", 5))
+    blocks = json.loads(path.read_text())["foods"]
+    assert [len(b["id"]) for b in blocks] == [3, 3]
+
+    foods = repo.load_foods()
+    assert [f.name for f in foods] == ["f0", "f3", "f1", "f4", "f2", "f5"]  # by date, id
+    for f in foods[:3]:
+        repo.delete_food(f)
+    assert len(json.loads(path.read_text())["foods"]) == 1  # empty block dropped
+    repo.undo()
+    # The restored row goes back to its place in date order
+    assert repo.load_foods_range(date(2024, 1, 2), date(2024, 1, 3)) == foods[2:5]
+    assert repo.count_foods_by_day(end=date(2024, 1, 3)) == {
+        date(2024, 1, 2): 2, date(2024, 1, 3): 1
+    }
+
+    # Back-dated rows are inserted in place; an oversized block is split
+    repo.add_foods([FoodEntry(date(2024, 1, 2), f"g{i}", i) for i in range(3)])
+    blocks = json.loads(path.read_text())["foods"]
+    assert [len(b["id"]) for b in blocks] == [3, 4]
+    assert [f.name for f in repo.iter_foods()] == ["f1", "f4", "g0", "g1", "g2", "f2", "f5"]
+
+def test_own_writes_to_other_sections_keep_loaded_list_current(tmp_path):
+    repo = JsonRepository(str(tmp_path / "data.json"))
+    repo.add_food(FoodEntry(date(2024, 1, 1), "Rice", 200))
+    foods = repo.load_foods()
+    workouts = repo.load_workouts()
+    repo.add_workout(WorkoutEntry(date(2024, 1, 1), "Run"))
+    repo.save_profile(UserProfile(30, 70.0, 175.0, "male", 1.55))
+    repo.save_template(Template("Snack", "food", [TemplateItem("Apple", 95)]))
+    repo.save_foods(foods + [FoodEntry(date(2024, 1, 2), "Soup", 150)])
+    # The workout list went stale through our own add, not another process
+    repo.save_workouts(workouts)
+    assert [f.name for f in repo.load_foods()] == ["Rice", "Soup"]
+    assert repo.load_workouts() == []
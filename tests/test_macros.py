@@ -0,0 +1,89 @@
+import sqlite3
+from datetime import date
+
+from fitgator.cli import main
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, UserProfile
+from fitgator.services.macros import macro_targets, weekly_totals
+from fitgator.services.tdee import goal_adjusted_calories
+
+PROFILE = UserProfile(age=30, weight_kg=80, height_cm=180, gender="male", activity_level=1.55)
+
+def _foods():
+    return [
+        FoodEntry(date(2024, 3, 4), "Eggs", 150, protein_g=12, fat_g=10),
+        FoodEntry(date(2024, 3, 4), "Rice", 200, carbs_g=44, fiber_g=1),
+        FoodEntry(date(2024, 3, 10), "Chicken", 250, protein_g=40, fat_g=8),
+        FoodEntry(date(2024, 3, 11), "Oats", 300, protein_g=10, carbs_g=54, fiber_g=8),
+    ]
+
+def test_targets_follow_goal_calories():
+    for goal in ("cut", "maintain", "bulk"):
+        t = macro_targets(PROFILE, goal)
+        assert t.calories == goal_adjusted_calories(PROFILE, goal)
+        assert abs(t.protein_g * 4 + t.carbs_g * 4 + t.fat_g * 9 - t.calories) < 10
+    assert macro_targets(PROFILE, "cut").protein_g > macro_targets(PROFILE, "bulk").protein_g * 0.9
+
+def test_daily_and_weekly_totals_match_between_backends(tmp_path):
+    sql = SQLiteRepository(str(tmp_path / "m.db"), verbose=False, auto_archive=False)
+    js = JsonRepository(str(tmp_path / "m.json"))
+    for repo in (sql, js):
+        for f in _foods():
+            repo.add_food(f)
+    daily = sql.daily_macro_totals()
+    assert daily == js.daily_macro_totals()
+    assert daily[date(2024, 3, 4)].protein_g == 12 and daily[date(2024, 3, 4)].carbs_g == 44
+
+    weeks = weekly_totals(daily)
+    assert list(weeks) == [date(2024, 3, 4), date(2024, 3, 11)]
+    assert weeks[date(2024, 3, 4)].calories == 600
+    assert weeks[date(2024, 3, 4)].protein_g == 52
+    sql.close()
+
+def test_daily_totals_use_covering_index(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "m.db"), verbose=False, auto_archive=False)
+    plan = repo._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT date, SUM(calories), SUM(protein_g), SUM(carbs_g), "
+        "SUM(fat_g), SUM(fiber_g) FROM foods WHERE date >= ? GROUP BY date",
+        ("2024-01-01",),
+    ).fetchall()
+    assert any("COVERING INDEX idx_foods_date_macros" in row[-1] for row in plan)
+    repo.close()
+
+def test_old_food_table_gains_macro_columns(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE foods (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, "
+        "name TEXT NOT NULL, calories INTEGER NOT NULL)"
+    )
+    conn.execute("INSERT INTO foods (date, name, calories) VALUES ('2024-02-01', 'Egg', 80)")
+    conn.commit()
+    conn.close()
+    repo = SQLiteRepository(str(path), verbose=False, auto_archive=False)
+    assert repo.load_foods()[0].protein_g == 0
+    repo.close()
+
+def test_cli_logs_and_prints_macros(tmp_path, capsys):
+    db = str(tmp_path / "cli.db")
+    main(["--db", db, "log-food", "Shake", "200", "--protein", "30", "--carbs", "8.5",
+          "--date", "2024-03-02"])
+    capsys.readouterr()
+    main(["--db", db, "summary", "--date", "2024-03-02"])
+    out = capsys.readouterr().out
+    assert "Protein (g):        30" in out
+    assert "Carbs (g):          8.5" in out
+
+def test_dashboard_model_tracks_macros(tmp_path):
+    from fitgator.services.dashboard import DashboardModel
+    repo = SQLiteRepository(str(tmp_path / "d.db"), verbose=False, auto_archive=False)
+    model = DashboardModel(repo.bus, day=date(2024, 3, 4))
+    eggs, rice = _foods()[:2]
+    repo.add_food(eggs)
+    repo.add_food(rice)
+    assert (model.macros.protein_g, model.macros.carbs_g, model.consumed) == (12, 44, 350)
+    repo.delete_food(eggs)
+    assert (model.macros.protein_g, model.consumed) == (0, 200)
+    assert model.macro_targets is None
+    repo.close()
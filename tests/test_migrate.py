@@ -0,0 +1,63 @@
+import sqlite3
+from datetime import date, timedelta
+
+from fitgator.cli import main
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.migrate import migrate_json_to_sqlite
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, Goal, Template, TemplateItem, UserProfile, WorkoutEntry
+
+START = date(2023, 12, 1)
+
+def _legacy_file(tmp_path, days=60):
+    path = str(tmp_path / "fitgator_data.json")
+    repo = JsonRepository(path)
+    repo.save_profile(UserProfile(30, 70.0, 175.0, "male", 1.55, "metric"))
+    repo.save_goal(Goal("cut", START))
+    repo.save_template(Template("Snack", "food", [TemplateItem("Apple", 95)]))
+    repo.save_foods([
+        FoodEntry(START + timedelta(days=i), f"Pizza {i}", 500 + i, protein_g=20)
+        for i in range(days)
+    ])
+    repo.save_workouts([WorkoutEntry(START, "Run", True, "knee pain")])
+    return path
+
+def test_migration_copies_everything_and_rebuilds_indexes(tmp_path):
+    db = str(tmp_path / "new.db")
+    stats = migrate_json_to_sqlite(_legacy_file(tmp_path), db, batch_size=7,
+                                   today=date(2024, 6, 1))
+    assert (stats.foods, stats.workouts) == (60, 1)
+    assert stats.archived_years == [2023]
+    assert stats.rows_per_second > 0
+
+    repo = SQLiteRepository(db, verbose=False, auto_archive=False)
+    assert repo.load_profile().age == 30
+    assert repo.load_goal().goal_type == "cut"
+    assert "Snack" in [t.name for t in repo.load_templates()]
+    foods = repo.load_foods_range(None, None)
+    assert [f.id for f in foods] == list(range(1, 61))  # ids kept
+    assert foods[0].protein_g == 20
+    assert repo.daily_macro_totals(START, START)[START].calories == 500
+    found_foods, found_workouts = repo.search("pizza 59")
+    assert [f.name for f in found_foods] == ["Pizza 59"]
+    assert [w.notes for w in repo.search("knee")[1]] == ["knee pain"]
+    # Each batch is its own change counter step, so sync sees every row
+    assert len(repo.export_changes(0)["foods"]) == 60
+    repo.close()
+
+    conn = sqlite3.connect(db)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    assert {"idx_foods_date_macros", "idx_foods_uuid", "foods_fts_ai", "workouts_fts"} <= names
+
+def test_migration_refuses_a_database_with_entries(tmp_path, capsys):
+    source = _legacy_file(tmp_path, days=3)
+    db = str(tmp_path / "used.db")
+    repo = SQLiteRepository(db, verbose=False, auto_archive=False)
+    repo.add_food(FoodEntry(START, "Existing", 1))
+    repo.close()
+    assert main(["--db", db, "migrate", source]) == 1
+    assert "already has logged entries" in capsys.readouterr().err
+
+    assert main(["--db", str(tmp_path / "fresh.db"), "migrate", source]) == 0
+    assert "Migrated 3 foods, 1 workouts" in capsys.readouterr().out
@@ -0,0 +1,58 @@
+
+import json
+from datetime import date, timedelta
+
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, WorkoutEntry
+from fitgator.services.reports import (
+    build_report,
+    build_report_from_repo,
+    write_report_csv,
+    write_report_json,
+)
+
+def _populate(path):
+    repo = SQLiteRepository(path, verbose=False, auto_archive=False)
+    start = date(2023, 11, 28)
+    for i in range(70):
+        d = start + timedelta(days=i)
+        if i % 10 == 9:
+            continue  # break the logging streak every 10 days
+        repo.add_food(FoodEntry(d, "Oats", 300))
+        if i % 3 == 0:
+            repo.add_food(FoodEntry(d, "Pizza", 800))
+        repo.add_workout(WorkoutEntry(d, "Run", i % 2 == 0))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+    return repo
+
+def test_parallel_report_matches_serial(tmp_path):
+    db = str(tmp_path / "r.db")
+    repo = _populate(db)
+    serial = build_report_from_repo(repo)
+    repo.close()
+
+    parallel = build_report(db, workers=2)
+    assert parallel == serial
+    assert [m.period for m in parallel.months] == ["2023-11", "2023-12", "2024-01", "2024-02"]
+    assert [y.period for y in parallel.years] == ["2023", "2024"]
+
+    dec = parallel.months[1]
+    assert dec.best_logging_streak == 9
+    assert dec.top_foods[0] == ("Oats", dec.days_logged)
+    total = sum(y.calories for y in parallel.years)
+    assert total == sum(m.calories for m in parallel.months)
+
+def test_report_outputs(tmp_path):
+    db = str(tmp_path / "r.db")
+    _populate(db).close()
+    report = build_report(db, year=2024, workers=1)
+    assert [y.period for y in report.years] == ["2024"]
+
+    write_report_csv(report, str(tmp_path / "r.csv"))
+    lines = (tmp_path / "r.csv").read_text().splitlines()
+    assert lines[0].startswith("period,calories")
+    assert len(lines) == 1 + len(report.months) + 1
+
+    write_report_json(report, str(tmp_path / "r.json"))
+    data = json.loads((tmp_path / "r.json").read_text())
+    assert data["years"][0]["period"] == "2024"
@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+from app.scheduler import IdleScheduler
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry
+from fitgator.services.suggest import FoodSuggestions, build_suggestions
+
+
+class FakeTk:
+    """Stands in for the Tk root: queued callbacks run when the test says."""
+
+    def __init__(self):
+        self.queue = []
+
+    def after(self, ms, callback):
+        self.queue.append(callback)
+        return len(self.queue)
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, job):
+        pass
+
+    def run(self):
+        slices = 0
+        while self.queue:
+            self.queue.pop(0)()
+            slices += 1
+        return slices
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _steps(n, clock, out, cost=0.002):
+    for i in range(n):
+        clock.now += cost
+        out.append(i)
+        yield
+    return n
+
+
+def test_work_is_split_into_time_slices():
+    tk, clock, out, done = FakeTk(), FakeClock(), [], []
+    idle = IdleScheduler(tk, slice_ms=8, clock=clock)
+    idle.submit("count", _steps(10, clock, out), on_done=done.append)
+    assert out == []  # nothing runs until the event loop is idle
+    tk.run()
+    assert out == list(range(10)) and done == [10]
+    assert idle.slices == 3  # 4 + 4 + 2 steps of 2 ms
+    assert len(idle) == 0
+
+
+def test_resubmitting_replaces_and_failures_are_dropped():
+    tk, clock, out, done = FakeTk(), FakeClock(), [], []
+    idle = IdleScheduler(tk, clock=clock)
+    idle.submit("a", _steps(5, clock, out))
+    idle.submit("a", _steps(2, clock, out), on_done=done.append)
+
+    def broken():
+        yield
+        raise RuntimeError("boom")
+
+    idle.submit("b", broken())
+    tk.run()
+    assert out == [0, 1] and done == [2]
+    assert "b" not in idle
+
+
+def test_suggestions_prefer_frequent_foods_with_latest_values(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "s.db"), verbose=False, auto_archive=False)
+    start = date(2023, 1, 1)
+    for i in range(400):
+        repo.add_food(FoodEntry(start + timedelta(days=i), "Oatmeal", 300 + i))
+        if i % 50 == 0:
+            repo.add_food(FoodEntry(start + timedelta(days=i), "Oat milk", 120))
+    repo.add_food(FoodEntry(start, "Pizza", 800))
+
+    gen = build_suggestions(repo, window_days=92)
+    steps = 0
+    try:
+        while True:
+            next(gen)
+            steps += 1
+    except StopIteration as done:
+        index = done.value
+    assert steps == 5
+
+    matches = index.match("oat")
+    assert [f.name for f in matches] == ["Oatmeal", "Oat milk"]
+    assert matches[0].calories == 699  # most recent entry
+    index.remove(FoodEntry(start, "Pizza", 800))
+    assert index.match("pi") == [] and len(index) == 2
+    assert FoodSuggestions().match("") == []
+    repo.close()
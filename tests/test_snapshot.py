@@ -0,0 +1,65 @@
+
+from dataclasses import asdict
+from datetime import date
+
+import pytest
+
+from fitgator.data import snapshot
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.snapshot import Snapshot, write_snapshot, write_snapshot_from_repo
+from fitgator.entities import FoodEntry, WorkoutEntry
+
+FOODS = [
+    FoodEntry(date(2024, 1, 31), "Pizza", 800, 30.5, 90.0, 35.25, 4.0),
+    FoodEntry(date(2024, 1, 31), "Crème brûlée", 400),
+    FoodEntry(date(2024, 2, 1), "Oats", 300, 10.0, 54.0, 5.0, 8.5),
+]
+WORKOUTS = [
+    WorkoutEntry(date(2024, 1, 31), "Run", True, "knee pain"),
+    WorkoutEntry(date(2024, 2, 1), "Swim", False),
+]
+
+@pytest.mark.parametrize("codec", ["none", "zlib", "lzma"])
+def test_snapshot_roundtrip(tmp_path, codec):
+    path = str(tmp_path / "snap.fgs")
+    assert write_snapshot(path, FOODS, WORKOUTS, codec=codec) == 5
+
+    with Snapshot(path) as snap:
+        assert snap.foods() == FOODS
+        assert snap.workouts() == WORKOUTS
+        assert snap.monthly_calories() == {"2024-01": 1200, "2024-02": 300}
+        assert snap.daily_calories() == {date(2024, 1, 31): 1200, date(2024, 2, 1): 300}
+        assert snap.daily_calories(start=date(2024, 2, 1)) == {date(2024, 2, 1): 300}
+        assert snap.daily_workouts_completed() == {date(2024, 1, 31): 1}
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "bogus.fgs"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
+
+def test_snapshot_from_repo_keeps_whole_entries(tmp_path):
+    repo = JsonRepository(str(tmp_path / "data.json"))
+    repo.save_foods(list(FOODS))
+    repo.save_workouts(list(WORKOUTS))
+    path = str(tmp_path / "snap.fgs")
+    write_snapshot_from_repo(repo, path)
+    with Snapshot(path) as snap:
+        foods = snap.foods()
+    assert [asdict(f) for f in foods] == [dict(asdict(f), id=None) for f in FOODS]
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_blocks_are_mapped_on_first_use(tmp_path, monkeypatch, codec):
+    path = str(tmp_path / "snap.fgs")
+    write_snapshot(path, FOODS, WORKOUTS, codec=codec)
+    calls = []
+    real = snapshot._decompress
+    monkeypatch.setattr(snapshot, "_decompress", lambda c, d: calls.append(c) or real(c, d))
+    with Snapshot(path) as snap:
+        assert snap.row_count("foods") == 3 and calls == []
+        assert not any(b.loaded for b in snap.blocks("foods"))
+        snap.monthly_calories()
+        snap.monthly_calories()
+        assert all(b.loaded for b in snap.blocks("foods"))
+        assert not any(b.loaded for b in snap.blocks("workouts"))
+        assert len(calls) == (0 if codec == "none" else 2)
@@ -0,0 +1,114 @@
+
+from datetime import date
+
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, WorkoutEntry
+
+def _repo(tmp_path, **kw):
+    return SQLiteRepository(str(tmp_path / "fit.db"), verbose=False, **kw)
+
+def test_closed_years_move_to_archive_files(tmp_path):
+    repo = _repo(tmp_path, auto_archive=False)
+    repo.add_food(FoodEntry(date(2022, 3, 1), "Rice", 200))
+    repo.add_food(FoodEntry(date(2023, 7, 4), "Burger", 700))
+    repo.add_food(FoodEntry(date(2024, 1, 2), "Salad", 150))
+    repo.add_workout(WorkoutEntry(date(2023, 7, 4), "Run", True))
+
+    assert repo.archive_closed_years(today=date(2024, 6, 1)) == [2022, 2023]
+    assert repo.archived_years() == [2022, 2023]
+    assert (tmp_path / "fit.2022.db").exists()
+    hot = repo._conn.execute("SELECT COUNT(*) FROM foods").fetchone()[0]
+    assert hot == 1
+
+    names = [f.name for f in repo.load_foods()]
+    assert names == ["Rice", "Burger", "Salad"]
+    assert [w.routine_name for w in repo.load_workouts()] == ["Run"]
+    repo.close()
+
+def test_range_queries_span_partitions(tmp_path):
+    repo = _repo(tmp_path, auto_archive=False)
+    for d in (date(2022, 12, 31), date(2023, 1, 1), date(2024, 1, 1)):
+        repo.add_food(FoodEntry(d, d.isoformat(), 100))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+
+    got = repo.load_foods_range(date(2022, 12, 31), date(2023, 12, 31))
+    assert [f.name for f in got] == ["2022-12-31", "2023-01-01"]
+    assert [f.name for f in repo.load_foods_range(date(2024, 1, 1), None)] == ["2024-01-01"]
+
+    # Back-dated writes land in the archive that owns the year
+    repo.add_food(FoodEntry(date(2022, 6, 1), "late", 50))
+    got = repo.load_foods_range(date(2022, 1, 1), date(2022, 12, 31))
+    assert [f.name for f in got] == ["late", "2022-12-31"]
+    repo.close()
+
+def test_archiving_keeps_row_ids_unique(tmp_path):
+    repo = _repo(tmp_path, auto_archive=False)
+    old = FoodEntry(date(2022, 3, 1), "old", 1)
+    other = FoodEntry(date(2022, 3, 1), "other", 2)
+    repo.add_food(old)
+    repo.add_food(other)
+    repo.add_food(FoodEntry(date(2024, 3, 1), "new", 3))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+
+    # Entries loaded before archiving still name their rows afterwards
+    assert {f.name: f.id for f in repo.load_foods()}["old"] == old.id
+    repo.delete_food(old)
+    assert [f.name for f in repo.load_foods()] == ["other", "new"]
+
+    # Back-dated and batched archive rows never reuse a hot id
+    repo.add_food(FoodEntry(date(2023, 5, 1), "late", 4))
+    repo.add_foods([FoodEntry(date(2022, 8, 1), "batch", 5), FoodEntry(date(2024, 4, 1), "hot", 6)])
+    repo.add_food(FoodEntry(date(2024, 5, 1), "newer", 7))
+    ids = [f.id for f in repo.load_foods()]
+    assert len(ids) == len(set(ids)) == 6
+    repo.close()
+
+def test_archive_tables_are_created_once(tmp_path):
+    repo = _repo(tmp_path, auto_archive=False)
+    repo.add_food(FoodEntry(date(2022, 3, 1), "old", 1))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+    statements = []
+    repo._conn.set_trace_callback(statements.append)
+    repo.load_foods_range(date(2022, 1, 1), date(2022, 12, 31))
+    repo._conn.set_trace_callback(None)
+    assert not [s for s in statements if "CREATE" in s]
+    repo.close()
+
+def test_save_and_clear_cover_archives(tmp_path):
+    repo = _repo(tmp_path, auto_archive=False)
+    repo.add_food(FoodEntry(date(2022, 3, 1), "old", 1))
+    repo.add_food(FoodEntry(date(2024, 3, 1), "new", 2))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+
+    repo.save_foods([f for f in repo.load_foods() if f.name != "old"])
+    assert [f.name for f in repo.load_foods()] == ["new"]
+
+    repo.clear_all()
+    assert repo.load_foods() == []
+    assert not (tmp_path / "fit.2022.db").exists()
+    repo.close()
+
+def test_search_matches_names_and_notes(tmp_path):
+    repo = _repo(tmp_path, auto_archive=False)
+    repo.add_food(FoodEntry(date(2023, 5, 1), "Pepperoni pizza", 900))
+    repo.add_food(FoodEntry(date(2024, 5, 1), "Pizza margherita", 700))
+    repo.add_food(FoodEntry(date(2024, 5, 2), "Salad", 200))
+    repo.add_workout(WorkoutEntry(date(2024, 5, 2), "Squats", True, "knee pain after set 3"))
+    repo.add_workout(WorkoutEntry(date(2024, 5, 3), "Run", True, "felt great"))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+
+    foods, workouts = repo.search("pizza")
+    assert [f.name for f in foods] == ["Pepperoni pizza", "Pizza margherita"]
+    assert workouts == []
+
+    foods, _ = repo.search("pizz", start=date(2024, 1, 1))
+    assert [f.name for f in foods] == ["Pizza margherita"]
+
+    _, workouts = repo.search("knee pain")
+    assert [w.routine_name for w in workouts] == ["Squats"]
+
+    # The index follows deletes made through the table
+    repo.save_workouts([w for w in repo.load_workouts() if w.routine_name != "Squats"])
+    assert repo.search("knee") == ([], [])
+    assert repo.search('odd "quote') == ([], [])
+    repo.close()
@@ -0,0 +1,93 @@
+
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.json_stream import iter_array, read_value
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, WorkoutEntry
+from fitgator.services.tracker import daily_calorie_totals, daily_workout_counts
+
+START = date(2023, 12, 30)
+
+@pytest.fixture(params=["sqlite", "json"])
+def repo(request, tmp_path):
+    if request.param == "sqlite":
+        r = SQLiteRepository(str(tmp_path / "s.db"), verbose=False, auto_archive=False)
+    else:
+        r = JsonRepository(str(tmp_path / "s.json"))
+    for i in range(6):
+        d = START + timedelta(days=i // 2)
+        r.add_food(FoodEntry(d, f"food {i}", 100 * (i + 1)))
+        r.add_workout(WorkoutEntry(d, f"w{i}", i % 2 == 0, 'notes, with "quotes"'))
+    if isinstance(r, SQLiteRepository):
+        r.archive_closed_years(today=date(2024, 6, 1))
+    return r
+
+def test_iterators_match_materialized_loads(repo):
+    assert list(repo.iter_foods(batch_size=2)) == repo.load_foods()
+    assert list(repo.iter_workouts(batch_size=1)) == repo.load_workouts()
+    d = START + timedelta(days=1)
+    assert [f.name for f in repo.iter_foods(d, d)] == ["food 2", "food 3"]
+
+def test_abandoned_iterator_releases_partition(repo):
+    it = repo.iter_foods(batch_size=1)
+    next(it)
+    it.close()
+    repo.add_food(FoodEntry(START, "after", 1))
+    assert "after" in [f.name for f in repo.iter_foods(START, START)]
+
+def test_repository_is_usable_while_an_iterator_is_paused(repo):
+    names = []
+    for f in repo.iter_foods(batch_size=1):
+        # Touches the archived year the iterator is reading from
+        assert repo.count_foods_by_day(START, START) == {START: 2}
+        assert repo.load_foods_range(START, START)
+        repo.search("food")
+        names.append(f.name)
+    repo.add_food(FoodEntry(START, "mid", 1))
+    it = repo.iter_workouts(batch_size=1)
+    next(it)
+    repo.add_workout(WorkoutEntry(START, "late", False))
+    assert len(list(it)) >= 5
+    assert names == [f"food {i}" for i in range(6)]
+
+def test_streaming_aggregates(repo):
+    totals = list(daily_calorie_totals(repo.iter_foods()))
+    assert totals == [(START, 300), (START + timedelta(days=1), 700), (START + timedelta(days=2), 1100)]
+    assert [n for _, n in daily_workout_counts(repo.iter_workouts())] == [1, 1, 1]
+
+def test_entries_come_back_in_date_order(repo):
+    d = date(2024, 10, 19)
+    prev = d - timedelta(days=1)
+    repo.add_food(FoodEntry(d, "breakfast", 300))
+    repo.add_food(FoodEntry(prev, "back-dated", 500))
+    repo.add_foods([FoodEntry(d, "dinner", 700), FoodEntry(prev, "planned", 100)])
+    assert list(daily_calorie_totals(repo.iter_foods(prev, d))) == [(prev, 600), (d, 1000)]
+    expected = ["back-dated", "planned", "breakfast", "dinner"]
+    assert [f.name for f in repo.load_foods_range(prev, d)] == expected
+    assert [f.name for f in repo.iter_foods(prev)] == expected
+    assert [f.date for f in repo.load_foods()] == sorted(f.date for f in repo.load_foods())
+
+@pytest.mark.parametrize("chunk", [1, 3, 7, 4096])
+def test_iter_array_chunk_boundaries(chunk):
+    doc = {"profile": {"a": [1, 2]}, "nums": [123456, -7.5e3, True, None, "x]"], "rows": [{"k": "v"}]}
+    text = json.dumps(doc, indent=2)
+    assert list(iter_array(io.StringIO(text), "nums", chunk)) == doc["nums"]
+    assert list(iter_array(io.StringIO(text), "rows", chunk)) == doc["rows"]
+    assert list(iter_array(io.StringIO(text), "missing", chunk)) == []
+
+def test_read_value_skips_arrays_with_brackets_in_strings():
+    doc = {
+        "foods": [{"name": 'a "]" [{ \\', "tags": [[1, {"x": "}"}]]}] * 20,
+        "profile": {"age": 30, "notes": "[{"},
+        "goal": None,
+    }
+    text = json.dumps(doc)
+    for chunk_size in (1, 5, 64):
+        assert read_value(io.StringIO(text), "profile", chunk_size=chunk_size) == doc["profile"]
+        assert read_value(io.StringIO(text), "goal", "missing", chunk_size=chunk_size) is None
+        assert read_value(io.StringIO(text), "nope", "missing", chunk_size=chunk_size) == "missing"
@@ -0,0 +1,102 @@
+import sqlite3
+from datetime import date
+
+from fitgator.cli import main
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.data.sync import read_changes, write_changes
+from fitgator.entities import FoodEntry, WorkoutEntry
+
+def _repo(path, **kw):
+    return SQLiteRepository(str(path), verbose=False, auto_archive=False, **kw)
+
+def _names(repo):
+    return sorted(f.name for f in repo.load_foods())
+
+def test_changes_flow_both_ways_including_deletes(tmp_path):
+    a = _repo(tmp_path / "a.db")
+    b = _repo(tmp_path / "b.db")
+    a.add_food(FoodEntry(date(2024, 3, 1), "Oatmeal", 350))
+    a.add_food(FoodEntry(date(2024, 3, 1), "Banana", 100))
+    a.add_workout(WorkoutEntry(date(2024, 3, 1), "Run", True, "easy"))
+
+    first = a.export_changes()
+    assert b.apply_changes(first) == {"added": 3, "deleted": 0, "skipped": 0}
+    assert _names(b) == ["Banana", "Oatmeal"]
+    assert b.load_workouts()[0].notes == "easy"
+
+    # Offline edits on both sides, then exchange deltas only
+    banana = [f for f in b.load_foods() if f.name == "Banana"][0]
+    b.delete_food(banana)
+    b.add_food(FoodEntry(date(2024, 3, 2), "Soup", 250))
+    a.add_food(FoodEntry(date(2024, 3, 2), "Toast", 150))
+
+    from_b = b.export_changes()
+    from_a = a.export_changes(first["until"])
+    assert [f["name"] for f in from_a["foods"]] == ["Toast"]
+    a.apply_changes(from_b)
+    b.apply_changes(from_a)
+    assert _names(a) == _names(b) == ["Oatmeal", "Soup", "Toast"]
+
+    # Re-applying is a no-op
+    assert a.apply_changes(from_b)["added"] == 0
+    a.close()
+    b.close()
+
+def test_save_foods_only_records_real_changes(tmp_path):
+    repo = _repo(tmp_path / "a.db")
+    repo.add_food(FoodEntry(date(2024, 3, 1), "Oatmeal", 350))
+    repo.add_food(FoodEntry(date(2024, 3, 1), "Banana", 100))
+    mark = repo.change_counter()
+
+    foods = repo.load_foods()
+    repo.save_foods([f for f in foods if f.name != "Banana"])
+    changes = repo.export_changes(mark)
+    assert changes["foods"] == []
+    assert [t["kind"] for t in changes["tombstones"]] == ["foods"]
+    repo.close()
+
+def test_archived_rows_keep_their_identity(tmp_path):
+    a = _repo(tmp_path / "a.db")
+    a.add_food(FoodEntry(date(2022, 5, 1), "Old", 1))
+    before = a.export_changes()["foods"][0]["uuid"]
+    a.archive_closed_years(today=date(2024, 1, 1))
+    assert a.export_changes()["foods"][0]["uuid"] == before
+
+    b = _repo(tmp_path / "b.db")
+    b.add_food(FoodEntry(date(2022, 1, 1), "Other", 2))
+    b.archive_closed_years(today=date(2024, 1, 1))
+    b.apply_changes(a.export_changes())
+    assert [f.name for f in b.load_foods_range(date(2022, 1, 1), date(2022, 12, 31))] == ["Other", "Old"]
+    a.close()
+    b.close()
+
+def test_existing_database_is_migrated(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE foods (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, "
+        "name TEXT NOT NULL, calories INTEGER NOT NULL)"
+    )
+    conn.execute("INSERT INTO foods (date, name, calories) VALUES ('2024-02-01', 'Egg', 80)")
+    conn.commit()
+    conn.close()
+
+    repo = _repo(path)
+    rows = repo.export_changes()["foods"]
+    assert [r["name"] for r in rows] == ["Egg"] and rows[0]["uuid"]
+    repo.close()
+
+def test_bundle_files_and_cli(tmp_path, capsys):
+    a, b = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    bundle = str(tmp_path / "changes.json.gz")
+    main(["--db", a, "log-food", "Apple", "95", "--date", "2024-03-02"])
+    assert main(["--db", a, "sync-export", bundle]) == 0
+    assert read_changes(bundle)["foods"][0]["name"] == "Apple"
+    assert main(["--db", b, "sync-apply", bundle]) == 0
+    assert "1 added" in capsys.readouterr().out
+
+    repo = _repo(b)
+    assert _names(repo) == ["Apple"]
+    write_changes(repo.export_changes(), str(tmp_path / "plain.json"))
+    assert read_changes(str(tmp_path / "plain.json"))["device"] == repo.device_id()
+    repo.close()
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+
+from fitgator.cli import main
+from fitgator.data.cached_repo import CachedRepository
+from fitgator.data.json_repo import JsonRepository
+from fitgator.data.sqlite_repo import SQLiteRepository
+from fitgator.entities import FoodEntry, Template, TemplateItem
+from fitgator.events import FoodAdded, FoodsAdded
+from fitgator.services.templates import apply_template, expand, occurrences, parse_recurrence
+
+BREAKFAST = Template(
+    "Weekday breakfast",
+    "food",
+    [TemplateItem("Oatmeal", 350, protein_g=12), TemplateItem("Coffee", 5)],
+    recurrence="weekdays",
+)
+
+def _repos(tmp_path):
+    yield SQLiteRepository(str(tmp_path / "t.db"), verbose=False, auto_archive=False)
+    yield JsonRepository(str(tmp_path / "t.json"))
+
+def test_recurrence_rules():
+    assert parse_recurrence("weekends") == {5, 6}
+    assert parse_recurrence("Mon, Wednesday,fri") == {0, 2, 4}
+    with pytest.raises(ValueError):
+        parse_recurrence("mon,funday")
+    for bad in ("monster", "wedding,fri", "tues", ""):
+        with pytest.raises(ValueError):
+            parse_recurrence(bad)
+    # 2024-03-04 is a Monday
+    days = list(occurrences("weekdays", date(2024, 3, 4), date(2024, 3, 17)))
+    assert len(days) == 10 and all(d.weekday() < 5 for d in days)
+
+def test_expand_builds_entries_per_item_and_day():
+    foods, workouts = expand(BREAKFAST, date(2024, 3, 8), date(2024, 3, 11))
+    assert workouts == []
+    assert [(f.date.day, f.name) for f in foods] == [
+        (8, "Oatmeal"), (8, "Coffee"), (11, "Oatmeal"), (11, "Coffee"),
+    ]
+    assert foods[0].protein_g == 12
+
+def test_templates_are_stored_and_seeded(tmp_path):
+    for repo in _repos(tmp_path):
+        names = [t.name for t in repo.load_templates()]
+        assert "Beginner Full Body (3 days)" in names
+        repo.save_template(BREAKFAST)
+        assert BREAKFAST in repo.load_templates()
+        repo.delete_template("Beginner Full Body (3 days)")
+        assert "Beginner Full Body (3 days)" not in [t.name for t in repo.load_templates()]
+
+def test_apply_template_is_one_batch_with_ids(tmp_path):
+    for repo in _repos(tmp_path):
+        repo = CachedRepository(repo)
+        repo.add_food(FoodEntry(date(2024, 3, 1), "Before", 1))
+        repo.load_foods_range(date(2024, 3, 1), date(2024, 3, 31))  # warm the cache
+        events = []
+        repo.bus.subscribe(FoodAdded, events.append)
+        repo.bus.subscribe(FoodsAdded, events.append)
+
+        added = apply_template(repo, BREAKFAST, date(2024, 3, 1), date(2024, 3, 31))
+        assert added == 2 * 21
+        assert len(events) == 1 and len(events[0].entries) == added
+        foods = repo.load_foods_range(date(2024, 3, 1), date(2024, 3, 31))
+        assert len(foods) == added + 1
+        assert len({f.id for f in foods}) == len(foods)
+        assert {f.id for f in events[0].entries} <= {f.id for f in foods}
+
+def test_batch_spans_archive_partitions(tmp_path):
+    repo = SQLiteRepository(str(tmp_path / "t.db"), verbose=False, auto_archive=False)
+    repo.add_food(FoodEntry(date(2023, 1, 1), "Old", 1))
+    repo.archive_closed_years(today=date(2024, 6, 1))
+    apply_template(repo, BREAKFAST, date(2023, 12, 29), date(2024, 1, 2))
+    assert [f.name for f in repo.load_foods_range(date(2023, 12, 29), date(2023, 12, 31))] == [
+        "Oatmeal", "Coffee",
+    ]
+    assert len(repo.load_foods_range(date(2024, 1, 1), date(2024, 1, 2))) == 4
+    repo.close()
+
+def test_cli_template_and_plan(tmp_path, capsys):
+    db = str(tmp_path / "cli.db")
+    assert main(["--db", db, "template-add", "Lunch", "--food", "Salad,300,10,20,15,6",
+                 "--recurrence", "mon,wed"]) == 0
+    assert main(["--db", db, "plan", "Lunch", "--start", "2024-03-04", "--end", "2024-03-10"]) == 0
+    assert "Added 2 entries" in capsys.readouterr().out
+    assert main(["--db", db, "plan", "Nope", "--end", "2024-03-10"]) == 1